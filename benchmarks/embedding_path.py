@@ -0,0 +1,67 @@
+"""Compare the old List[List[float]] research path with the NumPy-native one.
+
+Run: python -m benchmarks.embedding_path --n 50000 --dim 384
+
+Both paths start from the same float32 matrix (as produced by the encoder) so
+only the conversion, grouping and centroid work is measured, not the model.
+"""
+from __future__ import annotations
+
+import argparse
+import time
+import tracemalloc
+
+import numpy as np
+
+from seoworkbench.nlp.clustering import cluster_centroids, group_indices
+
+
+def list_path(vecs: np.ndarray, labels: np.ndarray) -> dict:
+    # Mirrors the previous embed() -> .tolist() -> np.array(...) round trips
+    as_lists = [v.tolist() for v in vecs]
+    X = np.array(as_lists, dtype=np.float32)
+    groups: dict = {}
+    for vec, lab in zip(as_lists, labels.tolist()):
+        groups.setdefault(lab, []).append(vec)
+    out = {}
+    for lab, members in groups.items():
+        c = np.array(members, dtype=np.float32).mean(axis=0)
+        n = np.linalg.norm(c)
+        out[lab] = (c / n if n > 0 else c).tolist()
+    del X
+    return out
+
+
+def numpy_path(vecs: np.ndarray, labels: np.ndarray) -> dict:
+    ids, cents = cluster_centroids(vecs, group_indices(labels))
+    return {lab: c.tolist() for lab, c in zip(ids, cents)}
+
+
+def measure(fn, *args) -> tuple[float, float]:
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    fn(*args)
+    elapsed = time.perf_counter() - t0
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 2**20
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n", type=int, default=50_000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--clusters", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    vecs = rng.standard_normal((args.n, args.dim), dtype=np.float32)
+    labels = rng.integers(-1, args.clusters, size=args.n)
+
+    for name, fn in (("lists", list_path), ("numpy", numpy_path)):
+        secs, peak_mb = measure(fn, vecs, labels)
+        print(f"{name:>6}: {secs:7.3f}s  peak {peak_mb:8.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
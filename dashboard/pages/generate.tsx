@@ -11,13 +11,37 @@ export default function Generate() {
   const submit = async (e: any) => {
     e.preventDefault()
     setLoading(true)
-    setResp(null)
-    const r = await fetch(`${API}/content/generate`, {
+    setResp({ title: topic, article_markdown: '' })
+    const r = await fetch(`${API}/content/generate/stream`, {
       method: 'POST', headers: { 'Content-Type': 'application/json' },
       body: JSON.stringify({ topic, target_length_words: Number(length) })
     })
-    const data = await r.json()
-    setResp(data)
+    // Server-Sent Events: append markdown chunks as they arrive, then merge final events
+    const reader = r.body!.getReader()
+    const decoder = new TextDecoder()
+    let buffer = ''
+    while (true) {
+      const { value, done } = await reader.read()
+      if (done) break
+      buffer += decoder.decode(value, { stream: true })
+      const frames = buffer.split('\n\n')
+      buffer = frames.pop() || ''
+      for (const frame of frames) {
+        const event = frame.match(/^event: (.*)$/m)?.[1]
+        const data = frame.match(/^data: (.*)$/m)?.[1]
+        if (!event || data === undefined) continue
+        const payload = JSON.parse(data)
+        if (event === 'chunk') {
+          setResp((prev: any) => ({ ...prev, article_markdown: prev.article_markdown + payload.text }))
+        } else if (event === 'score') {
+          setResp((prev: any) => ({ ...prev, ...payload }))
+        } else if (event === 'schema') {
+          setResp((prev: any) => ({ ...prev, schema_jsonld: payload }))
+        } else if (event === 'microcontent') {
+          setResp((prev: any) => ({ ...prev, microcontent: payload }))
+        }
+      }
+    }
     setLoading(false)
   }
 
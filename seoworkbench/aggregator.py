@@ -1,10 +1,17 @@
 from __future__ import annotations
 
 import asyncio
-from typing import Iterable, List
+import zlib
+from typing import AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Optional, Sequence
 
+import numpy as np
+from rapidfuzz import fuzz
+
+from .config import get_settings
 from .models import KeywordCandidate, KeywordRecord, KeywordMetrics, SERPResult
-from .sources.google import GoogleLikeSource, gather_all
+from .nlp.text import TOKEN_RE, fold_plural
+from .table import KeywordTable
+from .sources.google import gather_all, get_google_source
 from .generation.generator import resolve_provider
 
 
@@ -28,24 +35,158 @@ def expand_programmatically(seed: str) -> List[KeywordCandidate]:
     return out
 
 
-async def research_keywords(seeds: Iterable[str], max_keywords: int = 300) -> List[KeywordRecord]:
-    source = GoogleLikeSource()
-
-    async def llm_expand(seed: str) -> List[KeywordCandidate]:
-        # Use the research provider to generate additional long-tail variants without scraping
-        provider = await resolve_provider(role="research")
-        prompt = (
-            f"Generate 50 long-tail keyword variations for: '{seed}'.\n"
-            "Mix intents (informational, transactional, comparison), audiences, locations, and pain points.\n"
-            "Return one variant per line, no numbering."
-        )
-        text = await provider.complete(prompt, max_tokens=800)
-        cands = []
-        for line in text.splitlines():
-            t = line.strip().lstrip("- ")
-            if len(t) >= 3:
-                cands.append(KeywordCandidate(term=t, source="llm"))
-        return cands[:50]
+def canonical_term(term: str) -> str:
+    """Order-insensitive, plural-folded token set: "hiking backpacks best" -> "backpack best hiking"."""
+    return " ".join(sorted({fold_plural(t) for t in TOKEN_RE.findall(term.lower())}))
+
+
+def merge_provenance(kept: KeywordCandidate, dup: KeywordCandidate) -> None:
+    sources = kept.source.split(",")
+    for src in dup.source.split(","):
+        if src not in sources:
+            sources.append(src)
+    kept.source = ",".join(sources)
+    for mod in dup.modifiers:
+        if mod not in kept.modifiers:
+            kept.modifiers.append(mod)
+    if kept.intent is None:
+        kept.intent = dup.intent
+
+
+class NearDuplicateIndex:
+    """Incremental near-duplicate filter for keyword candidates.
+
+    Stage 1 merges exact canonical forms (token set + plural folding). Stage 2
+    uses MinHash LSH over word tokens and character 3-grams of the canonical
+    form: each new term is only compared against the representatives sharing
+    an LSH band, then confirmed with rapidfuzz ``token_sort_ratio`` (digits must
+    match exactly so "2024"/"2025" stay apart). Cost is linear in the number of
+    candidates; duplicates fold their ``source``/``modifiers`` into the kept one.
+    """
+
+    _PRIME = np.uint64((1 << 61) - 1)
+
+    def __init__(self, threshold: float = 92.0, num_perm: int = 64, bands: int = 16, seed: int = 1) -> None:
+        self.threshold = threshold
+        self.bands = max(1, min(bands, num_perm))
+        self.rows = max(1, num_perm // self.bands)
+        num_perm = self.bands * self.rows
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, (1 << 31) - 1, size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, (1 << 31) - 1, size=num_perm, dtype=np.uint64)
+        self._mix = rng.integers(1, (1 << 62), size=self.rows, dtype=np.uint64) | np.uint64(1)
+        self._canon: Dict[str, int] = {}
+        self._buckets: List[Dict[int, int]] = [{} for _ in range(self.bands)]
+        self.kept: List[KeywordCandidate] = []
+        self._kept_canon: List[str] = []
+        self._kept_digits: List[List[str]] = []
+
+    @staticmethod
+    def _shingles(canon: str) -> List[int]:
+        padded = f" {canon} "
+        grams = {padded[i: i + 3] for i in range(max(1, len(padded) - 2))}
+        grams.update(canon.split())
+        return [zlib.crc32(g.encode("utf-8")) for g in grams]
+
+    def _band_keys(self, canons: Sequence[str]) -> np.ndarray:
+        shingles = [self._shingles(c) for c in canons]
+        lengths = np.fromiter((len(s) for s in shingles), dtype=np.int64, count=len(shingles))
+        flat = np.fromiter((h for s in shingles for h in s), dtype=np.uint64, count=int(lengths.sum()))
+        offsets = np.concatenate([[0], np.cumsum(lengths)[:-1]])
+        # (num_perm, n_shingles) universal hashes, min-reduced per term
+        hashed = (self._a[:, None] * flat[None, :] + self._b[:, None]) % self._PRIME
+        sig = np.minimum.reduceat(hashed, offsets, axis=1).T  # (n, num_perm)
+        sig = sig.reshape(len(canons), self.bands, self.rows)
+        return (sig * self._mix).sum(axis=2)  # wraps mod 2**64; one key per band
+
+    def _similar(self, a: str, b: str) -> bool:
+        return fuzz.token_sort_ratio(a, b, score_cutoff=self.threshold) > 0
+
+    def add_many(self, candidates: Sequence[KeywordCandidate], chunk: int = 2048) -> List[KeywordCandidate]:
+        """Add candidates in order; returns the ones that were kept as new representatives."""
+        new: List[KeywordCandidate] = []
+        for start in range(0, len(candidates), chunk):
+            batch = candidates[start: start + chunk]
+            canons = [canonical_term(c.term) for c in batch]
+            pending = [i for i, c in enumerate(canons) if c]
+            keys = self._band_keys([canons[i] for i in pending]) if pending else np.zeros((0, self.bands), np.uint64)
+            for row, i in enumerate(pending):
+                cand, canon = batch[i], canons[i]
+                rep = self._canon.get(canon)
+                if rep is None:
+                    band_keys = keys[row].tolist()
+                    digits = [t for t in canon.split() if t.isdigit()]
+                    for band, key in enumerate(band_keys):
+                        other = self._buckets[band].get(key)
+                        if (
+                            other is not None
+                            and self._kept_digits[other] == digits
+                            and self._similar(canon, self._kept_canon[other])
+                        ):
+                            rep = other
+                            break
+                    if rep is None:
+                        rep = len(self.kept)
+                        self.kept.append(cand)
+                        self._kept_canon.append(canon)
+                        self._kept_digits.append(digits)
+                        for band, key in enumerate(band_keys):
+                            self._buckets[band].setdefault(key, rep)
+                        new.append(cand)
+                    self._canon[canon] = rep
+                if self.kept[rep] is not cand:
+                    merge_provenance(self.kept[rep], cand)
+        return new
+
+
+def _dedupe_index(threshold: Optional[float] = None) -> NearDuplicateIndex:
+    s = get_settings()
+    return NearDuplicateIndex(
+        threshold=s.DEDUPE_FUZZY_THRESHOLD if threshold is None else threshold,
+        num_perm=s.DEDUPE_MINHASH_PERM,
+        bands=s.DEDUPE_LSH_BANDS,
+    )
+
+
+def dedupe_candidates(candidates: Sequence[KeywordCandidate], threshold: Optional[float] = None) -> List[KeywordCandidate]:
+    return _dedupe_index(threshold).add_many(candidates)
+
+
+async def llm_expand(seed: str) -> List[KeywordCandidate]:
+    # Use the research provider to generate additional long-tail variants without scraping
+    provider = await resolve_provider(role="research")
+    prompt = (
+        f"Generate 50 long-tail keyword variations for: '{seed}'.\n"
+        "Mix intents (informational, transactional, comparison), audiences, locations, and pain points.\n"
+        "Return one variant per line, no numbering."
+    )
+    text = await provider.complete(prompt, max_tokens=800)
+    cands = []
+    for line in text.splitlines():
+        t = line.strip().lstrip("- ")
+        if len(t) >= 3:
+            cands.append(KeywordCandidate(term=t, source="llm"))
+    return cands[:50]
+
+
+async def research_table(
+    seeds: Iterable[str],
+    max_keywords: int = 300,
+    progress: Optional[Callable[[str, int, int], Awaitable[None]]] = None,
+) -> KeywordTable:
+    """Collect, dedupe and SERP-sample keywords into a columnar ``KeywordTable``.
+
+    ``progress(stage, done, total)`` is awaited as seeds finish collecting
+    (``collect``), after dedupe (``dedupe``) and as SERP lookups return (``serp``).
+    """
+    seeds = list(seeds)
+    source = get_google_source()
+    # Bound fan-out so large seed lists do not burst every request at once
+    gate = asyncio.Semaphore(max(1, get_settings().MAX_WORKERS))
+
+    async def bounded(coro):
+        async with gate:
+            return await coro
 
     async def per_seed(seed: str) -> List[KeywordCandidate]:
         collected = await gather_all(source, seed)
@@ -56,33 +197,117 @@ async def research_keywords(seeds: Iterable[str], max_keywords: int = 300) -> Li
             pass
         return collected
 
+    counter = {"collect": 0, "serp": 0}
+
+    async def report(stage: str, total: int) -> None:
+        if progress is not None:
+            counter[stage] += 1
+            await progress(stage, counter[stage], total)
+
+    async def collect(seed: str) -> List[KeywordCandidate]:
+        collected = await bounded(per_seed(seed))
+        await report("collect", len(seeds))
+        return collected
+
     # Collect
-    buckets = await asyncio.gather(*[per_seed(s) for s in seeds])
+    buckets = await asyncio.gather(*[collect(s) for s in seeds])
     candidates = [c for bucket in buckets for c in bucket]
+    del buckets
 
-    # Dedupe by term, simple normalization
-    seen = set()
-    uniq: List[KeywordCandidate] = []
-    for c in candidates:
-        t = c.term.lower().strip()
-        if t not in seen:
-            uniq.append(c)
-            seen.add(t)
-
-    # Limit
-    uniq = uniq[:max_keywords]
+    # Dedupe near-duplicates (plural/order/typo variants), merging provenance
+    uniq = dedupe_candidates(candidates)
+    del candidates
+    if progress is not None:
+        await progress("dedupe", len(uniq), len(uniq))
 
-    # Build records and fetch (optional) SERP top for a sample subset
-    records: List[KeywordRecord] = [
-        KeywordRecord(candidate=c, metrics=KeywordMetrics(), serp_top=[]) for c in uniq
-    ]
+    # Limit, then drop to columns
+    table = KeywordTable.from_candidates(uniq[:max_keywords])
+    del uniq
 
     # Optionally enrich some entries with SERP top
-    subset = records[: min(20, len(records))]
-    serp_tasks = [source.fetch_serp(r.candidate.term, top_n=10) for r in subset]
-    serp_results = await asyncio.gather(*serp_tasks)
-    for rec, serp in zip(subset, serp_results):
-        rec.serp_top = serp
+    subset = range(min(20, len(table)))
+
+    async def serp(term: str) -> List[SERPResult]:
+        result = await bounded(source.fetch_serp(term, top_n=10))
+        await report("serp", len(subset))
+        return result
+
+    serp_results = await asyncio.gather(*[serp(table.terms[i]) for i in subset])
+    table.serp_top = {i: serp for i, serp in zip(subset, serp_results) if serp}
+
+    return table
+
+
+async def research_keywords(seeds: Iterable[str], max_keywords: int = 300) -> List[KeywordRecord]:
+    return (await research_table(seeds, max_keywords=max_keywords)).records()
+
+
+async def stream_research(seeds: Iterable[str], max_keywords: int = 300, serp_sample: int = 20) -> AsyncIterator[KeywordRecord]:
+    """Streaming ``research_keywords``: yields deduped records as each source call finishes.
+
+    Every (seed, source) lookup runs as its own bounded task and its results go
+    straight through an incremental ``NearDuplicateIndex``, so only kept
+    representatives are held in memory and the first records (programmatic
+    expansions) are out before any network call returns. Provenance merged
+    into a record after it was yielded is not re-emitted. The first
+    ``serp_sample`` records are held back until their SERP top arrives.
+    Outstanding lookups are cancelled once ``max_keywords`` records are out
+    or the consumer stops iterating.
+    """
+    source = get_google_source()
+    gate = asyncio.Semaphore(max(1, get_settings().MAX_WORKERS))
+    index = _dedupe_index()
+    queue: "asyncio.Queue[object]" = asyncio.Queue()
+    tasks: List[asyncio.Task] = []
+
+    def spawn(coro: Awaitable[object]) -> None:
+        tasks.append(asyncio.ensure_future(coro))
+
+    async def lookup(fetch: Callable[[], Awaitable[List[KeywordCandidate]]]) -> None:
+        try:
+            async with gate:
+                items = await fetch()
+        except Exception:
+            items = []
+        queue.put_nowait(items)
+
+    async def enrich(rec: KeywordRecord) -> None:
+        try:
+            async with gate:
+                rec.serp_top = await source.fetch_serp(rec.candidate.term, top_n=10)
+        except Exception:
+            pass
+        queue.put_nowait(rec)
 
-    return records
+    outstanding = 0
+    for seed in seeds:
+        queue.put_nowait(expand_programmatically(seed))
+        outstanding += 1
+        for fetch in (source.fetch_autocomplete, source.fetch_people_also_ask, source.fetch_related, llm_expand):
+            spawn(lookup(lambda fetch=fetch, seed=seed: fetch(seed)))
+            outstanding += 1
 
+    emitted = accepted = 0
+    try:
+        while outstanding and emitted < max_keywords:
+            item = await queue.get()
+            outstanding -= 1
+            if isinstance(item, KeywordRecord):
+                emitted += 1
+                yield item
+                continue
+            for cand in index.add_many(item):  # type: ignore[arg-type]
+                if accepted >= max_keywords:
+                    break
+                accepted += 1
+                rec = KeywordRecord(candidate=cand, metrics=KeywordMetrics(), serp_top=[])
+                if accepted <= serp_sample:
+                    spawn(enrich(rec))
+                    outstanding += 1
+                else:
+                    emitted += 1
+                    yield rec
+    finally:
+        for t in tasks:
+            t.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
@@ -1,11 +1,14 @@
 from __future__ import annotations
 
 import asyncio
-from typing import List
+import json
+import logging
+from typing import Any, AsyncIterator, List, Optional
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import Response, StreamingResponse
 
-from ..aggregator import research_keywords
+from ..aggregator import research_table, stream_research
 from ..models import (
     BriefRequest,
     ContentBrief,
@@ -14,18 +17,35 @@ from ..models import (
     ResearchRequest,
     ResearchResponse,
 )
-from ..nlp.embeddings import EmbeddingModel
-from ..nlp.clustering import cluster_embeddings, centroid
+from ..nlp.embeddings import get_embedding_service, warm_embedding_model
+from ..config import get_settings
+from ..nlp.clustering import cluster_embeddings, iter_cluster_dicts
+from ..sources.cache import serp_cache_stats
 from ..schemas.generate import article_schema, faq_schema
-from ..generation.generator import generate_brief, generate_article
-from ..opportunity import score_record
+from ..cache import bypass_cache
+from ..generation.generator import generate_brief, generate_article, llm_cache_stats, stream_article
+from ..httpclient import close_http_client
+from ..jobstatus import JobState, close_job_status_store, get_job_status_store, is_terminal
+from ..opportunity import score_record, score_table
+from ..storage.centroids import assign_project_clusters
 from ..storage.db import create_all, db_session
 from ..storage.models import Job, JobStatusEnum
+from ..serialization import CENTROID_MODES, compress, dumps, negotiate_encoding, shape_clusters
 from ..tasks import celery_app
 
+logger = logging.getLogger(__name__)
+
 app = FastAPI(title="SEO Workbench API", version="0.1.0")
 
 
+@app.middleware("http")
+async def cache_control(request: Request, call_next):
+    # "Cache-Control: no-cache" skips cached LLM/SERP results for this request only
+    no_cache = "no-cache" in request.headers.get("cache-control", "").lower()
+    with bypass_cache(no_cache):
+        return await call_next(request)
+
+
 @app.on_event("startup")
 async def on_startup() -> None:
     # Create DB tables if DSN is provided
@@ -33,40 +53,77 @@ async def on_startup() -> None:
         create_all()
     except Exception:
         pass
+    # Load embedding weights once per process instead of per request; on failure
+    # requests still work (lazy load or the hashing fallback)
+    try:
+        await asyncio.to_thread(warm_embedding_model)
+    except Exception:
+        logger.warning("Embedding model warm-up failed", exc_info=True)
+
+
+@app.on_event("shutdown")
+async def on_shutdown() -> None:
+    await get_embedding_service().aclose()
+    await close_http_client()
+    await close_job_status_store()
+
+
+def _encode_body(payload: Any, accept_encoding: Optional[str]) -> tuple[bytes, Optional[str]]:
+    body = dumps(payload)
+    encoding = negotiate_encoding(accept_encoding) if len(body) >= get_settings().RESPONSE_COMPRESS_MIN_BYTES else None
+    return (compress(body, encoding) if encoding else body), encoding
+
+
+async def _json_response(request: Request, payload: Any) -> Response:
+    """orjson-encoded response, brotli/gzip-compressed when the client accepts it."""
+    # Large payloads take a while to encode/compress; keep that off the event loop
+    body, encoding = await asyncio.to_thread(_encode_body, payload, request.headers.get("accept-encoding"))
+    headers = {"Vary": "Accept-Encoding"}
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return Response(content=body, media_type="application/json", headers=headers)
 
 
 @app.post("/keywords/research", response_model=ResearchResponse)
-async def keywords_research(req: ResearchRequest) -> ResearchResponse:
-    records = await research_keywords(req.seeds, max_keywords=req.max_keywords)
+async def keywords_research(req: ResearchRequest, request: Request) -> Response:
+    mode = req.centroids or get_settings().RESEARCH_CENTROIDS
+    if mode not in CENTROID_MODES:
+        raise HTTPException(status_code=422, detail=f"centroids must be one of {', '.join(CENTROID_MODES)}")
+    records = await research_table(req.seeds, max_keywords=req.max_keywords)
 
     # Compute opportunity on records (can incorporate real metrics when available)
-    for r in records:
-        r.opportunity = score_record(r)
+    score_table(records)
 
     # Embed + cluster
-    emb = EmbeddingModel()
-    vecs = emb.embed([r.candidate.term for r in records])
-    labels = cluster_embeddings(vecs, min_cluster_size=5)
-
-    clusters_map = {}
-    for rec, lab, vec in zip(records, labels, vecs):
-        cid = f"c{lab}"
-        rec.cluster_id = cid
-        clusters_map.setdefault(cid, {"id": cid, "label": cid, "keywords": [], "_vecs": []})
-        clusters_map[cid]["keywords"].append(rec.model_dump())
-        clusters_map[cid]["_vecs"].append(vec)
-
-    clusters = []
-    for cid, data in clusters_map.items():
-        c = {
-            "id": data["id"],
-            "label": data["label"],
-            "keywords": data["keywords"],
-            "centroid": centroid(data["_vecs"]),
-        }
-        clusters.append(c)
-
-    return ResearchResponse(clusters=clusters)
+    X = await get_embedding_service().embed(records.terms)
+    if req.project:
+        # Incremental: keep stable cluster ids by assigning into persisted centroids
+        labels, clusterer = await asyncio.to_thread(assign_project_clusters, req.project, X, 5)
+        clusters = iter_cluster_dicts(records, X, labels, clusterer.centroid_map())
+    else:
+        labels = cluster_embeddings(X, min_cluster_size=5)
+        clusters = iter_cluster_dicts(records, X, labels)
+    return await _json_response(request, {"clusters": list(shape_clusters(clusters, mode))})
+
+
+@app.post("/keywords/research/stream")
+async def keywords_research_stream(req: ResearchRequest) -> StreamingResponse:
+    """NDJSON: one scored ``KeywordRecord`` per line as soon as it is deduped (no clustering)."""
+
+    async def lines() -> AsyncIterator[str]:
+        try:
+            async for rec in stream_research(req.seeds, max_keywords=req.max_keywords):
+                rec.opportunity = score_record(rec)
+                yield rec.model_dump_json() + "\n"
+        except Exception as e:
+            yield json.dumps({"error": str(e)}, ensure_ascii=False) + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson", headers={"X-Accel-Buffering": "no"})
+
+
+@app.get("/cache/stats")
+async def cache_stats() -> dict:
+    return {"llm": llm_cache_stats.as_dict(), "serp": serp_cache_stats.as_dict()}
 
 
 @app.post("/content/brief", response_model=ContentBrief)
@@ -76,38 +133,100 @@ async def content_brief(req: BriefRequest) -> ContentBrief:
     return brief
 
 
-@app.post("/content/generate", response_model=GenerationResponse)
-async def content_generate(req: GenerationRequest) -> GenerationResponse:
+def _target_entities(req: GenerationRequest) -> List[str]:
     # Extract entities from brief outline as a naive target entity list
     entities: List[str] = []
     if req.brief:
         for sec in req.brief.outline:
             entities.extend(sec.target_keywords[:2])
-    result = await generate_article(req, target_entities=entities[:25])
+    return entities[:25]
+
+
+def _schema_for(req: GenerationRequest, title: str) -> Optional[dict]:
+    if not req.brief:
+        return None
+    schema = article_schema(title, req.brief.description)
+    if req.brief.faqs:
+        schema = {"@graph": [schema, faq_schema(req.brief.faqs)]}
+    return schema
+
+
+@app.post("/content/generate", response_model=GenerationResponse)
+async def content_generate(req: GenerationRequest) -> GenerationResponse:
+    result = await generate_article(req, target_entities=_target_entities(req))
 
     # Schema suggestions
     if req.brief:
-        schema = article_schema(result.title, req.brief.description)
-        if req.brief.faqs:
-            schema = {"@graph": [schema, faq_schema(req.brief.faqs)]}
-        result.schema_jsonld = schema
+        result.schema_jsonld = _schema_for(req, result.title)
 
     return result
 
 
+def _sse(event: str, data: Any) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+@app.post("/content/generate/stream")
+async def content_generate_stream(req: GenerationRequest) -> StreamingResponse:
+    """Server-Sent Events: ``chunk`` (markdown deltas), ``score``, ``schema``, ``microcontent``, ``done``."""
+
+    async def events() -> AsyncIterator[str]:
+        try:
+            async for event, data in stream_article(req, target_entities=_target_entities(req)):
+                if event == "chunk":
+                    yield _sse("chunk", {"text": data})
+                    continue
+                yield _sse(event, data)
+                if event == "score":
+                    yield _sse("schema", _schema_for(req, req.brief.title if req.brief and req.brief.title else req.topic))
+            yield _sse("done", {})
+        except Exception as e:
+            yield _sse("error", {"detail": str(e)})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        # Stop reverse proxies from buffering the stream
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 def _uuid() -> str:
     import uuid
     return uuid.uuid4().hex
 
 
+def _job_state(job: Job) -> JobState:
+    return {
+        "job_id": job.id,
+        "type": job.type,
+        "status": job.status,
+        "result": job.result,
+        "error": job.error,
+        "updated_at": job.updated_at.isoformat() if job.updated_at else None,
+    }
+
+
+def _create_job(type_: str, payload: dict) -> JobState:
+    job = Job(id=_uuid(), type=type_, status=JobStatusEnum.PENDING, payload=payload)
+    with db_session() as db:
+        db.add(job)
+        db.flush()  # fills column defaults (updated_at)
+        return _job_state(job)
+
+
+async def _enqueue(type_: str, payload: dict, args: List[Any]) -> dict:
+    state = await asyncio.to_thread(_create_job, type_, payload)
+    # Seed the status cache so the first polls never reach Postgres
+    await get_job_status_store().put(state["job_id"], state, publish=False)
+    celery_app.send_task(f"jobs.{type_}", args=[state["job_id"], *args])
+    return {"job_id": state["job_id"], "status": state["status"]}
+
+
 @app.post("/jobs/research")
 async def jobs_research(req: ResearchRequest) -> dict:
     # Create a job and enqueue
-    job = Job(id=_uuid(), type="research", status=JobStatusEnum.PENDING, payload=req.model_dump())
-    with db_session() as db:
-        db.add(job)
-    celery_app.send_task("jobs.research", args=[job.id, req.seeds, req.max_keywords])
-    return {"job_id": job.id, "status": job.status}
+    return await _enqueue("research", req.model_dump(), [req.seeds, req.max_keywords])
 
 
 @app.post("/jobs/brief")
@@ -115,35 +234,78 @@ async def jobs_brief(req: BriefRequest) -> dict:
     topic = req.seed or (req.keywords[0] if req.keywords else "")
     if not topic:
         raise HTTPException(status_code=400, detail="Topic or seed required")
-    job = Job(id=_uuid(), type="brief", status=JobStatusEnum.PENDING, payload=req.model_dump())
-    with db_session() as db:
-        db.add(job)
-    celery_app.send_task("jobs.brief", args=[job.id, topic, req.keywords])
-    return {"job_id": job.id, "status": job.status}
+    return await _enqueue("brief", req.model_dump(), [topic, req.keywords])
 
 
 @app.post("/jobs/generate")
 async def jobs_generate(req: GenerationRequest) -> dict:
-    job = Job(id=_uuid(), type="generate", status=JobStatusEnum.PENDING, payload=req.model_dump())
-    with db_session() as db:
-        db.add(job)
     brief = req.brief.model_dump() if req.brief else None
-    celery_app.send_task("jobs.generate", args=[job.id, req.topic, brief, req.target_length_words])
-    return {"job_id": job.id, "status": job.status}
+    return await _enqueue("generate", req.model_dump(), [req.topic, brief, req.target_length_words])
 
 
-@app.get("/jobs/{job_id}")
-async def jobs_status(job_id: str) -> dict:
+def _db_job_state(job_id: str) -> Optional[JobState]:
     with db_session() as db:
         job = db.get(Job, job_id)
-        if not job:
-            raise HTTPException(status_code=404, detail="Job not found")
-        return {
-            "job_id": job.id,
-            "type": job.type,
-            "status": job.status,
-            "result": job.result,
-            "error": job.error,
-            "updated_at": job.updated_at.isoformat() if job.updated_at else None,
-        }
+        return _job_state(job) if job else None
+
+
+async def _load_job_state(job_id: str) -> Optional[JobState]:
+    """Status cache first; Postgres only on a miss (or for live states when workers cannot share the cache)."""
+    store = get_job_status_store()
+    state = await store.get(job_id)
+    if state is not None and (store.shared or is_terminal(state)):
+        return state
+    state = await asyncio.to_thread(_db_job_state, job_id)
+    if state is not None:
+        await store.put(job_id, state, publish=False)
+    return state
+
+
+@app.get("/jobs/{job_id}")
+async def jobs_status(job_id: str, request: Request) -> Response:
+    state = await _load_job_state(job_id)
+    if state is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return await _json_response(request, state)
+
+
+@app.get("/jobs/{job_id}/events")
+async def jobs_events(job_id: str) -> StreamingResponse:
+    """Server-Sent Events: ``status`` with the job state on every change (incl. progress), then ``done``."""
+    if await _load_job_state(job_id) is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    store = get_job_status_store()
+    heartbeat = get_settings().JOB_EVENTS_HEARTBEAT
+
+    async def events() -> AsyncIterator[str]:
+        try:
+            async with store.subscribe(job_id) as next_update:
+                # Read after subscribing so no update falls between the two
+                state = await _load_job_state(job_id)
+                while state is not None:
+                    yield _sse("status", state)
+                    if is_terminal(state):
+                        break
+                    update = await next_update(heartbeat)
+                    while update is None:
+                        # Idle: re-read (cache, then row) so a missed message, an expired
+                        # snapshot or an out-of-process worker on the memory store cannot stall us
+                        polled = await _load_job_state(job_id)
+                        if polled != state:
+                            update = polled
+                            break
+                        yield ": keep-alive\n\n"
+                        update = await next_update(heartbeat)
+                    state = update
+            if state is None:
+                yield _sse("error", {"detail": "Job not found"})
+                return
+            yield _sse("done", {})
+        except Exception as e:
+            yield _sse("error", {"detail": str(e)})
 
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
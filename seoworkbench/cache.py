@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Set for the duration of a request that must not read cached results
+_bypass: ContextVar[bool] = ContextVar("cache_bypass", default=False)
+
+
+@contextmanager
+def bypass_cache(enabled: bool = True) -> Iterator[None]:
+    token = _bypass.set(enabled)
+    try:
+        yield
+    finally:
+        _bypass.reset(token)
+
+
+def cache_bypassed() -> bool:
+    return _bypass.get()
+
+
+def content_key(*parts: object) -> str:
+    h = hashlib.sha256()
+    for p in parts:
+        h.update(str(p).encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+class CacheStats:
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self.bypassed = 0
+
+    def as_dict(self) -> Dict[str, float]:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "bypassed": self.bypassed,
+            "hit_rate": (self.hits / total) if total else 0.0,
+        }
+
+
+class CacheBackend:
+    """String key/value store with per-entry TTL."""
+
+    async def get(self, key: str) -> Optional[str]:
+        raise NotImplementedError
+
+    async def set(self, key: str, value: str, ttl: float) -> None:
+        raise NotImplementedError
+
+    async def aclose(self) -> None:
+        return None
+
+
+class MemoryCache(CacheBackend):
+    """Process-local LRU with expiry."""
+
+    def __init__(self, max_entries: int = 10_000) -> None:
+        self.max_entries = max(1, max_entries)
+        self._data: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    async def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            expires, value = item
+            if expires < time.time():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    async def set(self, key: str, value: str, ttl: float) -> None:
+        with self._lock:
+            self._data[key] = (time.time() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+
+class SQLiteCache(CacheBackend):
+    """On-disk cache shared by processes on one host; LRU-trimmed to ``max_entries``."""
+
+    def __init__(self, path: str, namespace: str, max_entries: int = 100_000) -> None:
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.table = "cache_" + "".join(c if c.isalnum() else "_" for c in namespace)
+        self.max_entries = max(1, max_entries)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {self.table} "
+            "(key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL, last_used REAL NOT NULL)"
+        )
+        self._conn.execute(f"CREATE INDEX IF NOT EXISTS {self.table}_last_used ON {self.table}(last_used)")
+
+    def _get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(f"SELECT value, expires_at FROM {self.table} WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            if row[1] < now:
+                self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+                return None
+            self._conn.execute(f"UPDATE {self.table} SET last_used = ? WHERE key = ?", (now, key))
+            return row[0]
+
+    def _set(self, key: str, value: str, ttl: float) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute(
+                    f"INSERT OR REPLACE INTO {self.table}(key, value, expires_at, last_used) VALUES (?, ?, ?, ?)",
+                    (key, value, now + ttl, now),
+                )
+                count = self._conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+                if count > self.max_entries:
+                    self._conn.execute(
+                        f"DELETE FROM {self.table} WHERE key IN "
+                        f"(SELECT key FROM {self.table} ORDER BY last_used LIMIT ?)",
+                        (count - self.max_entries,),
+                    )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    async def get(self, key: str) -> Optional[str]:
+        return await asyncio.to_thread(self._get, key)
+
+    async def set(self, key: str, value: str, ttl: float) -> None:
+        await asyncio.to_thread(self._set, key, value, ttl)
+
+
+class RedisCache(CacheBackend):
+    """Uses REDIS_URL; eviction is Redis' own (configure ``maxmemory-policy allkeys-lru``)."""
+
+    def __init__(self, url: str, namespace: str) -> None:
+        import redis.asyncio as aioredis  # type: ignore
+
+        self._client = aioredis.from_url(url, decode_responses=True)
+        self.prefix = f"seoworkbench:{namespace}:"
+
+    async def get(self, key: str) -> Optional[str]:
+        return await self._client.get(self.prefix + key)
+
+    async def set(self, key: str, value: str, ttl: float) -> None:
+        await self._client.set(self.prefix + key, value, ex=max(1, int(ttl)))
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+
+def build_cache_backend(
+    kind: str,
+    namespace: str,
+    max_entries: int,
+    sqlite_path: Optional[str] = None,
+    redis_url: Optional[str] = None,
+) -> Optional[CacheBackend]:
+    """Backend for ``kind`` (memory|sqlite|redis|none); falls back to memory if misconfigured."""
+    kind = (kind or "none").lower()
+    if kind == "none":
+        return None
+    try:
+        if kind == "sqlite" and sqlite_path:
+            return SQLiteCache(sqlite_path, namespace, max_entries=max_entries)
+        if kind == "redis" and redis_url:
+            return RedisCache(redis_url, namespace)
+    except Exception:
+        logger.warning("%s cache backend %r unavailable; using the in-process cache", namespace, kind, exc_info=True)
+        return MemoryCache(max_entries=max_entries)
+    if kind != "memory":
+        logger.warning("%s cache backend %r is not configured; using the in-process cache", namespace, kind)
+    return MemoryCache(max_entries=max_entries)
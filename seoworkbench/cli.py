@@ -2,45 +2,73 @@ from __future__ import annotations
 
 import asyncio
 import json
-from typing import List
+import sys
+from pathlib import Path
+from typing import List, Optional
 
+import numpy as np
 import typer
 
-from .aggregator import research_keywords
+from .aggregator import research_table, stream_research
+from .bulk import run_bulk
+from .config import get_settings
 from .models import BriefRequest, GenerationRequest
-from .nlp.embeddings import EmbeddingModel
-from .nlp.clustering import cluster_embeddings, centroid
+from .nlp.embeddings import get_embedding_model
+from .nlp.lsi import LSIModel
+from .nlp.clustering import cluster_embeddings, iter_cluster_dicts
+from .serialization import CENTROID_MODES, shape_clusters, write_clusters
+from .opportunity import score_arrays, score_record, score_table, token_counts, top_k
 from .generation.generator import generate_brief, generate_article
+from .httpclient import close_http_client
+from .storage.centroids import assign_project_clusters
 
 app = typer.Typer(add_completion=False, help="SEO Workbench CLI")
 
 
+def _run_async(coro):
+    """``asyncio.run`` that closes the pooled HTTP client before its loop goes away."""
+
+    async def main():
+        try:
+            return await coro
+        finally:
+            await close_http_client()
+
+    return asyncio.run(main())
+
+
 @app.command()
-def research(seed: List[str] = typer.Option(..., "--seed", help="Seed keywords"), max_keywords: int = 200):
+def research(
+    seed: List[str] = typer.Option(..., "--seed", help="Seed keywords"),
+    max_keywords: int = 200,
+    project: Optional[str] = typer.Option(None, "--project", help="Assign into this project's persisted clusters"),
+    stream: bool = typer.Option(False, "--stream", help="Print scored records as NDJSON as they arrive (no clustering)"),
+    centroids: Optional[str] = typer.Option(None, "--centroids", help="full|float16|omit (default: RESEARCH_CENTROIDS)"),
+    compact: bool = typer.Option(False, "--compact", help="No indentation (smaller, faster output)"),
+):
     """Discover and cluster keywords for the given seeds."""
+    mode = centroids or get_settings().RESEARCH_CENTROIDS
+    if mode not in CENTROID_MODES:
+        raise typer.BadParameter(f"must be one of {', '.join(CENTROID_MODES)}", param_hint="--centroids")
+
+    async def _stream():
+        async for rec in stream_research(seed, max_keywords=max_keywords):
+            rec.opportunity = score_record(rec)
+            print(rec.model_dump_json(), flush=True)
+
     async def _run():
-        records = await research_keywords(seed, max_keywords=max_keywords)
-        emb = EmbeddingModel()
-        vecs = emb.embed([r.candidate.term for r in records])
-        labels = cluster_embeddings(vecs, min_cluster_size=5)
-        clusters = {}
-        for rec, lab, vec in zip(records, labels, vecs):
-            cid = f"c{lab}"
-            rec.cluster_id = cid
-            clusters.setdefault(cid, {"id": cid, "label": cid, "keywords": [], "_vecs": []})
-            clusters[cid]["keywords"].append(rec.model_dump())
-            clusters[cid]["_vecs"].append(vec)
-        out = []
-        for cid, data in clusters.items():
-            out.append({
-                "id": cid,
-                "label": cid,
-                "keywords": data["keywords"],
-                "centroid": centroid(data["_vecs"]),
-            })
-        print(json.dumps({"clusters": out}, ensure_ascii=False, indent=2))
-
-    asyncio.run(_run())
+        records = await research_table(seed, max_keywords=max_keywords)
+        score_table(records)
+        X = get_embedding_model().embed(records.terms)
+        if project:
+            labels, clusterer = assign_project_clusters(project, X, min_cluster_size=5)
+            clusters = iter_cluster_dicts(records, X, labels, clusterer.centroid_map())
+        else:
+            clusters = iter_cluster_dicts(records, X, cluster_embeddings(X, min_cluster_size=5))
+        # Encoded and written one cluster at a time
+        write_clusters(sys.stdout.buffer, shape_clusters(clusters, mode), pretty=not compact)
+
+    _run_async(_stream() if stream else _run())
 
 
 @app.command()
@@ -50,7 +78,7 @@ def brief(topic: str = typer.Argument(...), keywords: List[str] = typer.Option([
         b = await generate_brief(topic=topic, keywords=keywords, seed=topic)
         print(json.dumps(b.model_dump(), ensure_ascii=False, indent=2))
 
-    asyncio.run(_run())
+    _run_async(_run())
 
 
 @app.command()
@@ -61,7 +89,96 @@ def generate(topic: str = typer.Argument(...), target_length_words: int = 1800):
         res = await generate_article(req, target_entities=[topic])
         print(json.dumps(res.model_dump(), ensure_ascii=False))
 
-    asyncio.run(_run())
+    _run_async(_run())
+
+
+@app.command()
+def bulk(
+    input_path: str = typer.Argument(..., help="CSV or JSONL with a topic per row (optional keywords, brief, id)"),
+    out: str = typer.Option("bulk_results.jsonl", "--out", help="JSONL file results are appended to"),
+    checkpoint: Optional[str] = typer.Option(None, "--checkpoint", help="Completed-row ids (default: <out>.ckpt)"),
+    errors: Optional[str] = typer.Option(None, "--errors", help="JSONL of failed rows (default: <out>.errors.jsonl)"),
+    concurrency: int = typer.Option(4, "--concurrency", help="Pages generated at once"),
+    target_length_words: int = 1800,
+    parallel_sections: bool = typer.Option(False, "--parallel-sections", help="Draft article sections concurrently"),
+):
+    """Generate briefs and articles for many topics; rerun the same command to resume."""
+    _run_async(
+        run_bulk(
+            input_path,
+            out,
+            checkpoint_path=checkpoint,
+            concurrency=concurrency,
+            length=target_length_words,
+            parallel_sections=parallel_sections,
+            errors_path=errors,
+        )
+    )
+
+
+def _corpus_texts(paths: List[str]):
+    for path in paths:
+        if path.endswith(".jsonl"):
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        row = json.loads(line)
+                        yield " ".join(str(row.get(k) or "") for k in ("title", "snippet", "text"))
+        else:
+            with open(path, "r", encoding="utf-8") as f:
+                yield f.read()
+
+
+@app.command("lsi-fit")
+def lsi_fit(
+    inputs: List[str] = typer.Argument(..., help="Reference corpus: .txt/.md pages or JSONL rows with title/snippet/text"),
+    model_path: Optional[str] = typer.Option(None, "--model", help="Output path (default: LSI_MODEL_PATH or .cache/lsi.npz)"),
+    update: bool = typer.Option(False, "--update", help="Add these documents to an existing model instead of refitting"),
+):
+    """Fit (or extend) the corpus TF-IDF model used for LSI terms."""
+    s = get_settings()
+    path = Path(model_path or s.LSI_MODEL_PATH or ".cache/lsi.npz")
+    model = LSIModel.load(path) if update and path.exists() else LSIModel(max_terms=s.LSI_MAX_TERMS)
+    batch: List[str] = []
+    for text in _corpus_texts(inputs):
+        batch.append(text)
+        if len(batch) >= 1000:
+            model.partial_fit(batch)
+            batch = []
+    model.partial_fit(batch)
+    model.save(path)
+    print(json.dumps({"model": str(path), "documents": model.n_docs, "terms": len(model)}))
+
+
+@app.command()
+def rank(
+    metrics_path: str = typer.Argument(..., help="CSV/JSONL/Parquet metrics dump with term, volume, kd, trend_score columns"),
+    top: int = typer.Option(1000, "--top", help="How many keywords to keep"),
+    out: Optional[str] = typer.Option(None, "--out", help="Write the top keywords as CSV here instead of stdout"),
+):
+    """Rank a keyword metrics dump by opportunity score."""
+    import pandas as pd
+
+    if metrics_path.endswith(".parquet"):
+        try:
+            df = pd.read_parquet(metrics_path)
+        except ImportError:
+            raise typer.BadParameter("reading Parquet needs `pip install pyarrow` (or fastparquet)", param_hint="METRICS_PATH")
+    elif metrics_path.endswith(".jsonl"):
+        df = pd.read_json(metrics_path, lines=True)
+    else:
+        df = pd.read_csv(metrics_path)
+    if "term" not in df:
+        raise typer.BadParameter(f"needs a 'term' column (found: {', '.join(map(str, df.columns)) or 'none'})", param_hint="METRICS_PATH")
+    col = lambda name: df[name].to_numpy(dtype="float64", na_value=np.nan) if name in df else np.full(len(df), np.nan)  # noqa: E731
+    terms = df["term"].astype(str)
+    scores = score_arrays(col("volume"), col("kd"), col("trend_score"), token_counts(terms))
+    idx = top_k(scores, top)
+    ranked = df.iloc[idx].assign(opportunity=scores[idx].round(4))
+    if out:
+        ranked.to_csv(out, index=False)
+    else:
+        print(ranked.to_csv(index=False), end="")
 
 
 if __name__ == "__main__":
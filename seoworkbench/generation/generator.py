@@ -1,37 +1,94 @@
 from __future__ import annotations
 
-from typing import Dict, List, Optional
+import asyncio
+import json
+from functools import partial
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
 
 from tenacity import retry, stop_after_attempt, wait_exponential
 
+from ..cache import CacheBackend, CacheStats, build_cache_backend, cache_bypassed, content_key
 from ..config import get_settings
+from ..httpclient import get_http_client
+from ..ratelimit import estimate_tokens, get_limiter
 from ..models import ContentBrief, GenerationRequest, GenerationResponse
-from ..nlp.score import nlp_optimization_score
-from .prompts import render_article_prompt, render_brief_prompt, render_social_prompt
+from ..nlp.score import entity_positions, nlp_optimization_score
+from ..providers.streaming import iter_openai_deltas, raise_for_stream_status
+from .prompts import render_article_prompt, render_brief_prompt, render_section_prompt, render_social_prompt
 
 
 class LLMProvider:
     async def complete(self, prompt: str, *, max_tokens: int = 2048) -> str:
         raise NotImplementedError
 
+    async def stream(self, prompt: str, *, max_tokens: int = 2048) -> AsyncIterator[str]:
+        # Providers without native streaming emit the whole completion as one chunk
+        yield await self.complete(prompt, max_tokens=max_tokens)
+
 
 class OpenAIProvider(LLMProvider):
-    def __init__(self, api_key: str, model: str) -> None:
-        from openai import OpenAI
+    """Chat Completions over the shared async HTTP pool.
+
+    The official SDK's sync client blocked the event loop for the whole
+    completion; this talks to the REST endpoint directly so other requests keep
+    being served while a completion is in flight.
+    """
 
-        self.client = OpenAI(api_key=api_key)
+    def __init__(
+        self,
+        api_key: str,
+        model: str,
+        base_url: str = "https://api.openai.com/v1",
+        timeout: float = 120.0,
+        max_concurrency: int = 8,
+    ) -> None:
+        self.api_key = api_key
         self.model = model
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.limiter = get_limiter("openai", default_concurrency=max_concurrency)
 
     @retry(wait=wait_exponential(multiplier=1, min=1, max=10), stop=stop_after_attempt(3))
     async def complete(self, prompt: str, *, max_tokens: int = 2048) -> str:
-        # Chat Completions API usage
-        resp = self.client.chat.completions.create(
-            model=self.model,
-            messages=[{"role": "user", "content": prompt}],
-            max_tokens=max_tokens,
-            temperature=0.7,
-        )
-        return resp.choices[0].message.content or ""
+        headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json",
+        }
+        payload = {
+            "model": self.model,
+            "messages": [{"role": "user", "content": prompt}],
+            "max_tokens": max_tokens,
+            "temperature": 0.7,
+        }
+        async with self.limiter.limit(estimate_tokens(prompt, max_tokens)):
+            r = await get_http_client().post(
+                f"{self.base_url}/chat/completions", headers=headers, json=payload, timeout=self.timeout
+            )
+            self.limiter.observe(r)
+        r.raise_for_status()
+        data = r.json()
+        return data.get("choices", [{}])[0].get("message", {}).get("content", "") or ""
+
+    async def stream(self, prompt: str, *, max_tokens: int = 2048) -> AsyncIterator[str]:
+        headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json",
+        }
+        payload = {
+            "model": self.model,
+            "messages": [{"role": "user", "content": prompt}],
+            "max_tokens": max_tokens,
+            "temperature": 0.7,
+            "stream": True,
+        }
+        async with self.limiter.limit(estimate_tokens(prompt, max_tokens)):
+            async with get_http_client().stream(
+                "POST", f"{self.base_url}/chat/completions", headers=headers, json=payload, timeout=self.timeout
+            ) as r:
+                self.limiter.observe(r)
+                await raise_for_stream_status(r)
+                async for text in iter_openai_deltas(r):
+                    yield text
 
 
 class OllamaProvider(LLMProvider):
@@ -41,13 +98,30 @@ class OllamaProvider(LLMProvider):
 
     @retry(wait=wait_exponential(multiplier=1, min=1, max=10), stop=stop_after_attempt(3))
     async def complete(self, prompt: str, *, max_tokens: int = 2048) -> str:
-        import httpx
         payload = {"model": self.model, "prompt": prompt}
-        async with httpx.AsyncClient(timeout=120) as client:
-            r = await client.post(f"{self.host}/api/generate", json=payload)
-            r.raise_for_status()
-            data = r.json()
-            return data.get("response", "")
+        async with get_limiter("ollama").limit(estimate_tokens(prompt, max_tokens)) as limiter:
+            r = await get_http_client().post(f"{self.host}/api/generate", json=payload, timeout=120)
+            limiter.observe(r)
+        r.raise_for_status()
+        data = r.json()
+        return data.get("response", "")
+
+    async def stream(self, prompt: str, *, max_tokens: int = 2048) -> AsyncIterator[str]:
+        payload = {"model": self.model, "prompt": prompt, "stream": True}
+        async with get_limiter("ollama").limit(estimate_tokens(prompt, max_tokens)) as limiter:
+            async with get_http_client().stream("POST", f"{self.host}/api/generate", json=payload, timeout=120) as r:
+                limiter.observe(r)
+                await raise_for_stream_status(r)
+                # Ollama streams newline-delimited JSON objects
+                async for line in r.aiter_lines():
+                    if not line.strip():
+                        continue
+                    try:
+                        text = json.loads(line).get("response", "")
+                    except ValueError:
+                        continue
+                    if text:
+                        yield text
 
 
 class StubProvider(LLMProvider):
@@ -55,6 +129,124 @@ class StubProvider(LLMProvider):
         # Deterministic stub for offline/dev usage
         return "This is a placeholder response. Configure OPENAI or OLLAMA to get real content.\n\n# Introduction\n...\n\n# Section 1\n...\n\n# Conclusion\n..."
 
+    async def stream(self, prompt: str, *, max_tokens: int = 2048) -> AsyncIterator[str]:
+        text = await self.complete(prompt, max_tokens=max_tokens)
+        for line in text.splitlines(keepends=True):
+            yield line
+
+
+async def stream_completion(provider: LLMProvider, prompt: str, *, max_tokens: int = 2048) -> AsyncIterator[str]:
+    """Stream from any provider; duck-typed providers without ``stream`` yield one chunk."""
+    stream = getattr(provider, "stream", None)
+    if stream is None:
+        yield await provider.complete(prompt, max_tokens=max_tokens)
+        return
+    async for text in stream(prompt, max_tokens=max_tokens):
+        yield text
+
+
+class CachedProvider(LLMProvider):
+    """Serves byte-identical prompts from the LLM response cache.
+
+    Keyed on (provider, model, prompt hash, max_tokens, temperature). Reads are
+    skipped inside ``bypass_cache()``; fresh results are still written back.
+    """
+
+    def __init__(self, inner: LLMProvider, backend: CacheBackend, ttl: float, stats: CacheStats) -> None:
+        self.inner = inner
+        self.backend = backend
+        self.ttl = ttl
+        self.stats = stats
+        self.model = getattr(inner, "model", "")
+
+    def _key(self, prompt: str, max_tokens: int) -> str:
+        return content_key(
+            type(self.inner).__name__,
+            self.model,
+            content_key(prompt),
+            max_tokens,
+            getattr(self.inner, "temperature", 0.7),
+        )
+
+    async def complete(self, prompt: str, *, max_tokens: int = 2048) -> str:
+        key = self._key(prompt, max_tokens)
+        if cache_bypassed():
+            self.stats.bypassed += 1
+        else:
+            try:
+                hit = await self.backend.get(key)
+            except Exception:
+                hit = None
+            if hit is not None:
+                self.stats.hits += 1
+                return hit
+            self.stats.misses += 1
+        text = await self.inner.complete(prompt, max_tokens=max_tokens)
+        if text:
+            try:
+                await self.backend.set(key, text, self.ttl)
+            except Exception:
+                pass
+        return text
+
+    async def stream(self, prompt: str, *, max_tokens: int = 2048) -> AsyncIterator[str]:
+        key = self._key(prompt, max_tokens)
+        if cache_bypassed():
+            self.stats.bypassed += 1
+        else:
+            try:
+                hit = await self.backend.get(key)
+            except Exception:
+                hit = None
+            if hit is not None:
+                self.stats.hits += 1
+                yield hit
+                return
+            self.stats.misses += 1
+        parts: List[str] = []
+        async for text in stream_completion(self.inner, prompt, max_tokens=max_tokens):
+            parts.append(text)
+            yield text
+        # Only a stream that ran to completion is cached
+        if parts:
+            try:
+                await self.backend.set(key, "".join(parts), self.ttl)
+            except Exception:
+                pass
+
+
+_llm_cache: Optional[CacheBackend] = None
+llm_cache_stats = CacheStats()
+
+
+def get_llm_cache() -> Optional[CacheBackend]:
+    global _llm_cache
+    if _llm_cache is None:
+        s = get_settings()
+        _llm_cache = build_cache_backend(
+            s.LLM_CACHE_BACKEND,
+            namespace="llm",
+            max_entries=s.LLM_CACHE_MAX_ENTRIES,
+            sqlite_path=s.CACHE_SQLITE_PATH,
+            redis_url=s.REDIS_URL,
+        )
+    return _llm_cache
+
+
+# Provider instances are stateless apart from config, so reuse them across calls
+_providers: Dict[tuple, LLMProvider] = {}
+
+
+def _cached_provider(key: tuple, factory: Callable[[], LLMProvider]) -> LLMProvider:
+    provider = _providers.get(key)
+    if provider is None:
+        provider = factory()
+        backend = get_llm_cache()
+        if backend is not None:
+            provider = CachedProvider(provider, backend, get_settings().LLM_CACHE_TTL, llm_cache_stats)
+        _providers[key] = provider
+    return provider
+
 
 async def resolve_provider(role: str = "writing") -> LLMProvider:
     s = get_settings()
@@ -62,25 +254,53 @@ async def resolve_provider(role: str = "writing") -> LLMProvider:
     try:
         if choice == "perplexity" and s.PERPLEXITY_API_KEY:
             from ..providers.perplexity import PerplexityProvider
-            return PerplexityProvider(s.PERPLEXITY_API_KEY, s.PERPLEXITY_MODEL)  # type: ignore[return-value]
+            return _cached_provider(
+                ("perplexity", s.PERPLEXITY_API_KEY, s.PERPLEXITY_MODEL),
+                lambda: PerplexityProvider(s.PERPLEXITY_API_KEY, s.PERPLEXITY_MODEL),  # type: ignore[arg-type, return-value]
+            )
         if choice == "gemini" and s.GEMINI_API_KEY:
             from ..providers.gemini import GeminiProvider
-            return GeminiProvider(s.GEMINI_API_KEY, s.GEMINI_MODEL)  # type: ignore[return-value]
+            return _cached_provider(
+                ("gemini", s.GEMINI_API_KEY, s.GEMINI_MODEL),
+                lambda: GeminiProvider(s.GEMINI_API_KEY, s.GEMINI_MODEL),  # type: ignore[arg-type, return-value]
+            )
         if choice == "openrouter" and s.OPENROUTER_API_KEY:
             from ..providers.openrouter import OpenRouterProvider
-            return OpenRouterProvider(s.OPENROUTER_API_KEY, s.OPENROUTER_MODEL)  # type: ignore[return-value]
+            return _cached_provider(
+                ("openrouter", s.OPENROUTER_API_KEY, s.OPENROUTER_MODEL),
+                lambda: OpenRouterProvider(s.OPENROUTER_API_KEY, s.OPENROUTER_MODEL),  # type: ignore[arg-type, return-value]
+            )
         if choice == "openai" and s.OPENAI_API_KEY:
-            return OpenAIProvider(s.OPENAI_API_KEY, s.OPENAI_MODEL)
+            return _openai(s)
         if choice == "ollama" and s.OLLAMA_HOST:
-            return OllamaProvider(s.OLLAMA_HOST, s.OLLAMA_MODEL)
+            return _ollama(s)
     except Exception:
         pass
     # Fallbacks
     if s.OPENAI_API_KEY:
-        return OpenAIProvider(s.OPENAI_API_KEY, s.OPENAI_MODEL)
+        return _openai(s)
     if s.OLLAMA_HOST:
-        return OllamaProvider(s.OLLAMA_HOST, s.OLLAMA_MODEL)
-    return StubProvider()
+        return _ollama(s)
+    return _cached_provider(("stub",), StubProvider)
+
+
+def _openai(s) -> LLMProvider:
+    return _cached_provider(
+        ("openai", s.OPENAI_API_KEY, s.OPENAI_MODEL, s.OPENAI_BASE_URL),
+        lambda: OpenAIProvider(
+            s.OPENAI_API_KEY,
+            s.OPENAI_MODEL,
+            base_url=s.OPENAI_BASE_URL,
+            timeout=s.OPENAI_TIMEOUT,
+            max_concurrency=s.OPENAI_MAX_CONCURRENCY,
+        ),
+    )
+
+
+def _ollama(s) -> LLMProvider:
+    return _cached_provider(
+        ("ollama", s.OLLAMA_HOST, s.OLLAMA_MODEL), lambda: OllamaProvider(s.OLLAMA_HOST, s.OLLAMA_MODEL)
+    )
 
 
 async def generate_brief(topic: str, keywords: List[str], seed: Optional[str]) -> ContentBrief:
@@ -113,10 +333,9 @@ async def generate_brief(topic: str, keywords: List[str], seed: Optional[str]) -
     )
 
 
-async def generate_article(req: GenerationRequest, target_entities: List[str]) -> GenerationResponse:
-    provider = await resolve_provider(role="writing")
+def _article_prompt(req: GenerationRequest, target_entities: List[str]) -> str:
     outline = [s.model_dump() for s in (req.brief.outline if req.brief else [])]
-    prompt = render_article_prompt(
+    return render_article_prompt(
         topic=req.topic,
         tone=req.tone,
         audience=req.audience,
@@ -124,23 +343,152 @@ async def generate_article(req: GenerationRequest, target_entities: List[str]) -
         outline=outline or None,
         entities=target_entities,
     )
-    md = await provider.complete(prompt, max_tokens=4096)
 
-    nlp_score, covered, missing = nlp_optimization_score(md, target_entities)
 
-    # Basic microcontent generation (can be LLM-backed later)
-    social_prompt = render_social_prompt()
-    social_md = await provider.complete(social_prompt, max_tokens=1000)
-    micro = {
+def _parse_microcontent(social_md: str) -> Dict[str, List[str]]:
+    return {
         "linkedin": [l[2:].strip() for l in social_md.splitlines() if l.strip().startswith("-")][:5],
         "twitter": [],
     }
 
+
+def _article_title(req: GenerationRequest) -> str:
+    return req.brief.title if req.brief and req.brief.title else req.topic
+
+
+def _section_jobs(
+    provider: LLMProvider, req: GenerationRequest, target_entities: List[str]
+) -> List[Tuple[Optional[str], Callable[[], Awaitable[str]]]]:
+    """One (heading, draft factory) per article part: intro, each outline section, conclusion.
+
+    Parts share the topic, title and full outline as context and run
+    concurrently, bounded by ``GENERATION_SECTION_CONCURRENCY``. The factories
+    create no coroutine until called, so nothing is left un-awaited if the
+    caller fails before scheduling them (see ``_start_sections``).
+    """
+    assert req.brief is not None
+    sections = req.brief.outline
+    title = _article_title(req)
+    headings = [sec.heading for sec in sections]
+    gate = asyncio.Semaphore(max(1, get_settings().GENERATION_SECTION_CONCURRENCY))
+    # ~10% each for intro and conclusion, the rest split across sections
+    edge_words = max(80, req.target_length_words // 10)
+    body_words = max(120, (req.target_length_words - 2 * edge_words) // max(1, len(sections)))
+
+    async def draft(part: str, heading: Optional[str], description: Optional[str], words: int, entities: List[str]) -> str:
+        prompt = render_section_prompt(
+            topic=req.topic,
+            title=title,
+            tone=req.tone,
+            audience=req.audience,
+            headings=headings,
+            part=part,
+            heading=heading,
+            description=description,
+            length=words,
+            entities=entities,
+        )
+        async with gate:
+            text = await provider.complete(prompt, max_tokens=min(4096, max(256, words * 2)))
+        return text.strip()
+
+    parts: List[Tuple[Optional[str], Callable[[], Awaitable[str]]]] = [
+        (None, partial(draft, "introduction", None, None, edge_words, target_entities)),
+    ]
+    for sec in sections:
+        entities = list(dict.fromkeys(sec.target_keywords + target_entities))
+        parts.append((sec.heading, partial(draft, "section", sec.heading, sec.description, body_words, entities)))
+    parts.append(("Conclusion", partial(draft, "conclusion", None, None, edge_words, target_entities)))
+    return parts
+
+
+def _start_sections(provider: LLMProvider, req: GenerationRequest, target_entities: List[str]) -> List[Tuple[Optional[str], "asyncio.Task[str]"]]:
+    """Schedule every part as a task; callers must ``_cancel`` them when they stop early."""
+    return [(h, asyncio.ensure_future(make())) for h, make in _section_jobs(provider, req, target_entities)]
+
+
+def _cancel(tasks: Iterable["asyncio.Future[Any]"]) -> None:
+    for task in tasks:
+        task.cancel()
+
+
+def _section_markdown(heading: Optional[str], body: str) -> str:
+    return f"## {heading}\n\n{body}\n\n" if heading else f"{body}\n\n"
+
+
+def _use_sections(req: GenerationRequest) -> bool:
+    return bool(req.parallel_sections and req.brief and req.brief.outline)
+
+
+async def _write_article(provider: LLMProvider, req: GenerationRequest, target_entities: List[str]) -> str:
+    if not _use_sections(req):
+        return await provider.complete(_article_prompt(req, target_entities), max_tokens=4096)
+    jobs = _start_sections(provider, req, target_entities)
+    try:
+        bodies = await asyncio.gather(*[task for _, task in jobs])
+    finally:
+        # One failed part fails the article; stop drafting the rest instead of leaving them running
+        _cancel(task for _, task in jobs)
+    md = f"# {_article_title(req)}\n\n" + "".join(_section_markdown(h, b) for (h, _), b in zip(jobs, bodies))
+    return md.rstrip() + "\n"
+
+
+async def generate_article(req: GenerationRequest, target_entities: List[str]) -> GenerationResponse:
+    provider = await resolve_provider(role="writing")
+    # Microcontent does not depend on the article text, so draft both at once
+    tasks = [
+        asyncio.ensure_future(_write_article(provider, req, target_entities)),
+        asyncio.ensure_future(provider.complete(render_social_prompt(), max_tokens=1000)),
+    ]
+    try:
+        md, social_md = await asyncio.gather(*tasks)
+    finally:
+        _cancel(tasks)
+
+    nlp_score, covered, missing = nlp_optimization_score(md, target_entities)
+    micro = _parse_microcontent(social_md)
+
     return GenerationResponse(
-        title=req.brief.title if req.brief and req.brief.title else req.topic,
+        title=_article_title(req),
         article_markdown=md,
         nlp_score=nlp_score,
         schema_jsonld=None,
         microcontent=micro,
     )
 
+
+async def stream_article(req: GenerationRequest, target_entities: List[str]) -> AsyncIterator[Tuple[str, Any]]:
+    """Yield ``("chunk", text)`` while the article streams, then ``("score", ...)`` and ``("microcontent", ...)``."""
+    provider = await resolve_provider(role="writing")
+    social = asyncio.ensure_future(provider.complete(render_social_prompt(), max_tokens=1000))
+    parts: List[str] = []
+    try:
+        if _use_sections(req):
+            # Sections draft concurrently; emit each one as soon as it and everything before it are done
+            jobs = _start_sections(provider, req, target_entities)
+            try:
+                parts.append(f"# {_article_title(req)}\n\n")
+                yield "chunk", parts[-1]
+                for heading, task in jobs:
+                    parts.append(_section_markdown(heading, await task))
+                    yield "chunk", parts[-1]
+            finally:
+                _cancel(task for _, task in jobs)
+        else:
+            async for text in stream_completion(provider, _article_prompt(req, target_entities), max_tokens=4096):
+                parts.append(text)
+                yield "chunk", text
+        md = "".join(parts)
+
+        nlp_score, covered, missing = nlp_optimization_score(md, target_entities)
+        yield "score", {
+            "nlp_score": nlp_score,
+            "covered_entities": covered,
+            "missing_entities": missing,
+            # character spans in the markdown, for in-editor highlighting
+            "entity_positions": {k: v for k, v in entity_positions(md, target_entities).items() if v},
+        }
+
+        yield "microcontent", _parse_microcontent(await social)
+    finally:
+        social.cancel()
@@ -53,6 +53,35 @@ Return a concise JSON-like plan in Markdown.
 )
 
 
+SECTION_PROMPT_TMPL = Template(
+    """
+You are an expert SEO writer drafting one part of a longer article. Other writers are drafting the other parts in parallel.
+Article topic: {{ topic }}
+Article title: {{ title }}
+Tone: {{ tone }}
+Audience: {{ audience or 'general readers' }}
+
+Full article outline (for context and to avoid overlap):
+{% for h in headings %}
+- {{ h }}
+{% endfor %}
+
+Write ONLY the {{ part }}{% if heading %} "{{ heading }}"{% endif %}{% if description %}: {{ description }}{% endif %}
+Target length (words): {{ length }}
+
+Requirements:
+- Do not repeat the heading; start directly with the body text
+- Do not cover topics that belong to other sections of the outline
+- Natural language, varied sentence structures, avoid fluff
+- Include naturally where relevant: {{ entities|join(', ') }}
+{% if part == 'introduction' %}- Hook the reader and preview what the article covers
+{% elif part == 'conclusion' %}- Summarize key takeaways and end with a clear next step
+{% endif %}
+Return Markdown only.
+"""
+)
+
+
 SOCIAL_MICROCONTENT_TMPL = Template(
     """
 From the article, generate:
@@ -70,6 +99,32 @@ def render_article_prompt(topic: str, tone: str, audience: str | None, length: i
     return ARTICLE_PROMPT_TMPL.render(topic=topic, tone=tone, audience=audience, length=length, outline=outline, entities=entities)
 
 
+def render_section_prompt(
+    topic: str,
+    title: str,
+    tone: str,
+    audience: str | None,
+    headings: List[str],
+    part: str,
+    heading: str | None,
+    description: str | None,
+    length: int,
+    entities: List[str],
+) -> str:
+    return SECTION_PROMPT_TMPL.render(
+        topic=topic,
+        title=title,
+        tone=tone,
+        audience=audience,
+        headings=headings,
+        part=part,
+        heading=heading,
+        description=description,
+        length=length,
+        entities=entities,
+    )
+
+
 def render_brief_prompt(topic: str, keywords: List[str], seed: str | None) -> str:
     return BRIEF_PROMPT_TMPL.render(topic=topic, keywords=keywords, seed=seed)
 
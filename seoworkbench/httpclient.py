@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import asyncio
+import weakref
+from typing import Dict, Optional
+
+import httpx
+
+from .config import get_settings
+
+
+class _ReleasingStream(httpx.AsyncByteStream):
+    """Response stream that frees its per-host slot once the body is closed."""
+
+    def __init__(self, inner: httpx.AsyncByteStream, sem: asyncio.Semaphore) -> None:
+        self._inner = inner
+        self._sem: Optional[asyncio.Semaphore] = sem
+
+    async def __aiter__(self):
+        async for chunk in self._inner:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._inner.aclose()
+        finally:
+            if self._sem is not None:
+                self._sem.release()
+                self._sem = None
+
+
+class _HostLimitedTransport(httpx.AsyncBaseTransport):
+    """Caps in-flight requests per host on top of httpx's global pool limits."""
+
+    def __init__(self, inner: httpx.AsyncBaseTransport, per_host: int) -> None:
+        self._inner = inner
+        self._per_host = max(1, per_host)
+        self._sems: Dict[str, asyncio.Semaphore] = {}
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        sem = self._sems.get(request.url.host)
+        if sem is None:
+            sem = self._sems[request.url.host] = asyncio.Semaphore(self._per_host)
+        await sem.acquire()
+        try:
+            response = await self._inner.handle_async_request(request)
+        except BaseException:
+            sem.release()
+            raise
+        if response.is_closed:
+            # Body already buffered (e.g. mock transports): nothing left to hold the slot for
+            sem.release()
+        else:
+            response.stream = _ReleasingStream(response.stream, sem)  # type: ignore[arg-type]
+        return response
+
+    async def aclose(self) -> None:
+        await self._inner.aclose()
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # type: ignore  # noqa: F401
+    except Exception:
+        return False
+    return True
+
+
+def _transport(proxy: Optional[str] = None) -> httpx.AsyncBaseTransport:
+    s = get_settings()
+    limits = httpx.Limits(
+        max_connections=s.HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=s.HTTP_MAX_KEEPALIVE,
+        keepalive_expiry=s.HTTP_KEEPALIVE_EXPIRY,
+    )
+    inner = httpx.AsyncHTTPTransport(
+        limits=limits,
+        http2=s.HTTP2_ENABLED and _http2_available(),
+        proxy=proxy,
+        retries=0,
+    )
+    return _HostLimitedTransport(inner, s.HTTP_MAX_CONNECTIONS_PER_HOST)
+
+
+def build_http_client() -> httpx.AsyncClient:
+    s = get_settings()
+    mounts: Dict[str, httpx.AsyncBaseTransport] = {}
+    if s.HTTP_PROXY:
+        mounts["http://"] = _transport(s.HTTP_PROXY)
+    if s.HTTPS_PROXY:
+        mounts["https://"] = _transport(s.HTTPS_PROXY)
+    return httpx.AsyncClient(
+        transport=_transport(),
+        mounts=mounts or None,
+        timeout=httpx.Timeout(s.HTTP_TIMEOUT),
+        follow_redirects=True,
+    )
+
+
+# One pooled client per event loop: connections cannot be shared across loops
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+
+
+def get_http_client() -> httpx.AsyncClient:
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None or client.is_closed:
+        client = _clients[loop] = build_http_client()
+    return client
+
+
+async def close_http_client() -> None:
+    """Close the running loop's pooled client (call from app/worker shutdown)."""
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+def reset_http_clients() -> None:
+    """Forget clients inherited across fork without touching their sockets."""
+    _clients.clear()
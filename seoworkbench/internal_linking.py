@@ -1,22 +1,261 @@
 from __future__ import annotations
 
-from collections import defaultdict
-from typing import Dict, Iterable, List, Tuple
+import heapq
+import json
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+from scipy import sparse
+
+from .config import get_settings
+from .models import LinkSuggestion
+from .nlp.ann import RandomProjectionIndex
+from .nlp.embeddings import EmbeddingModel, get_embedding_model
+
+
+def _normalize(keywords: Iterable[str]) -> Set[str]:
+    return {kw.lower().strip() for kw in keywords if kw and kw.strip()}
+
+
+class LinkIndex:
+    """Inverted keyword index over pages for overlap-based link suggestions.
+
+    Pages can be added, replaced and removed one at a time: posting lists are
+    updated in place and removed rows are tombstoned until more than half the
+    rows are dead. ``suggest`` answers one page by merging its posting lists;
+    ``suggest_all`` builds a sparse page x keyword matrix and multiplies it
+    against itself in row blocks, keeping the ``top_k`` overlaps per row.
+    Ties are broken by insertion order, like the old pairwise scan.
+    """
+
+    def __init__(self, block_size: int = 2048) -> None:
+        self.block_size = max(1, block_size)
+        self._vocab: Dict[str, int] = {}
+        self._postings: Dict[int, Set[int]] = {}
+        self._rows: Dict[str, int] = {}
+        self._row_ids: List[Optional[str]] = []
+        self._row_terms: List[Set[int]] = []
+        self._matrix: Optional[sparse.csr_matrix] = None
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, page_id: object) -> bool:
+        return page_id in self._rows
+
+    def add_page(self, page_id: str, keywords: Iterable[str]) -> None:
+        if page_id in self._rows:
+            self.remove_page(page_id)
+        terms = set()
+        for kw in _normalize(keywords):
+            tid = self._vocab.setdefault(kw, len(self._vocab))
+            terms.add(tid)
+        row = len(self._row_ids)
+        self._rows[page_id] = row
+        self._row_ids.append(page_id)
+        self._row_terms.append(terms)
+        for tid in terms:
+            self._postings.setdefault(tid, set()).add(row)
+        self._matrix = None
+
+    def add_pages(self, pages: Dict[str, Iterable[str]]) -> None:
+        for page_id, keywords in pages.items():
+            self.add_page(page_id, keywords)
+
+    def remove_page(self, page_id: str) -> None:
+        row = self._rows.pop(page_id, None)
+        if row is None:
+            return
+        for tid in self._row_terms[row]:
+            self._postings[tid].discard(row)
+        self._row_ids[row] = None
+        self._row_terms[row] = set()
+        self._matrix = None
+        if len(self._row_ids) > 64 and len(self._rows) * 2 < len(self._row_ids):
+            self._compact()
+
+    def _compact(self) -> None:
+        live = [(pid, terms) for pid, terms in zip(self._row_ids, self._row_terms) if pid is not None]
+        self._rows, self._row_ids, self._row_terms, self._postings = {}, [], [], {}
+        for row, (pid, terms) in enumerate(live):
+            self._rows[pid] = row
+            self._row_ids.append(pid)
+            self._row_terms.append(terms)
+            for tid in terms:
+                self._postings.setdefault(tid, set()).add(row)
+
+    def suggest(self, page_id: str, top_k: int = 5) -> List[Tuple[str, int]]:
+        row = self._rows[page_id]
+        counts: Counter = Counter()
+        for tid in self._row_terms[row]:
+            counts.update(self._postings[tid])
+        counts.pop(row, None)
+        best = heapq.nsmallest(top_k, counts.items(), key=lambda rc: (-rc[1], rc[0]))
+        return [(self._row_ids[r], c) for r, c in best]  # type: ignore[misc]
+
+    def _csr(self) -> sparse.csr_matrix:
+        if self._matrix is None:
+            indptr = np.zeros(len(self._row_terms) + 1, dtype=np.int64)
+            indptr[1:] = np.cumsum([len(t) for t in self._row_terms])
+            indices = np.fromiter((t for terms in self._row_terms for t in terms), dtype=np.int32, count=int(indptr[-1]))
+            data = np.ones(len(indices), dtype=np.int32)
+            self._matrix = sparse.csr_matrix((data, indices, indptr), shape=(len(self._row_terms), max(1, len(self._vocab))))
+        return self._matrix
+
+    def suggest_all(self, top_k: int = 5) -> Dict[str, List[Tuple[str, int]]]:
+        ids = self._row_ids
+        out: Dict[str, List[Tuple[str, int]]] = {pid: [] for pid in ids if pid is not None}
+        if top_k <= 0:
+            return out
+        M = self._csr()
+        MT = M.T.tocsr()
+        for start in range(0, M.shape[0], self.block_size):
+            block = (M[start: start + self.block_size] @ MT).tocsr()
+            for i in range(block.shape[0]):
+                pid = ids[start + i]
+                if pid is None:
+                    continue
+                lo, hi = block.indptr[i], block.indptr[i + 1]
+                cols, vals = block.indices[lo:hi], block.data[lo:hi]
+                keep = cols != start + i
+                cols, vals = cols[keep], vals[keep]
+                if len(cols) > top_k:
+                    part = np.argpartition(-vals, top_k - 1)[:top_k]
+                    # include everything tied with the k-th score so the final order is exact
+                    kth = vals[part].min()
+                    mask = vals >= kth
+                    cols, vals = cols[mask], vals[mask]
+                order = np.lexsort((cols, -vals))[:top_k]
+                out[pid] = [(ids[c], int(v)) for c, v in zip(cols[order].tolist(), vals[order].tolist())]  # type: ignore[misc]
+        return out
 
 
 def suggest_internal_links(pages: Dict[str, Iterable[str]], top_k: int = 5) -> Dict[str, List[Tuple[str, int]]]:
-    # pages: {page_id: [keywords...]}
-    idx = {pid: set(kw.lower().strip() for kw in kws if kw) for pid, kws in pages.items()}
-    out: Dict[str, List[Tuple[str, int]]] = defaultdict(list)
-    for a, kwa in idx.items():
-        scores = []
-        for b, kwb in idx.items():
-            if a == b:
+    # pages: {page_id: [keywords...]} -> {page_id: [(target_id, shared keyword count), ...]}
+    index = LinkIndex()
+    index.add_pages(pages)
+    return index.suggest_all(top_k=top_k)
+
+
+def _anchor(source_keywords: Iterable[str], target_keywords: List[str]) -> Optional[str]:
+    # Prefer target keywords the source page does not itself target, then the
+    # one sharing the most words with the source; ties keep the target's order
+    own = _normalize(source_keywords)
+    words = {w for kw in own for w in kw.split()}
+    fresh = [kw for kw in target_keywords if kw.lower().strip() not in own] or target_keywords
+    if not fresh:
+        return None
+    return max(fresh, key=lambda kw: (len(words & set(kw.lower().split())), -fresh.index(kw)))
+
+
+class SemanticLinkIndex:
+    """Embedding-based link suggestions for pages that share meaning but not keywords.
+
+    A page vector is the normalized mean of its keyword embeddings. Vectors live
+    in a ``RandomProjectionIndex`` that takes incremental inserts and can be
+    persisted with ``save``/``load``; re-adding a page with unchanged keywords
+    is a no-op, so a reloaded index only embeds new or edited pages.
+    """
+
+    def __init__(
+        self,
+        model: Optional[EmbeddingModel] = None,
+        index: Optional[RandomProjectionIndex] = None,
+        keywords: Optional[Dict[str, List[str]]] = None,
+    ) -> None:
+        s = get_settings()
+        self.model = model or get_embedding_model()
+        self.index = index if index is not None else RandomProjectionIndex(self.model.dim, bits=s.LINK_ANN_BITS, tables=s.LINK_ANN_TABLES)
+        self.keywords: Dict[str, List[str]] = keywords or {}
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def __contains__(self, page_id: object) -> bool:
+        return page_id in self.index
+
+    def add_pages(self, pages: Dict[str, Iterable[str]]) -> int:
+        """Embed and insert new or changed pages; returns how many were (re)indexed."""
+        changed: Dict[str, List[str]] = {}
+        for page_id, kws in pages.items():
+            kws = list(dict.fromkeys(kw.strip() for kw in kws if kw and kw.strip()))
+            if page_id in self.index and self.keywords.get(page_id) == kws:
                 continue
-            overlap = len(kwa & kwb)
-            if overlap > 0:
-                scores.append((b, overlap))
-        scores.sort(key=lambda x: x[1], reverse=True)
-        out[a] = scores[:top_k]
-    return out
+            if not kws:
+                self.remove_page(page_id)
+                continue
+            changed[page_id] = kws
+        if not changed:
+            return 0
+        flat = [kw for kws in changed.values() for kw in kws]
+        X = self.model.embed(flat)
+        offsets = np.cumsum([0] + [len(kws) for kws in changed.values()][:-1])
+        V = np.add.reduceat(X, offsets, axis=0)
+        V /= np.maximum(np.linalg.norm(V, axis=1, keepdims=True), 1e-12)
+        self.index.add(list(changed), V)
+        self.keywords.update(changed)
+        return len(changed)
+
+    def remove_page(self, page_id: str) -> None:
+        self.index.remove(page_id)
+        self.keywords.pop(page_id, None)
+
+    def suggest(self, page_id: str, top_k: int = 5, min_similarity: Optional[float] = None) -> List[LinkSuggestion]:
+        floor = get_settings().LINK_MIN_SIMILARITY if min_similarity is None else min_similarity
+        hits = self.index.query(self.index.vector(page_id), top_k=top_k, exclude=[page_id])
+        own = self.keywords.get(page_id, [])
+        return [
+            LinkSuggestion(target=target, score=round(score, 4), anchor=_anchor(own, self.keywords.get(target, [])))
+            for target, score in hits
+            if score >= floor
+        ]
+
+    def suggest_all(self, top_k: int = 5, min_similarity: Optional[float] = None) -> Dict[str, List[LinkSuggestion]]:
+        return {pid: self.suggest(pid, top_k, min_similarity) for pid in list(self.keywords)}
+
+    def save(self, directory: str | Path) -> None:
+        root = Path(directory)
+        self.index.save(root / "pages")
+        meta = {"model": self.model.model_name, "dim": self.model.dim, "keywords": self.keywords}
+        tmp = root / "keywords.json.tmp"
+        tmp.write_text(json.dumps(meta, ensure_ascii=False), encoding="utf-8")
+        tmp.replace(root / "keywords.json")
+
+    @classmethod
+    def load(cls, directory: str | Path, model: Optional[EmbeddingModel] = None) -> "SemanticLinkIndex":
+        """Reopen a saved index; starts empty if missing or built with a different model."""
+        model = model or get_embedding_model()
+        root = Path(directory)
+        try:
+            meta = json.loads((root / "keywords.json").read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return cls(model)
+        index = RandomProjectionIndex.load(root / "pages")
+        if (
+            index is None
+            or meta.get("model") != model.model_name
+            or index.dim != model.dim
+            or set(meta.get("keywords", {})) != set(index.ids())
+        ):
+            return cls(model)
+        return cls(model, index=index, keywords=meta["keywords"])
+
+
+def suggest_semantic_links(
+    pages: Dict[str, Iterable[str]],
+    top_k: int = 5,
+    index_dir: Optional[str] = None,
+) -> Dict[str, List[LinkSuggestion]]:
+    """Semantic counterpart to ``suggest_internal_links``; persists to ``LINK_INDEX_DIR`` when set.
 
+    With a persisted index, targets include every page indexed so far, not
+    only the ones passed in this call.
+    """
+    index_dir = index_dir or get_settings().LINK_INDEX_DIR
+    index = SemanticLinkIndex.load(index_dir) if index_dir else SemanticLinkIndex()
+    index.add_pages(pages)
+    if index_dir:
+        index.save(index_dir)
+    return {pid: index.suggest(pid, top_k) if pid in index else [] for pid in pages}
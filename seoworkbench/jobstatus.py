@@ -0,0 +1,232 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import Any, AsyncContextManager, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import orjson
+
+from .config import get_settings
+from .serialization import dumps
+from .storage.models import JobStatusEnum
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_STATUSES = (JobStatusEnum.SUCCESS, JobStatusEnum.FAILURE)
+
+JobState = Dict[str, Any]
+NextUpdate = Callable[[float], Awaitable[Optional[JobState]]]
+ProgressCallback = Callable[[str, int, int], Awaitable[None]]
+
+
+def is_terminal(state: Optional[JobState]) -> bool:
+    return state is not None and state.get("status") in TERMINAL_STATUSES
+
+
+class JobStatusStore:
+    """Hot job state: the latest snapshot per job plus a feed of every update.
+
+    ``update`` merges changes into the snapshot and publishes the new state to
+    subscribers. ``shared`` says whether other processes (workers) see the
+    same store; only then is a non-terminal snapshot authoritative over the
+    jobs table.
+    """
+
+    shared = False
+
+    async def get(self, job_id: str) -> Optional[JobState]:
+        raise NotImplementedError
+
+    async def put(self, job_id: str, state: JobState, publish: bool = True) -> None:
+        raise NotImplementedError
+
+    async def delete(self, job_id: str) -> None:
+        raise NotImplementedError
+
+    async def update(self, job_id: str, **changes: Any) -> JobState:
+        # Not atomic: concurrent updates of one job must be serialized by the caller
+        state = await self.get(job_id) or {"job_id": job_id}
+        state.update(changes)
+        state["updated_at"] = datetime.utcnow().isoformat()
+        await self.put(job_id, state)
+        return state
+
+    def subscribe(self, job_id: str) -> AsyncContextManager[NextUpdate]:
+        """Async context manager yielding ``next_update(timeout)``; it returns ``None`` when idle."""
+        raise NotImplementedError
+
+    async def aclose(self) -> None:
+        return None
+
+
+class MemoryJobStatusStore(JobStatusStore):
+    """Process-local store; subscribers on any event loop in this process are notified."""
+
+    def __init__(self, ttl: float, max_entries: int = 10_000, shared: bool = False) -> None:
+        self.ttl = ttl
+        self.max_entries = max(1, max_entries)
+        self.shared = shared
+        self._data: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self._subs: Dict[str, List[Tuple[asyncio.AbstractEventLoop, "asyncio.Queue[JobState]"]]] = {}
+        self._lock = threading.Lock()
+
+    async def get(self, job_id: str) -> Optional[JobState]:
+        with self._lock:
+            item = self._data.get(job_id)
+            if item is None:
+                return None
+            if item[0] < time.time():
+                del self._data[job_id]
+                return None
+            # Stored encoded so callers never share (and mutate) one dict
+            return orjson.loads(item[1])
+
+    async def put(self, job_id: str, state: JobState, publish: bool = True) -> None:
+        raw = dumps(state)
+        with self._lock:
+            self._data[job_id] = (time.time() + self.ttl, raw)
+            self._data.move_to_end(job_id)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+            subs = list(self._subs.get(job_id, ())) if publish else []
+        for loop, queue in subs:
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, orjson.loads(raw))
+            except RuntimeError:  # subscriber's loop already closed
+                pass
+
+    async def delete(self, job_id: str) -> None:
+        with self._lock:
+            self._data.pop(job_id, None)
+
+    @asynccontextmanager
+    async def subscribe(self, job_id: str) -> AsyncIterator[NextUpdate]:
+        entry = (asyncio.get_running_loop(), asyncio.Queue())  # type: ignore[var-annotated]
+        with self._lock:
+            self._subs.setdefault(job_id, []).append(entry)
+
+        async def next_update(timeout: float) -> Optional[JobState]:
+            try:
+                return await asyncio.wait_for(entry[1].get(), timeout)
+            except asyncio.TimeoutError:
+                return None
+
+        try:
+            yield next_update
+        finally:
+            with self._lock:
+                subs = self._subs.get(job_id, [])
+                if entry in subs:
+                    subs.remove(entry)
+                if not subs:
+                    self._subs.pop(job_id, None)
+
+
+class RedisJobStatusStore(JobStatusStore):
+    """Snapshot under ``seoworkbench:job:<id>`` (with TTL), updates on ``seoworkbench:job:<id>:events``."""
+
+    shared = True
+
+    def __init__(self, url: str, ttl: float) -> None:
+        import redis.asyncio as aioredis  # type: ignore
+
+        self._client = aioredis.from_url(url)
+        self.ttl = max(1, int(ttl))
+        self.prefix = "seoworkbench:job:"
+
+    def _channel(self, job_id: str) -> str:
+        return f"{self.prefix}{job_id}:events"
+
+    async def get(self, job_id: str) -> Optional[JobState]:
+        raw = await self._client.get(self.prefix + job_id)
+        return None if raw is None else orjson.loads(raw)
+
+    async def put(self, job_id: str, state: JobState, publish: bool = True) -> None:
+        raw = dumps(state)
+        async with self._client.pipeline(transaction=False) as pipe:
+            pipe.set(self.prefix + job_id, raw, ex=self.ttl)
+            if publish:
+                pipe.publish(self._channel(job_id), raw)
+            await pipe.execute()
+
+    async def delete(self, job_id: str) -> None:
+        await self._client.delete(self.prefix + job_id)
+
+    @asynccontextmanager
+    async def subscribe(self, job_id: str) -> AsyncIterator[NextUpdate]:
+        pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+        await pubsub.subscribe(self._channel(job_id))
+
+        async def next_update(timeout: float) -> Optional[JobState]:
+            msg = await pubsub.get_message(timeout=timeout)
+            return None if msg is None else orjson.loads(msg["data"])
+
+        try:
+            yield next_update
+        finally:
+            await pubsub.unsubscribe()
+            await pubsub.aclose()
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+
+_store: Optional[JobStatusStore] = None
+_store_lock = threading.Lock()
+
+
+def get_job_status_store() -> JobStatusStore:
+    """Redis when ``JOB_STATUS_BACKEND=redis`` and REDIS_URL is set, else in-process memory."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            s = get_settings()
+            if s.JOB_STATUS_BACKEND.lower() == "redis" and s.REDIS_URL:
+                try:
+                    _store = RedisJobStatusStore(s.REDIS_URL, s.JOB_STATUS_TTL)
+                except Exception:
+                    logger.warning(
+                        "Redis job status store unavailable; falling back to the in-process store "
+                        "(workers will write every status to Postgres)",
+                        exc_info=True,
+                    )
+            if _store is None:
+                _store = MemoryJobStatusStore(s.JOB_STATUS_TTL)
+        return _store
+
+
+def set_job_status_store(store: Optional[JobStatusStore]) -> None:
+    global _store
+    with _store_lock:
+        _store = store
+
+
+async def close_job_status_store() -> None:
+    """Close the store's connections; the Redis client is bound to the loop that used it."""
+    global _store
+    with _store_lock:
+        store, _store = _store, None
+    if store is not None:
+        await store.aclose()
+
+
+def progress_reporter(job_id: str) -> ProgressCallback:
+    """``await report(stage, done, total)`` publishes progress without touching the jobs table."""
+    store = get_job_status_store()
+    # Reports come from concurrent tasks; the lock (FIFO) keeps their read-merge-write
+    # cycles from interleaving, so a stale ``done`` is never published last
+    lock = asyncio.Lock()
+
+    async def report(stage: str, done: int, total: int) -> None:
+        async with lock:
+            try:
+                await store.update(job_id, progress={"stage": stage, "done": done, "total": total})
+            except Exception:
+                pass  # progress is best-effort; never fail the job over it
+
+    return report
@@ -41,6 +41,12 @@ class KeywordCluster(BaseModel):
     centroid: Optional[List[float]] = None
 
 
+class LinkSuggestion(BaseModel):
+    target: str
+    score: float  # cosine similarity of page embeddings
+    anchor: Optional[str] = None  # one of the target's keywords
+
+
 class BriefSection(BaseModel):
     heading: str
     description: Optional[str] = None
@@ -63,6 +69,7 @@ class GenerationRequest(BaseModel):
     target_length_words: int = 1800
     tone: str = "expert yet friendly"
     audience: Optional[str] = None
+    parallel_sections: bool = False  # draft intro, each outline section and conclusion concurrently
 
 
 class GenerationResponse(BaseModel):
@@ -76,6 +83,8 @@ class GenerationResponse(BaseModel):
 class ResearchRequest(BaseModel):
     seeds: List[str]
     max_keywords: int = 300
+    project: Optional[str] = None  # when set, assign into the project's persisted clusters
+    centroids: Optional[str] = None  # full|float16|omit; defaults to RESEARCH_CENTROIDS
 
 
 class ResearchResponse(BaseModel):
@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+class RandomProjectionIndex:
+    """Approximate cosine nearest neighbours via random-hyperplane LSH.
+
+    Each of ``tables`` hash tables keys a vector by the signs of ``bits``
+    random projections. A query probes its own bucket plus every bucket one
+    bit-flip away in each table, then re-ranks the union exactly with a dot
+    product, so only a small slice of the index is touched per query. Small
+    indexes (below ``exact_below`` rows) are scanned exactly instead.
+
+    Vectors are expected L2-normalized. Inserts are incremental; removals are
+    tombstoned and dropped on the next ``compact``/``save``.
+    """
+
+    def __init__(self, dim: int, bits: int = 14, tables: int = 16, seed: int = 7, exact_below: int = 2048) -> None:
+        self.dim = dim
+        self.bits = max(1, min(bits, 62))
+        self.tables = max(1, tables)
+        self.seed = seed
+        self.exact_below = exact_below
+        rng = np.random.default_rng(seed)
+        self._planes = rng.standard_normal((dim, self.tables * self.bits)).astype(np.float32)
+        self._weights = np.int64(1) << np.arange(self.bits, dtype=np.int64)
+        self._vectors = np.zeros((0, dim), dtype=np.float32)
+        self._size = 0
+        self._ids: List[Optional[str]] = []
+        self._rows: Dict[str, int] = {}
+        self._buckets: List[Dict[int, List[int]]] = [{} for _ in range(self.tables)]
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, item_id: object) -> bool:
+        return item_id in self._rows
+
+    def _codes(self, X: np.ndarray) -> np.ndarray:
+        signs = (X @ self._planes > 0).reshape(len(X), self.tables, self.bits)
+        return signs.astype(np.int64) @ self._weights  # (n, tables)
+
+    def _reserve(self, extra: int) -> None:
+        need = self._size + extra
+        if need > len(self._vectors):
+            grown = np.zeros((max(need, 2 * len(self._vectors), 1024), self.dim), dtype=np.float32)
+            grown[: self._size] = self._vectors[: self._size]
+            self._vectors = grown
+
+    def add(self, ids: Sequence[str], vectors: np.ndarray) -> None:
+        """Insert (or replace) ``ids`` with the matching rows of ``vectors``."""
+        X = np.ascontiguousarray(vectors, dtype=np.float32).reshape(len(ids), self.dim)
+        for item_id in ids:
+            self.remove(item_id)
+        self._reserve(len(ids))
+        start = self._size
+        self._vectors[start: start + len(ids)] = X
+        self._size += len(ids)
+        codes = self._codes(X).tolist()
+        for offset, (item_id, row_codes) in enumerate(zip(ids, codes)):
+            row = start + offset
+            self._rows[item_id] = row
+            self._ids.append(item_id)
+            for table, code in enumerate(row_codes):
+                self._buckets[table].setdefault(code, []).append(row)
+
+    def remove(self, item_id: str) -> None:
+        row = self._rows.pop(item_id, None)
+        if row is not None:
+            self._ids[row] = None  # bucket entries are skipped at query time
+
+    def ids(self) -> List[str]:
+        return list(self._rows)
+
+    def vector(self, item_id: str) -> np.ndarray:
+        return self._vectors[self._rows[item_id]]
+
+    def _candidates(self, q: np.ndarray) -> np.ndarray:
+        codes = self._codes(q[None, :])[0].tolist()
+        flips = [0] + [1 << b for b in range(self.bits)]
+        rows: List[int] = []
+        for table, code in enumerate(codes):
+            buckets = self._buckets[table]
+            for flip in flips:
+                hit = buckets.get(code ^ flip)
+                if hit:
+                    rows.extend(hit)
+        return np.unique(np.asarray(rows, dtype=np.int64))
+
+    def query(self, vector: np.ndarray, top_k: int = 10, exclude: Iterable[str] = ()) -> List[Tuple[str, float]]:
+        """Top ``top_k`` ``(id, cosine)`` pairs, best first."""
+        q = np.asarray(vector, dtype=np.float32).reshape(self.dim)
+        if len(self._rows) < self.exact_below:
+            rows = np.asarray(list(self._rows.values()), dtype=np.int64)
+        else:
+            rows = self._candidates(q)
+        skip = {self._rows[e] for e in exclude if e in self._rows}
+        if rows.size == 0:
+            return []
+        sims = self._vectors[rows] @ q
+        order = np.argsort(-sims, kind="stable")
+        out: List[Tuple[str, float]] = []
+        for i in order.tolist():
+            row = int(rows[i])
+            item_id = self._ids[row]
+            if item_id is None or row in skip:
+                continue
+            out.append((item_id, float(sims[i])))
+            if len(out) >= top_k:
+                break
+        return out
+
+    def compact(self) -> None:
+        live = [(item_id, row) for row, item_id in enumerate(self._ids) if item_id is not None]
+        vectors = self._vectors[[row for _, row in live]] if live else np.zeros((0, self.dim), np.float32)
+        self._vectors = np.zeros((0, self.dim), dtype=np.float32)
+        self._size = 0
+        self._ids, self._rows = [], {}
+        self._buckets = [{} for _ in range(self.tables)]
+        if live:
+            self.add([item_id for item_id, _ in live], vectors)
+
+    def save(self, path: str | Path) -> None:
+        """Persist to ``<path>.npy`` + ``<path>.json`` (buckets are rebuilt on load)."""
+        self.compact()
+        base = Path(path)
+        base.parent.mkdir(parents=True, exist_ok=True)
+        meta = {"dim": self.dim, "bits": self.bits, "tables": self.tables, "seed": self.seed, "ids": self._ids}
+        for suffix, write in (
+            (".npy", lambda f: np.save(f, self._vectors[: self._size])),
+            (".json", lambda f: f.write(json.dumps(meta).encode("utf-8"))),
+        ):
+            target = base.with_name(base.name + suffix)
+            tmp = target.with_name(target.name + ".tmp")
+            with open(tmp, "wb") as f:
+                write(f)
+            os.replace(tmp, target)
+
+    @classmethod
+    def load(cls, path: str | Path, exact_below: int = 2048) -> Optional["RandomProjectionIndex"]:
+        base = Path(path)
+        try:
+            meta = json.loads(base.with_name(base.name + ".json").read_text(encoding="utf-8"))
+            vectors = np.load(base.with_name(base.name + ".npy"))
+        except (OSError, ValueError):
+            return None
+        index = cls(meta["dim"], bits=meta["bits"], tables=meta["tables"], seed=meta["seed"], exact_below=exact_below)
+        if len(meta["ids"]) != len(vectors):
+            return None
+        if meta["ids"]:
+            index.add(meta["ids"], vectors)
+        return index
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import List, Tuple
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence, Set, Tuple, Union
 
 import numpy as np
 
@@ -11,32 +11,265 @@ except Exception:  # pragma: no cover
 
 from sklearn.cluster import AgglomerativeClustering
 
+from ..config import get_settings
+from ..models import KeywordCluster, KeywordRecord
+from ..table import KeywordTable
 
-def cluster_embeddings(embeddings: List[List[float]], min_cluster_size: int = 5) -> List[int]:
-    X = np.array(embeddings, dtype=np.float32)
-    if hdbscan is not None and X.shape[0] >= min_cluster_size * 2:
+Matrix = Union[np.ndarray, Sequence[Sequence[float]]]
+
+
+def _as_matrix(embeddings: Matrix) -> np.ndarray:
+    # No copy when the caller already hands us a contiguous float32 matrix
+    return np.ascontiguousarray(embeddings, dtype=np.float32)
+
+
+ENGINES = ("auto", "hdbscan", "agglomerative", "minibatch_kmeans")
+
+
+def choose_k(n: int, min_cluster_size: int = 5) -> int:
+    """Rule-of-thumb cluster count (sqrt(n/2)), kept within what min_cluster_size allows."""
+    if n <= 1:
+        return 1
+    upper = max(2, n // max(2, min_cluster_size))
+    return int(max(2, min(upper, round((n / 2) ** 0.5))))
+
+
+def cluster_embeddings(
+    embeddings: Matrix,
+    min_cluster_size: int = 5,
+    engine: Optional[str] = None,
+) -> np.ndarray:
+    """Cluster rows of ``embeddings`` and return one integer label per row.
+
+    ``engine`` defaults to ``CLUSTERING_ENGINE``. In ``auto`` mode inputs with at
+    least ``CLUSTERING_LARGE_THRESHOLD`` rows go to mini-batch k-means (bounded
+    memory, multi-core); smaller inputs use HDBSCAN with an agglomerative fallback.
+    """
+    settings = get_settings()
+    engine = (engine or settings.CLUSTERING_ENGINE).lower()
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown clustering engine: {engine}")
+    X = _as_matrix(embeddings)
+    n = X.shape[0]
+    if n <= 1:
+        return np.zeros(n, dtype=np.int64)
+    if engine == "minibatch_kmeans" or (engine == "auto" and n >= settings.CLUSTERING_LARGE_THRESHOLD):
+        return _minibatch_kmeans(X, min_cluster_size, n_jobs=settings.CLUSTERING_N_JOBS)
+    if engine in ("auto", "hdbscan") and hdbscan is not None and n >= min_cluster_size * 2:
         try:
-            labels = hdbscan.HDBSCAN(min_cluster_size=min_cluster_size, min_samples=2).fit_predict(X)
-            return labels.tolist()
+            return hdbscan.HDBSCAN(
+                min_cluster_size=min_cluster_size, min_samples=2, core_dist_n_jobs=settings.CLUSTERING_N_JOBS
+            ).fit_predict(X)
         except Exception:
             pass
     # Fallback: Agglomerative with heuristic cluster count
+    model = AgglomerativeClustering(n_clusters=choose_k(n, min_cluster_size))
+    return model.fit_predict(X)
+
+
+def _minibatch_kmeans(X: np.ndarray, min_cluster_size: int, n_jobs: int = -1, sample_size: int = 5000) -> np.ndarray:
+    from joblib import Parallel, delayed
+    from sklearn.cluster import MiniBatchKMeans
+    from sklearn.metrics import silhouette_score
+
     n = X.shape[0]
-    if n <= 1:
-        return [0] * n
-    k = max(2, min(10, n // max(2, min_cluster_size)))
-    model = AgglomerativeClustering(n_clusters=k)
-    labels = model.fit_predict(X)
-    return labels.tolist()
+    base = choose_k(n, min_cluster_size)
+    upper = max(2, n // max(2, min_cluster_size))
+    candidates = sorted({max(2, min(upper, k)) for k in (base // 2, base, base * 2)})
+    batch_size = min(n, max(1024, 4 * base))
+
+    def make(k: int) -> "MiniBatchKMeans":
+        return MiniBatchKMeans(n_clusters=k, batch_size=batch_size, n_init=3, random_state=0)
+
+    if len(candidates) > 1:
+        # Pick k by silhouette on a fixed sample: O(sample^2) regardless of n
+        rng = np.random.default_rng(0)
+        sample = X[rng.choice(n, size=min(n, sample_size), replace=False)]
+
+        def score(k: int) -> float:
+            if k >= sample.shape[0]:
+                return -1.0
+            labels = make(k).fit_predict(sample)
+            if len(set(labels.tolist())) < 2:
+                return -1.0
+            return float(silhouette_score(sample, labels))
+
+        scores = Parallel(n_jobs=n_jobs, prefer="threads")(delayed(score)(k) for k in candidates)
+        k = candidates[int(np.argmax(scores))]
+    else:
+        k = candidates[0]
+    return make(k).fit_predict(X)
 
 
-def centroid(vectors: List[List[float]]) -> List[float]:
-    X = np.array(vectors, dtype=np.float32)
+def centroid(vectors: Matrix) -> np.ndarray:
+    X = _as_matrix(vectors)
     if X.size == 0:
-        return []
+        return np.zeros(0, dtype=np.float32)
     c = X.mean(axis=0)
     norm = np.linalg.norm(c)
     if norm > 0:
         c = c / norm
-    return c.tolist()
+    return c
+
+
+def group_indices(labels: np.ndarray) -> Dict[int, np.ndarray]:
+    """Map each label to the row indices carrying it, in first-seen label order."""
+    labels = np.asarray(labels)
+    if labels.size == 0:
+        return {}
+    uniq, first, inverse = np.unique(labels, return_index=True, return_inverse=True)
+    order = np.argsort(inverse, kind="stable")
+    bounds = np.cumsum(np.bincount(inverse, minlength=uniq.size))[:-1]
+    groups = np.split(order, bounds)
+    return {int(uniq[i]): groups[i] for i in np.argsort(first)}
+
+
+def cluster_centroids(X: np.ndarray, groups: Dict[int, np.ndarray]) -> Tuple[List[int], np.ndarray]:
+    """Normalized mean vector per group as one ``(n_groups, dim)`` matrix."""
+    ids = list(groups)
+    out = np.zeros((len(ids), X.shape[1] if X.ndim == 2 else 0), dtype=np.float32)
+    for row, lab in enumerate(ids):
+        out[row] = X[groups[lab]].mean(axis=0)
+    norms = np.linalg.norm(out, axis=1, keepdims=True)
+    np.divide(out, norms, out=out, where=norms > 0)
+    return ids, out
+
+
+def build_clusters(
+    records: Union[List[KeywordRecord], KeywordTable],
+    X: np.ndarray,
+    labels: np.ndarray,
+    centroids: Optional[Mapping[int, np.ndarray]] = None,
+) -> List[KeywordCluster]:
+    """Attach cluster ids to records and assemble response clusters.
+
+    Vectors stay in ``X``; only the per-cluster centroid is converted to a list,
+    at the point where it leaves for the JSON response. ``centroids`` overrides
+    the batch centroid per label (e.g. persisted project-wide centroids). With
+    a ``KeywordTable`` the ids go into its cluster column and member records
+    are materialized here, once, for the response.
+    """
+    groups = group_indices(labels)
+    ids, cents = cluster_centroids(X, groups)
+    if isinstance(records, KeywordTable):
+        records.set_clusters(labels, {lab: f"c{lab}" for lab in ids})
+    clusters: List[KeywordCluster] = []
+    for lab, cvec in zip(ids, cents):
+        if centroids is not None and lab in centroids:
+            cvec = centroids[lab]
+        cid = f"c{lab}"
+        if isinstance(records, KeywordTable):
+            members = records.records(groups[lab].tolist())
+        else:
+            members = [records[i] for i in groups[lab]]
+        for rec in members:
+            rec.cluster_id = cid
+        clusters.append(KeywordCluster(id=cid, label=cid, keywords=members, centroid=cvec.tolist()))
+    return clusters
+
+
+def iter_cluster_dicts(
+    table: KeywordTable,
+    X: np.ndarray,
+    labels: np.ndarray,
+    centroids: Optional[Mapping[int, np.ndarray]] = None,
+) -> Iterator[Dict[str, Any]]:
+    """``build_clusters`` for the serialization path: plain dicts built from table columns.
+
+    No Pydantic models are created and centroids stay float32 arrays, so the
+    encoder can write them directly. Cluster ids are stored on the table first.
+    """
+    groups = group_indices(labels)
+    ids, cents = cluster_centroids(X, groups)
+    table.set_clusters(labels, {lab: f"c{lab}" for lab in ids})
+    for lab, cvec in zip(ids, cents):
+        if centroids is not None and lab in centroids:
+            cvec = centroids[lab]
+        cid = f"c{lab}"
+        yield {"id": cid, "label": cid, "keywords": table.row_dicts(groups[lab]), "centroid": cvec}
+
+
+class IncrementalClusterer:
+    """Assigns new keywords to existing clusters without re-clustering the project.
+
+    Holds one running-mean vector and member count per cluster index. ``assign``
+    matches rows to the most similar normalized centroid in one matrix product;
+    rows below ``threshold`` are clustered among themselves and become new
+    clusters with fresh indices, so existing ``c<n>`` ids never move.
+    """
+
+    def __init__(
+        self,
+        indices: Sequence[int] = (),
+        means: Optional[np.ndarray] = None,
+        sizes: Sequence[int] = (),
+        threshold: float = 0.6,
+        first_free: int = 0,
+    ) -> None:
+        self.indices = np.asarray(indices, dtype=np.int64)
+        # Lowest index a new cluster may take; covers persisted clusters not loaded here
+        self.first_free = first_free
+        self.means = np.zeros((0, 0), dtype=np.float32) if means is None else _as_matrix(means)
+        self.sizes = np.asarray(sizes, dtype=np.int64)
+        self.threshold = threshold
+        self.dirty: Set[int] = set()
+
+    @property
+    def next_index(self) -> int:
+        return max(int(self.indices.max()) + 1 if self.indices.size else 0, self.first_free)
+
+    def normalized(self) -> np.ndarray:
+        norms = np.linalg.norm(self.means, axis=1, keepdims=True)
+        out = self.means.copy()
+        np.divide(out, norms, out=out, where=norms > 0)
+        return out
+
+    def centroid_map(self) -> Dict[int, np.ndarray]:
+        return dict(zip(self.indices.tolist(), self.normalized()))
+
+    def assign(self, X: Matrix, min_cluster_size: int = 5) -> np.ndarray:
+        X = _as_matrix(X)
+        labels = np.full(X.shape[0], -1, dtype=np.int64)
+        if X.shape[0] == 0:
+            return labels
+        if self.indices.size and self.means.shape[1] == X.shape[1]:
+            sims = X @ self.normalized().T
+            best = sims.argmax(axis=1)
+            hit = sims[np.arange(X.shape[0]), best] >= self.threshold
+            labels[hit] = self.indices[best[hit]]
+
+        outliers = np.flatnonzero(labels < 0)
+        if outliers.size:
+            sub = cluster_embeddings(X[outliers], min_cluster_size=min_cluster_size)
+            fresh = sub >= 0
+            labels[outliers[fresh]] = sub[fresh] + self.next_index
+        self._absorb(X, labels)
+        return labels
+
+    def _absorb(self, X: np.ndarray, labels: np.ndarray) -> None:
+        ok = labels >= 0
+        if not ok.any():
+            return
+        uniq, inv = np.unique(labels[ok], return_inverse=True)
+        sums = np.zeros((uniq.size, X.shape[1]), dtype=np.float32)
+        np.add.at(sums, inv, X[ok])
+        counts = np.bincount(inv, minlength=uniq.size)
 
+        if self.means.shape[1] != X.shape[1]:
+            # Dimension changed (new embedding model): start the project over
+            self.indices = np.zeros(0, dtype=np.int64)
+            self.means = np.zeros((0, X.shape[1]), dtype=np.float32)
+            self.sizes = np.zeros(0, dtype=np.int64)
+        row_of = {lab: i for i, lab in enumerate(self.indices.tolist())}
+        rows = np.array([row_of.get(lab, -1) for lab in uniq.tolist()], dtype=np.int64)
+        known = rows >= 0
+        if known.any():
+            r = rows[known]
+            total = self.sizes[r] + counts[known]
+            self.means[r] = (self.means[r] * self.sizes[r, None] + sums[known]) / total[:, None]
+            self.sizes[r] = total
+        if (~known).any():
+            self.indices = np.concatenate([self.indices, uniq[~known]])
+            self.means = np.vstack([self.means, sums[~known] / counts[~known, None]]).astype(np.float32)
+            self.sizes = np.concatenate([self.sizes, counts[~known]])
+        self.dirty.update(int(lab) for lab in uniq.tolist())
@@ -1,6 +1,13 @@
 from __future__ import annotations
 
-from typing import Iterable, List, Optional
+import asyncio
+import hashlib
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
 
 import numpy as np
 
@@ -12,33 +19,412 @@ except Exception:  # pragma: no cover
 from ..config import get_settings
 
 
+def normalize_term(text: Optional[str]) -> str:
+    return " ".join((text or "").lower().split())
+
+
+class EmbeddingStore:
+    """Content-addressed on-disk cache of embeddings for one model.
+
+    Vectors live in a fixed-capacity memory-mapped matrix (float16 by default,
+    recorded in the index so reopening with another dtype still reads it
+    correctly) and a SQLite index maps ``hash(normalized text) -> slot`` with
+    a last-used timestamp for LRU eviction. SQLite's file locking serializes writers, so
+    the API and Celery workers on one host can share a cache directory. Each
+    slot also carries a 64-bit key tag that readers check, so a slot recycled
+    by another process between lookup and read is treated as a miss.
+    """
+
+    _CHUNK = 500  # stay well under SQLite's bound-parameter limit
+
+    def __init__(self, root: str | Path, model_name: str, max_entries: int = 500_000, dtype: str = "float16") -> None:
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.model_name = model_name
+        slug = re.sub(r"[^A-Za-z0-9_.-]+", "_", model_name)
+        self._vec_path = self.root / f"{slug}.vec"
+        self._tag_path = self.root / f"{slug}.tag"
+        self.max_entries = max(1, int(max_entries))
+        self.dtype = np.dtype(dtype)
+        self._vecs: Optional[np.memmap] = None
+        self._tags: Optional[np.memmap] = None
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            str(self.root / f"{slug}.sqlite"), timeout=30, check_same_thread=False, isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, slot INTEGER NOT NULL UNIQUE, last_used REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS entries_last_used ON entries(last_used)")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT NOT NULL)")
+
+    @staticmethod
+    def _key(text: str) -> Tuple[str, int]:
+        digest = hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+        return digest.hex(), int.from_bytes(digest[:8], "little", signed=True)
+
+    def _meta(self, name: str) -> Optional[str]:
+        row = self._conn.execute("SELECT value FROM meta WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else None
+
+    def _open(self, dim: Optional[int] = None) -> bool:
+        """Map the vector/tag files, creating them (inside a write txn) on first put."""
+        if self._vecs is not None:
+            return True
+        stored_dim = self._meta("dim")
+        if stored_dim is None:
+            if dim is None:
+                return False
+            self._conn.execute(
+                "INSERT INTO meta(name, value) VALUES ('dim', ?), ('capacity', ?), ('next_slot', '0'), ('dtype', ?)",
+                (str(dim), str(self.max_entries), self.dtype.name),
+            )
+            shape = (self.max_entries, dim)
+            np.memmap(self._vec_path, dtype=self.dtype, mode="w+", shape=shape).flush()
+            np.memmap(self._tag_path, dtype=np.int64, mode="w+", shape=(self.max_entries,)).flush()
+        capacity = int(self._meta("capacity") or self.max_entries)
+        width = int(self._meta("dim") or 0)
+        stored_dtype = self._meta("dtype")
+        if stored_dtype is None:
+            # Written before the dtype was recorded: infer it from the file size
+            itemsize = self._vec_path.stat().st_size // max(1, capacity * width)
+            stored_dtype = {2: "float16", 4: "float32"}.get(itemsize)
+            if stored_dtype is None:
+                raise ValueError(f"cannot tell the dtype of {self._vec_path}")
+            self._conn.execute("INSERT OR REPLACE INTO meta(name, value) VALUES ('dtype', ?)", (stored_dtype,))
+        # The file keeps the dtype it was created with, whatever EMBEDDING_CACHE_DTYPE says now
+        self.dtype = np.dtype(stored_dtype)
+        self._vecs = np.memmap(self._vec_path, dtype=self.dtype, mode="r+", shape=(capacity, width))
+        self._tags = np.memmap(self._tag_path, dtype=np.int64, mode="r+", shape=(capacity,))
+        return True
+
+    def get_many(self, texts: Sequence[str]) -> List[Optional[np.ndarray]]:
+        out: List[Optional[np.ndarray]] = [None] * len(texts)
+        if not texts:
+            return out
+        keys = [self._key(t) for t in texts]
+        with self._lock:
+            if not self._open():
+                return out
+            assert self._vecs is not None and self._tags is not None
+            slots: Dict[str, int] = {}
+            uniq = list({k for k, _ in keys})
+            for i in range(0, len(uniq), self._CHUNK):
+                chunk = uniq[i: i + self._CHUNK]
+                marks = ",".join("?" * len(chunk))
+                slots.update(self._conn.execute(f"SELECT key, slot FROM entries WHERE key IN ({marks})", chunk).fetchall())
+            hits = set()
+            for pos, (key, tag) in enumerate(keys):
+                slot = slots.get(key)
+                if slot is None:
+                    continue
+                vec = np.array(self._vecs[slot], dtype=np.float32)
+                if int(self._tags[slot]) != tag:
+                    continue
+                out[pos] = vec
+                hits.add(key)
+            if hits:
+                now = time.time()
+                self._conn.execute("BEGIN")
+                self._conn.executemany("UPDATE entries SET last_used = ? WHERE key = ?", [(now, k) for k in hits])
+                self._conn.execute("COMMIT")
+        return out
+
+    def put_many(self, texts: Sequence[str], vectors: Sequence[np.ndarray]) -> None:
+        if not texts:
+            return
+        mat = np.asarray(vectors, dtype=np.float32)
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._open(mat.shape[1])
+                assert self._vecs is not None and self._tags is not None
+                if self._vecs.shape[1] != mat.shape[1]:
+                    raise ValueError("embedding dimension does not match the cache file")
+                capacity = self._vecs.shape[0]
+                fresh: Dict[str, Tuple[int, int]] = {}
+                for pos, t in enumerate(texts):
+                    key, tag = self._key(t)
+                    fresh.setdefault(key, (pos, tag))
+                keys = list(fresh)
+                for i in range(0, len(keys), self._CHUNK):
+                    chunk = keys[i: i + self._CHUNK]
+                    marks = ",".join("?" * len(chunk))
+                    for (k,) in self._conn.execute(f"SELECT key FROM entries WHERE key IN ({marks})", chunk):
+                        fresh.pop(k, None)
+                todo = list(fresh.items())[:capacity]
+                if not todo:
+                    self._conn.execute("COMMIT")
+                    return
+
+                next_slot = int(self._meta("next_slot") or 0)
+                n_new = min(len(todo), capacity - next_slot)
+                slots = list(range(next_slot, next_slot + n_new))
+                self._conn.execute("UPDATE meta SET value = ? WHERE name = 'next_slot'", (str(next_slot + n_new),))
+                if len(slots) < len(todo):
+                    victims = self._conn.execute(
+                        "SELECT key, slot FROM entries ORDER BY last_used LIMIT ?", (len(todo) - len(slots),)
+                    ).fetchall()
+                    self._conn.executemany("DELETE FROM entries WHERE key = ?", [(k,) for k, _ in victims])
+                    slots.extend(slot for _, slot in victims)
+
+                now = time.time()
+                rows = []
+                for (key, (pos, tag)), slot in zip(todo, slots):
+                    # Invalidate the tag before overwriting so concurrent readers see a miss
+                    self._tags[slot] = 0
+                    self._vecs[slot] = mat[pos]
+                    self._tags[slot] = tag
+                    rows.append((key, slot, now))
+                self._vecs.flush()
+                self._tags.flush()
+                self._conn.executemany("INSERT INTO entries(key, slot, last_used) VALUES (?, ?, ?)", rows)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def __len__(self) -> int:
+        with self._lock:
+            return int(self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0])
+
+
+def _parse_ngram_range(value: Optional[str]) -> Optional[Tuple[int, int]]:
+    if not value:
+        return None
+    parts = [int(p) for p in value.replace("-", ",").split(",") if p.strip()]
+    if not parts:
+        return None
+    return (parts[0], parts[-1])
+
+
+class HashingEmbedder:
+    """Deterministic bag-of-words fallback used when no SentenceTransformer is available.
+
+    Built on scikit-learn's MurmurHash3 ``HashingVectorizer`` so a whole batch is
+    hashed into one sparse matrix in a single pass, and vectors are identical in
+    every process regardless of ``PYTHONHASHSEED``. Character n-grams are
+    optional; they make near-variants ("backpack"/"backpacks") land close together.
+    """
+
+    def __init__(self, dim: int = 256, char_ngrams: Optional[Tuple[int, int]] = None) -> None:
+        from sklearn.feature_extraction.text import HashingVectorizer
+
+        self.dim = dim
+        common = dict(n_features=dim, alternate_sign=False, norm="l2", dtype=np.float32)
+        self._words = HashingVectorizer(tokenizer=str.split, token_pattern=None, lowercase=True, **common)
+        self._chars = (
+            HashingVectorizer(analyzer="char_wb", ngram_range=char_ngrams, lowercase=True, **common)
+            if char_ngrams
+            else None
+        )
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        if not texts:
+            return np.zeros((0, self.dim), dtype=np.float32)
+        X = self._words.transform(texts)
+        if self._chars is not None:
+            X = X + self._chars.transform(texts)
+        out = X.toarray().astype(np.float32, copy=False)
+        norms = np.linalg.norm(out, axis=1, keepdims=True)
+        np.divide(out, norms, out=out, where=norms > 0)
+        return out
+
+
 class EmbeddingModel:
-    def __init__(self, model_name: Optional[str] = None) -> None:
+    def __init__(self, model_name: Optional[str] = None, store: Optional[EmbeddingStore] = None) -> None:
         settings = get_settings()
         self.model_name = model_name or settings.HF_EMBEDDING_MODEL
+        self.store = store
         self._model = None
+        self._fallback = HashingEmbedder(
+            dim=settings.EMBEDDING_FALLBACK_DIM,
+            char_ngrams=_parse_ngram_range(settings.EMBEDDING_FALLBACK_CHAR_NGRAMS),
+        )
         if SentenceTransformer is not None:
             try:
                 self._model = SentenceTransformer(self.model_name)
             except Exception:
                 self._model = None
 
-    def embed(self, texts: Iterable[str]) -> List[List[float]]:
+    def embed(self, texts: Iterable[str]) -> np.ndarray:
+        """Return a contiguous ``(n, dim)`` float32 matrix of L2-normalized vectors."""
         texts = [t if t is not None else "" for t in texts]
-        if self._model is not None:
-            vecs = self._model.encode(texts, normalize_embeddings=True, show_progress_bar=False)
-            return [v.tolist() for v in vecs]
-        # Fallback: simple bag-of-words hashing (very rough)
-        return [self._bow_hash(t) for t in texts]
+        if self._model is None:
+            # Fallback: deterministic hashed bag-of-words (cheap, no cache needed)
+            return self._fallback.embed(texts)
+        if self.store is None:
+            return self._encode(texts)
+
+        # Only encode terms the persistent store has not seen yet
+        keys = [normalize_term(t) for t in texts]
+        try:
+            cached = self.store.get_many(keys)
+        except Exception:
+            cached = [None] * len(keys)
+        # Keyed on normalized text, but the model sees the caller's text (first spelling
+        # per key), so vectors match what ``embed`` returns without a store
+        originals: Dict[str, str] = {}
+        for t, k, v in zip(texts, keys, cached):
+            if v is None:
+                originals.setdefault(k, t)
+        misses = list(originals)
+        fresh = self._encode(list(originals.values()))
+        if misses:
+            try:
+                self.store.put_many(misses, fresh)
+            except Exception:
+                pass
+        row = {k: i for i, k in enumerate(misses)}
+        out = np.empty((len(keys), self.dim), dtype=np.float32)
+        for i, (k, v) in enumerate(zip(keys, cached)):
+            out[i] = v if v is not None else fresh[row[k]]
+        return out
+
+    @property
+    def dim(self) -> int:
+        if self._model is None:
+            return self._fallback.dim
+        return int(self._model.get_sentence_embedding_dimension())
+
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        assert self._model is not None
+        if not texts:
+            return np.zeros((0, self.dim), dtype=np.float32)
+        vecs = self._model.encode(texts, normalize_embeddings=True, show_progress_bar=False, convert_to_numpy=True)
+        return np.ascontiguousarray(vecs, dtype=np.float32)
+
+
+# Process-wide registry: SentenceTransformer weights are loaded once per model name
+_models: Dict[str, EmbeddingModel] = {}
+_models_lock = threading.Lock()
+
+
+def _default_store(model_name: str) -> Optional[EmbeddingStore]:
+    s = get_settings()
+    if not s.EMBEDDING_CACHE_DIR:
+        return None
+    try:
+        return EmbeddingStore(
+            s.EMBEDDING_CACHE_DIR, model_name, max_entries=s.EMBEDDING_CACHE_MAX_ENTRIES, dtype=s.EMBEDDING_CACHE_DTYPE
+        )
+    except Exception:
+        return None
+
+
+def get_embedding_model(model_name: Optional[str] = None) -> EmbeddingModel:
+    name = model_name or get_settings().HF_EMBEDDING_MODEL
+    model = _models.get(name)
+    if model is not None:
+        return model
+    with _models_lock:
+        model = _models.get(name)
+        if model is None:
+            model = EmbeddingModel(name, store=_default_store(name))
+            _models[name] = model
+    return model
+
+
+def warm_embedding_model(model_name: Optional[str] = None) -> EmbeddingModel:
+    """Load the model and run a tiny encode so the first real request is not the slow one."""
+    model = get_embedding_model(model_name)
+    model.embed(["warmup"])
+    return model
+
+
+class EmbeddingService:
+    """Coalesces concurrent ``embed`` calls into batched encodes.
+
+    Callers awaiting ``embed`` are queued; a single drain task collects up to
+    ``max_batch_size`` texts (waiting at most ``max_wait_ms`` for more to
+    arrive), encodes them in one call off the event loop and fans the vectors
+    back out to each caller.
+    """
+
+    def __init__(self, model: EmbeddingModel, max_batch_size: int = 256, max_wait_ms: float = 5.0) -> None:
+        self.model = model
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000.0
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _ensure_worker(self) -> asyncio.Queue:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._worker is None or self._worker.done():
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._drain())
+        assert self._queue is not None
+        return self._queue
+
+    async def embed(self, texts: Iterable[str]) -> np.ndarray:
+        items = [t if t is not None else "" for t in texts]
+        if not items:
+            return np.zeros((0, self.model.dim), dtype=np.float32)
+        queue = self._ensure_worker()
+        fut: asyncio.Future = asyncio.get_running_loop().create_future()
+        await queue.put((items, fut))
+        return await fut
+
+    async def _drain(self) -> None:
+        assert self._queue is not None
+        queue = self._queue
+        loop = asyncio.get_running_loop()
+        while True:
+            pending: List[Tuple[List[str], asyncio.Future]] = [await queue.get()]
+            size = len(pending[0][0])
+            deadline = loop.time() + self.max_wait
+            while size < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                pending.append(item)
+                size += len(item[0])
+
+            batch = [t for items, _ in pending for t in items]
+            try:
+                vecs = await asyncio.to_thread(self.model.embed, batch)
+            except Exception as e:
+                for _, fut in pending:
+                    if not fut.done():
+                        fut.set_exception(e)
+                continue
+            offset = 0
+            for items, fut in pending:
+                if not fut.done():
+                    # Row slices of a C-contiguous matrix stay contiguous views
+                    fut.set_result(vecs[offset: offset + len(items)])
+                offset += len(items)
+
+    async def aclose(self) -> None:
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except (asyncio.CancelledError, Exception):
+                pass
+        self._worker = None
+        self._queue = None
+        self._loop = None
+
+
+_service: Optional[EmbeddingService] = None
 
-    @staticmethod
-    def _bow_hash(text: str, dim: int = 256) -> List[float]:
-        arr = np.zeros(dim, dtype=np.float32)
-        for tok in text.lower().split():
-            idx = hash(tok) % dim
-            arr[idx] += 1.0
-        norm = np.linalg.norm(arr)
-        if norm > 0:
-            arr /= norm
-        return arr.tolist()
 
+def get_embedding_service() -> EmbeddingService:
+    global _service
+    if _service is None:
+        s = get_settings()
+        _service = EmbeddingService(
+            get_embedding_model(),
+            max_batch_size=s.EMBEDDING_MAX_BATCH_SIZE,
+            max_wait_ms=s.EMBEDDING_MAX_WAIT_MS,
+        )
+    return _service
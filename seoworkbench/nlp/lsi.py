@@ -1,19 +1,165 @@
 from __future__ import annotations
 
-from typing import Iterable, List
+import os
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
 
-from sklearn.feature_extraction.text import TfidfVectorizer
+import numpy as np
+from scipy import sparse
+from sklearn.feature_extraction.text import CountVectorizer, TfidfVectorizer
+from sklearn.preprocessing import normalize
+
+from ..config import get_settings
+
+_NGRAMS = (1, 3)
+
+
+class LSIModel:
+    """Corpus-level TF-IDF over 1-3 grams, fitted on reference text (SERP snippets, competitor pages).
+
+    ``partial_fit`` only adds document frequencies, so the vocabulary and IDF
+    can grow as new reference documents arrive without refitting. When the
+    vocabulary passes ``max_terms`` the rarest terms are dropped. ``transform``
+    never refits: documents are counted against the fixed vocabulary and
+    weighted by the corpus IDF, many at once.
+    """
+
+    def __init__(self, max_terms: int = 200_000) -> None:
+        self.max_terms = max(1, max_terms)
+        self.n_docs = 0
+        self.vocab: Dict[str, int] = {}
+        self._df = np.zeros(0, dtype=np.int64)
+        self._analyzer = CountVectorizer(ngram_range=_NGRAMS, stop_words="english").build_analyzer()
+        self._counter: Optional[CountVectorizer] = None
+        self._terms: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return len(self.vocab)
+
+    def partial_fit(self, docs: Iterable[str]) -> "LSIModel":
+        counts: Counter = Counter()
+        for doc in docs:
+            if doc:
+                counts.update(set(self._analyzer(doc)))
+                self.n_docs += 1
+        new = [t for t in counts if t not in self.vocab]
+        for t in new:
+            self.vocab[t] = len(self.vocab)
+        if new:
+            self._df = np.concatenate([self._df, np.zeros(len(new), dtype=np.int64)])
+            # The cached index -> term array is stale; _prune below rebuilds it
+            self._terms = None
+        if counts:
+            idx = np.fromiter((self.vocab[t] for t in counts), dtype=np.int64, count=len(counts))
+            self._df[idx] += np.fromiter(counts.values(), dtype=np.int64, count=len(counts))
+        if len(self.vocab) > self.max_terms:
+            self._prune()
+        self._counter = None
+        self._terms = None
+        return self
+
+    def _prune(self) -> None:
+        terms = self.terms()
+        keep = np.sort(np.argsort(-self._df, kind="stable")[: self.max_terms])
+        self.vocab = {terms[i]: n for n, i in enumerate(keep.tolist())}
+        self._df = self._df[keep]
+
+    def terms(self) -> np.ndarray:
+        if self._terms is None:
+            terms = np.empty(len(self.vocab), dtype=object)
+            for t, i in self.vocab.items():
+                terms[i] = t
+            self._terms = terms
+        return self._terms
+
+    @property
+    def idf(self) -> np.ndarray:
+        # Same smoothing as sklearn's TfidfVectorizer
+        return np.log((1 + self.n_docs) / (1 + self._df)) + 1.0
+
+    def transform(self, docs: Iterable[str]) -> sparse.csr_matrix:
+        """Row-normalized ``(n_docs, n_terms)`` TF-IDF matrix; out-of-vocabulary n-grams are ignored."""
+        if self._counter is None:
+            self._counter = CountVectorizer(ngram_range=_NGRAMS, stop_words="english", vocabulary=self.vocab)
+        X = self._counter.transform([d or "" for d in docs]).astype(np.float64)
+        return normalize(X.multiply(self.idf).tocsr())
+
+    def top_terms(self, docs: Iterable[str], top_k: int = 20) -> List[List[str]]:
+        """Highest-weighted corpus terms per document."""
+        X = self.transform(docs)
+        terms = self.terms()
+        out: List[List[str]] = []
+        for i in range(X.shape[0]):
+            lo, hi = X.indptr[i], X.indptr[i + 1]
+            cols, vals = X.indices[lo:hi], X.data[lo:hi]
+            order = np.argsort(-vals, kind="stable")[:top_k]
+            out.append([terms[c] for c in cols[order].tolist()])
+        return out
+
+    def save(self, path: str | Path) -> None:
+        p = Path(path)
+        p.parent.mkdir(parents=True, exist_ok=True)
+        tmp = p.with_name(p.name + ".tmp")
+        with open(tmp, "wb") as f:
+            np.savez_compressed(
+                f,
+                terms=np.asarray(self.terms().tolist(), dtype=str),
+                df=self._df,
+                n_docs=np.int64(self.n_docs),
+                max_terms=np.int64(self.max_terms),
+            )
+        os.replace(tmp, p)
+
+    @classmethod
+    def load(cls, path: str | Path) -> "LSIModel":
+        with np.load(path, allow_pickle=False) as data:
+            model = cls(max_terms=int(data["max_terms"]))
+            model.vocab = {t: i for i, t in enumerate(data["terms"].tolist())}
+            model._df = data["df"].astype(np.int64)
+            model.n_docs = int(data["n_docs"])
+        return model
+
+
+_model: Optional[LSIModel] = None
+_model_path: Optional[str] = None
+_model_lock = threading.Lock()
+
+
+def get_lsi_model() -> Optional[LSIModel]:
+    """The fitted corpus model from ``LSI_MODEL_PATH``, loaded on first use (None if not fitted)."""
+    global _model, _model_path
+    path = get_settings().LSI_MODEL_PATH
+    if not path:
+        return None
+    if _model is not None and _model_path == path:
+        return _model
+    with _model_lock:
+        if _model is None or _model_path != path:
+            try:
+                _model = LSIModel.load(path)
+            except (OSError, ValueError, KeyError):
+                return None
+            _model_path = path
+    return _model
 
 
 def extract_lsi_terms(texts: Iterable[str], top_k: int = 20) -> List[str]:
     docs = [t for t in texts if t]
     if not docs:
         return []
-    vec = TfidfVectorizer(ngram_range=(1, 3), max_features=5000, stop_words="english")
+    model = get_lsi_model()
+    if model is not None and len(model):
+        # Corpus IDF, transform only
+        scores = np.asarray(model.transform(docs).sum(axis=0)).ravel()
+        idx = [i for i in scores.argsort()[::-1][:top_k].tolist() if scores[i] > 0]
+        terms = model.terms()
+        return [terms[i] for i in idx]
+    vec = TfidfVectorizer(ngram_range=_NGRAMS, max_features=5000, stop_words="english")
     X = vec.fit_transform(docs)
     # Rank features by sum tf-idf
     scores = X.sum(axis=0).A1
     feats = vec.get_feature_names_out()
     idx = scores.argsort()[::-1][:top_k]
     return [feats[i] for i in idx]
-
@@ -1,30 +1,131 @@
 from __future__ import annotations
 
-from typing import Iterable, List
+from collections import deque
+from functools import lru_cache
+from typing import Dict, Iterable, List, Sequence, Tuple
 
-from .lsi import extract_lsi_terms
+from .lsi import extract_lsi_terms, get_lsi_model
+from .text import TOKEN_RE, fold_plural
 
+Span = Tuple[int, int]
+
+
+class EntityMatcher:
+    """Aho-Corasick automaton over word tokens for a fixed set of entities.
+
+    Entities and text are tokenized the same way and plural-folded, so matches
+    always fall on word boundaries ("ai" does not hit "maintain") and
+    "backpack" also finds "backpacks". One pass over the text reports every
+    occurrence of every entity as ``(start, end)`` character offsets.
+    """
+
+    def __init__(self, entities: Iterable[str]) -> None:
+        self.entities: List[str] = []
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[Tuple[int, int]]] = [[]]  # (entity index, length in tokens)
+        for ent in dict.fromkeys(e.lower().strip() for e in entities if e and e.strip()):
+            tokens = [fold_plural(t) for t in TOKEN_RE.findall(ent)]
+            idx = len(self.entities)
+            self.entities.append(ent)
+            if tokens:
+                self._insert(tokens, idx)
+        self._link()
+
+    def _insert(self, tokens: List[str], idx: int) -> None:
+        node = 0
+        for tok in tokens:
+            nxt = self._goto[node].get(tok)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][tok] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            node = nxt
+        self._out[node].append((idx, len(tokens)))
+
+    def _link(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for tok, child in self._goto[node].items():
+                queue.append(child)
+                f = self._fail[node]
+                while f and tok not in self._goto[f]:
+                    f = self._fail[f]
+                target = self._goto[f].get(tok, 0)
+                self._fail[child] = target if target != child else 0
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def find(self, text: str) -> Dict[str, List[Span]]:
+        """Map each entity to the character spans where it occurs (empty list if absent)."""
+        found: Dict[str, List[Span]] = {ent: [] for ent in self.entities}
+        goto, fail, out = self._goto, self._fail, self._out
+        starts: List[int] = []
+        node = 0
+        for m in TOKEN_RE.finditer(text.lower()):
+            tok = fold_plural(m.group())
+            starts.append(m.start())
+            while node and tok not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(tok, 0)
+            for idx, length in out[node]:
+                found[self.entities[idx]].append((starts[-length], m.end()))
+        return found
+
+    def counts(self, text: str) -> Dict[str, int]:
+        return {ent: len(spans) for ent, spans in self.find(text).items()}
 
-def nlp_optimization_score(article_text: str, target_entities: Iterable[str]) -> tuple[float, List[str], List[str]]:
-    target = [t.lower() for t in target_entities if t]
-    if not target:
-        return 0.0, [], []
 
-    found = []
-    missing = []
-    lower = article_text.lower()
-    for ent in target:
-        if ent in lower:
-            found.append(ent)
-        else:
-            missing.append(ent)
+@lru_cache(maxsize=64)
+def _matcher(entities: Tuple[str, ...]) -> EntityMatcher:
+    return EntityMatcher(entities)
 
-    coverage = len(found) / len(target)
 
+def get_entity_matcher(entities: Iterable[str]) -> EntityMatcher:
+    """Compiled matcher for this entity set, reused across articles."""
+    return _matcher(tuple(entities))
+
+
+def entity_positions(article_text: str, target_entities: Iterable[str]) -> Dict[str, List[Span]]:
+    return get_entity_matcher(target_entities).find(article_text)
+
+
+def _combine(n_found: int, n_targets: int, n_lsi: int) -> float:
+    coverage = n_found / n_targets
     # Bonus: include top LSI terms; reward if article includes its own diverse terms
+    diversity = min(1.0, n_lsi / 30.0)
+    return 0.7 * coverage + 0.3 * diversity
+
+
+def nlp_optimization_score(article_text: str, target_entities: Iterable[str]) -> tuple[float, List[str], List[str]]:
+    matcher = get_entity_matcher(target_entities)
+    if not matcher.entities:
+        return 0.0, [], []
+
+    hits = matcher.find(article_text)
+    found = [ent for ent in matcher.entities if hits[ent]]
+    missing = [ent for ent in matcher.entities if not hits[ent]]
+
     lsi = extract_lsi_terms([article_text], top_k=30)
-    diversity = min(1.0, len(lsi) / 30.0)
+    return _combine(len(found), len(matcher.entities), len(lsi)), found, missing
 
-    score = 0.7 * coverage + 0.3 * diversity
-    return score, found, missing
 
+def nlp_optimization_scores(articles: Sequence[str], target_entities: Iterable[str]) -> List[tuple[float, List[str], List[str]]]:
+    """``nlp_optimization_score`` for many articles; one corpus-model transform covers the whole batch."""
+    target_entities = list(target_entities)
+    model = get_lsi_model()
+    if model is None or not len(model):
+        return [nlp_optimization_score(a, target_entities) for a in articles]
+    matcher = get_entity_matcher(target_entities)
+    if not matcher.entities:
+        return [(0.0, [], []) for _ in articles]
+    lsi = model.top_terms(articles, top_k=30)
+    out = []
+    for article, terms in zip(articles, lsi):
+        hits = matcher.find(article)
+        found = [ent for ent in matcher.entities if hits[ent]]
+        missing = [ent for ent in matcher.entities if not hits[ent]]
+        out.append((_combine(len(found), len(matcher.entities), len(terms)), found, missing))
+    return out
@@ -0,0 +1,16 @@
+from __future__ import annotations
+
+import re
+
+TOKEN_RE = re.compile(r"[^\W_]+", re.UNICODE)
+
+
+def fold_plural(tok: str) -> str:
+    # Light plural folding only; anything heavier starts merging distinct intents
+    if len(tok) > 4 and tok.endswith("ies"):
+        return tok[:-3] + "y"
+    if len(tok) > 4 and tok.endswith(("sses", "shes", "ches", "xes", "zes")):
+        return tok[:-2]
+    if len(tok) > 3 and tok.endswith("s") and not tok.endswith(("ss", "us", "is")):
+        return tok[:-1]
+    return tok
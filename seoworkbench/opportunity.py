@@ -1,19 +1,37 @@
 from __future__ import annotations
 
-from typing import Optional
+from typing import Dict, Iterable, Mapping, Optional, Sequence
 
+import numpy as np
+
+from .config import get_settings
 from .models import KeywordRecord
+from .table import KeywordTable
 
+DEFAULT_WEIGHTS: Dict[str, float] = {"volume": 0.4, "kd": 0.3, "trend": 0.2, "longtail": 0.1}
+VOLUME_CAP = 50000.0
 
-def _norm(value: Optional[float], max_value: float, default: float = 0.0) -> float:
-    if value is None:
-        value = default
-    value = max(0.0, min(value, max_value))
-    return value / max_value
 
+def opportunity_weights(overrides: Optional[Mapping[str, float]] = None) -> Dict[str, float]:
+    """Default weights, then ``OPPORTUNITY_WEIGHTS``, then ``overrides``."""
+    weights = dict(DEFAULT_WEIGHTS)
+    weights.update(get_settings().OPPORTUNITY_WEIGHTS)
+    if overrides:
+        weights.update(overrides)
+    unknown = set(weights) - set(DEFAULT_WEIGHTS)
+    if unknown:
+        raise ValueError(f"Unknown opportunity weights: {sorted(unknown)}")
+    return weights
 
-def score_record(rec: KeywordRecord) -> float:
-    """Heuristic opportunity score 0..1.
+
+def score_arrays(
+    volume: np.ndarray,
+    kd: np.ndarray,
+    trend: np.ndarray,
+    tokens: np.ndarray,
+    weights: Optional[Mapping[str, float]] = None,
+) -> np.ndarray:
+    """Vectorized opportunity scores 0..1; NaN marks a missing volume/KD/trend value.
 
     Combines:
     - volume (proxy-capped at 50k if provided)
@@ -21,20 +39,56 @@ def score_record(rec: KeywordRecord) -> float:
     - trend score (0..1)
     - long-tail bonus (more tokens => slight boost)
     """
-    # Normalized signals
-    vol = _norm(float(rec.metrics.volume) if rec.metrics.volume is not None else None, max_value=50000.0, default=0.0)
-    kd = _norm(float(rec.metrics.kd) if rec.metrics.kd is not None else None, max_value=100.0, default=50.0)
-    trend = rec.metrics.trend_score if rec.metrics.trend_score is not None else 0.5
-    if trend < 0:
-        trend = 0.0
-    if trend > 1:
-        trend = 1.0
-
-    # Long-tail bonus: terms with >2 tokens get a boost up to +0.2
-    tokens = len(rec.candidate.term.split())
-    longtail_bonus = min(0.2, max(0.0, (tokens - 2) * 0.05))
-
-    # Weighted sum
-    score = 0.4 * vol + 0.3 * (1.0 - kd) + 0.2 * trend + 0.1 * (longtail_bonus / 0.2)
-    return max(0.0, min(score, 1.0))
+    w = opportunity_weights(weights)
+    vol = np.clip(np.nan_to_num(np.asarray(volume, dtype=np.float64), nan=0.0), 0.0, VOLUME_CAP) / VOLUME_CAP
+    kd_n = np.clip(np.nan_to_num(np.asarray(kd, dtype=np.float64), nan=50.0), 0.0, 100.0) / 100.0
+    tr = np.clip(np.nan_to_num(np.asarray(trend, dtype=np.float64), nan=0.5), 0.0, 1.0)
+    # Long-tail bonus: terms with >2 tokens get a boost up to +0.2 (scaled to 0..1)
+    longtail = np.clip((np.asarray(tokens, dtype=np.float64) - 2) * 0.05, 0.0, 0.2) / 0.2
+    score = w["volume"] * vol + w["kd"] * (1.0 - kd_n) + w["trend"] * tr + w["longtail"] * longtail
+    return np.clip(score, 0.0, 1.0)
+
+
+def token_counts(terms: Iterable[str]) -> np.ndarray:
+    return np.fromiter((len(t.split()) for t in terms), dtype=np.int32)
+
+
+def _column(values: Iterable[Optional[float]]) -> np.ndarray:
+    return np.fromiter((np.nan if v is None else v for v in values), dtype=np.float64)
+
+
+def score_records(records: Sequence[KeywordRecord], weights: Optional[Mapping[str, float]] = None) -> np.ndarray:
+    """Opportunity for many records at once; same values as ``score_record``."""
+    metrics = [r.metrics for r in records]
+    return score_arrays(
+        _column(m.volume for m in metrics),
+        _column(m.kd for m in metrics),
+        _column(m.trend_score for m in metrics),
+        token_counts(r.candidate.term for r in records),
+        weights,
+    )
+
+
+def score_table(table: KeywordTable, weights: Optional[Mapping[str, float]] = None) -> np.ndarray:
+    """Score every row from the table's metric columns and store it in ``table.opportunity``."""
+    m = table.metrics
+    table.opportunity = score_arrays(m["volume"], m["kd"], m["trend_score"], token_counts(table.terms), weights)
+    return table.opportunity
+
+
+def score_record(rec: KeywordRecord) -> float:
+    """Heuristic opportunity score 0..1 for one record (see ``score_arrays``)."""
+    return float(score_records([rec])[0])
+
 
+def top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the ``k`` highest scores, best first, via a partial sort."""
+    scores = np.asarray(scores)
+    k = max(0, min(k, len(scores)))
+    if k == 0:
+        return np.zeros(0, dtype=np.int64)
+    if k < len(scores):
+        part = np.argpartition(-scores, k - 1)[:k]
+    else:
+        part = np.arange(len(scores))
+    return part[np.argsort(-scores[part], kind="stable")]
@@ -1,14 +1,20 @@
 from __future__ import annotations
 
-import httpx
+from typing import AsyncIterator
+
 from tenacity import retry, stop_after_attempt, wait_exponential
 
+from ..httpclient import get_http_client
+from ..ratelimit import estimate_tokens, get_limiter
+from .streaming import iter_sse_json, raise_for_stream_status
+
 
 class GeminiProvider:
     def __init__(self, api_key: str, model: str) -> None:
         self.api_key = api_key
         self.model = model
         self.base_url = f"https://generativelanguage.googleapis.com/v1beta/models/{model}:generateContent"
+        self.stream_url = f"https://generativelanguage.googleapis.com/v1beta/models/{model}:streamGenerateContent"
 
     @retry(wait=wait_exponential(min=1, max=10), stop=stop_after_attempt(3))
     async def complete(self, prompt: str, *, max_tokens: int = 2048) -> str:
@@ -18,12 +24,30 @@ class GeminiProvider:
             "contents": [{"parts": [{"text": prompt}]}],
             "generationConfig": {"maxOutputTokens": max_tokens, "temperature": 0.7},
         }
-        async with httpx.AsyncClient(timeout=120) as client:
-            r = await client.post(self.base_url, params=params, json=payload)
-            r.raise_for_status()
-            data = r.json()
-            try:
-                return data["candidates"][0]["content"]["parts"][0]["text"]
-            except Exception:
-                return ""
+        async with get_limiter("gemini").limit(estimate_tokens(prompt, max_tokens)) as limiter:
+            r = await get_http_client().post(self.base_url, params=params, json=payload, timeout=120)
+            limiter.observe(r)
+        r.raise_for_status()
+        data = r.json()
+        try:
+            return data["candidates"][0]["content"]["parts"][0]["text"]
+        except Exception:
+            return ""
 
+    async def stream(self, prompt: str, *, max_tokens: int = 2048) -> AsyncIterator[str]:
+        params = {"key": self.api_key, "alt": "sse"}
+        payload = {
+            "contents": [{"parts": [{"text": prompt}]}],
+            "generationConfig": {"maxOutputTokens": max_tokens, "temperature": 0.7},
+        }
+        async with get_limiter("gemini").limit(estimate_tokens(prompt, max_tokens)) as limiter:
+            async with get_http_client().stream("POST", self.stream_url, params=params, json=payload, timeout=120) as r:
+                limiter.observe(r)
+                await raise_for_stream_status(r)
+                async for event in iter_sse_json(r):
+                    try:
+                        text = event["candidates"][0]["content"]["parts"][0]["text"]
+                    except Exception:
+                        continue
+                    if text:
+                        yield text
@@ -1,8 +1,13 @@
 from __future__ import annotations
 
-import httpx
+from typing import AsyncIterator
+
 from tenacity import retry, stop_after_attempt, wait_exponential
 
+from ..httpclient import get_http_client
+from ..ratelimit import estimate_tokens, get_limiter
+from .streaming import iter_openai_deltas, raise_for_stream_status
+
 
 class PerplexityProvider:
     def __init__(self, api_key: str, model: str) -> None:
@@ -22,10 +27,29 @@ class PerplexityProvider:
             "max_tokens": max_tokens,
             "temperature": 0.7,
         }
-        async with httpx.AsyncClient(timeout=120) as client:
-            r = await client.post(self.base_url, headers=headers, json=payload)
-            r.raise_for_status()
-            data = r.json()
-            # OpenAI-compatible shape
-            return data.get("choices", [{}])[0].get("message", {}).get("content", "")
+        async with get_limiter("perplexity").limit(estimate_tokens(prompt, max_tokens)) as limiter:
+            r = await get_http_client().post(self.base_url, headers=headers, json=payload, timeout=120)
+            limiter.observe(r)
+        r.raise_for_status()
+        data = r.json()
+        # OpenAI-compatible shape
+        return data.get("choices", [{}])[0].get("message", {}).get("content", "")
 
+    async def stream(self, prompt: str, *, max_tokens: int = 2048) -> AsyncIterator[str]:
+        headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json",
+        }
+        payload = {
+            "model": self.model,
+            "messages": [{"role": "user", "content": prompt}],
+            "max_tokens": max_tokens,
+            "temperature": 0.7,
+            "stream": True,
+        }
+        async with get_limiter("perplexity").limit(estimate_tokens(prompt, max_tokens)) as limiter:
+            async with get_http_client().stream("POST", self.base_url, headers=headers, json=payload, timeout=120) as r:
+                limiter.observe(r)
+                await raise_for_stream_status(r)
+                async for text in iter_openai_deltas(r):
+                    yield text
@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+import json
+from typing import Any, AsyncIterator, Dict
+
+import httpx
+
+
+async def iter_sse_json(response: httpx.Response) -> AsyncIterator[Dict[str, Any]]:
+    """Decode ``data:`` lines of a server-sent event stream as JSON objects."""
+    async for line in response.aiter_lines():
+        line = line.strip()
+        if not line.startswith("data:"):
+            continue
+        data = line[5:].strip()
+        if not data or data == "[DONE]":
+            continue
+        try:
+            yield json.loads(data)
+        except ValueError:
+            continue
+
+
+async def iter_openai_deltas(response: httpx.Response) -> AsyncIterator[str]:
+    """Text deltas from an OpenAI-compatible ``stream: true`` chat completion."""
+    async for event in iter_sse_json(response):
+        choices = event.get("choices") or [{}]
+        text = (choices[0].get("delta") or {}).get("content")
+        if text:
+            yield text
+
+
+async def raise_for_stream_status(response: httpx.Response) -> None:
+    if response.is_error:
+        await response.aread()
+        response.raise_for_status()
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+import weakref
+from contextlib import asynccontextmanager
+from email.utils import parsedate_to_datetime
+from typing import AsyncIterator, Dict, Optional
+
+import httpx
+
+from .config import get_settings
+
+
+class TokenBucket:
+    """Reservation-style token bucket: callers take tokens up front and sleep off any debt."""
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def reserve(self, amount: float) -> float:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        self.tokens -= min(amount, self.capacity)
+        return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+
+def retry_after_seconds(response: httpx.Response, default: float = 1.0) -> float:
+    value = response.headers.get("retry-after")
+    if not value:
+        return default
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except Exception:
+        return default
+
+
+class RateLimiter:
+    """Per-provider governor: concurrency cap, requests/sec and tokens/min buckets.
+
+    On 429/503 the request rate is halved and all callers pause until the
+    server's Retry-After has passed; each success then recovers 10% of the
+    configured rate (AIMD), so sustained throughput settles just under quota.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_concurrency: int,
+        rps: Optional[float] = None,
+        tpm: Optional[float] = None,
+    ) -> None:
+        self.name = name
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.base_rps = rps
+        self._rps = TokenBucket(rps, max(1.0, rps)) if rps else None
+        self._tpm = TokenBucket(tpm / 60.0, tpm) if tpm else None
+        self._blocked_until = 0.0
+        self._sems: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        sem = self._sems.get(loop)
+        if sem is None:
+            sem = self._sems[loop] = asyncio.Semaphore(self.max_concurrency)
+        return sem
+
+    @asynccontextmanager
+    async def limit(self, tokens: int = 0) -> AsyncIterator["RateLimiter"]:
+        async with self._semaphore():
+            delay = max(0.0, self._blocked_until - time.monotonic())
+            if self._rps is not None:
+                delay = max(delay, self._rps.reserve(1))
+            if self._tpm is not None and tokens:
+                delay = max(delay, self._tpm.reserve(tokens))
+            if delay > 0:
+                await asyncio.sleep(delay)
+            yield self
+
+    def observe(self, response: httpx.Response) -> None:
+        if response.status_code in (429, 503):
+            self.backoff(retry_after_seconds(response))
+        elif response.is_success and self._rps is not None and self.base_rps:
+            self._rps.rate = min(self.base_rps, self._rps.rate + 0.1 * self.base_rps)
+
+    def backoff(self, seconds: float) -> None:
+        self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+        if self._rps is not None and self.base_rps:
+            self._rps.rate = max(self.base_rps * 0.05, self._rps.rate / 2)
+
+
+def estimate_tokens(prompt: str, max_tokens: int = 0) -> int:
+    # ~4 characters per token is close enough for quota accounting
+    return len(prompt) // 4 + max_tokens
+
+
+_limiters: Dict[str, RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_limiter(name: str, default_concurrency: Optional[int] = None) -> RateLimiter:
+    """Shared limiter for a provider/source, configured from ``RATE_LIMITS[name]``."""
+    limiter = _limiters.get(name)
+    if limiter is not None:
+        return limiter
+    # Threads (``--pool threads``) racing here must not each get a limiter with the full budget
+    with _limiters_lock:
+        limiter = _limiters.get(name)
+        if limiter is None:
+            s = get_settings()
+            conf = s.RATE_LIMITS.get(name, {})
+            limiter = _limiters[name] = RateLimiter(
+                name,
+                max_concurrency=int(conf.get("concurrency") or default_concurrency or s.MAX_WORKERS),
+                rps=conf.get("rps"),
+                tpm=conf.get("tpm"),
+            )
+    return limiter
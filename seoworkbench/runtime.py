@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import os
+import threading
+from typing import Any, Awaitable, Optional, TypeVar
+
+from .httpclient import close_http_client, get_http_client, reset_http_clients
+from .jobstatus import close_job_status_store
+from .nlp.embeddings import get_embedding_service, warm_embedding_model
+from .storage.db import init_engine, reset_engine
+
+T = TypeVar("T")
+
+
+class WorkerRuntime:
+    """One long-lived event loop per worker process, on a background thread.
+
+    Synchronous code (Celery tasks) submits coroutines with ``run``; they all
+    share the loop, so the pooled HTTP client, rate limiters and embedding
+    micro-batcher are reused across tasks. ``run`` is thread-safe, so with
+    ``--pool threads`` several I/O-bound tasks progress concurrently on the one
+    loop instead of each holding a prefork process. The runtime notices a
+    fork (pid change) and starts a fresh loop in the child.
+    """
+
+    def __init__(self) -> None:
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.pid: Optional[int] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self.loop is not None and self.pid == os.getpid() and self._thread is not None and self._thread.is_alive()
+
+    def start(self, warm: bool = False) -> None:
+        with self._lock:
+            if self.running:
+                return
+            if self.pid is not None and self.pid != os.getpid():
+                # Inherited across fork: the loop thread did not survive, and its
+                # sockets/connections belong to the parent
+                reset_http_clients()
+                reset_engine()
+            loop = asyncio.new_event_loop()
+            ready = threading.Event()
+
+            def serve() -> None:
+                asyncio.set_event_loop(loop)
+                loop.call_soon(ready.set)
+                loop.run_forever()
+
+            thread = threading.Thread(target=serve, name="seoworkbench-loop", daemon=True)
+            thread.start()
+            ready.wait()
+            self.loop, self.pid, self._thread = loop, os.getpid(), thread
+        if warm:
+            self.warm()
+
+    def warm(self) -> None:
+        """Load the embedding model, open the DB pool and the loop's HTTP client up front."""
+        try:
+            init_engine()
+        except Exception:
+            pass
+        try:
+            warm_embedding_model()
+        except Exception:
+            pass
+
+        async def open_client() -> None:
+            get_http_client()
+
+        self.run(open_client())
+
+    def run(self, coro: Awaitable[T], timeout: Optional[float] = None) -> T:
+        """Run ``coro`` on the runtime loop and block until it finishes."""
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            pass
+        else:
+            if hasattr(coro, "close"):
+                coro.close()  # type: ignore[union-attr]
+            raise RuntimeError("WorkerRuntime.run() called from a running event loop; await the coroutine instead")
+        if not self.running:
+            self.start()
+        assert self.loop is not None
+        fut = asyncio.run_coroutine_threadsafe(coro, self.loop)  # type: ignore[arg-type]
+        try:
+            return fut.result(timeout)
+        except concurrent.futures.TimeoutError:
+            fut.cancel()
+            raise
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Close pooled clients, cancel leftover tasks and stop the loop thread."""
+        if not self.running:
+            return
+        loop, thread = self.loop, self._thread
+        assert loop is not None and thread is not None
+
+        async def close() -> None:
+            await get_embedding_service().aclose()
+            await close_http_client()
+            await close_job_status_store()
+            current = asyncio.current_task()
+            leftovers = [t for t in asyncio.all_tasks() if t is not current]
+            for t in leftovers:
+                t.cancel()
+            await asyncio.gather(*leftovers, return_exceptions=True)
+
+        try:
+            self.run(close(), timeout)
+        except Exception:
+            pass
+        with self._lock:
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join(timeout)
+            if not thread.is_alive():
+                loop.close()
+            self.loop, self._thread = None, None
+
+
+_runtime = WorkerRuntime()
+
+
+def get_runtime() -> WorkerRuntime:
+    return _runtime
+
+
+def run_async(coro: Awaitable[T], timeout: Optional[float] = None) -> T:
+    """Blocking entry point for sync code; starts the process runtime on first use."""
+    return _runtime.run(coro, timeout)
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import gzip
+from typing import Any, BinaryIO, Dict, Iterable, Optional
+
+import numpy as np
+import orjson
+from pydantic import BaseModel
+
+try:
+    import brotli  # type: ignore
+except Exception:  # pragma: no cover
+    brotli = None  # type: ignore
+
+CENTROID_MODES = ("full", "float16", "omit")
+
+
+def _default(obj: Any) -> Any:
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json")
+    if isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def dumps(obj: Any, pretty: bool = False) -> bytes:
+    """orjson encoding; NumPy arrays (e.g. float32 centroids) are written directly, without ``tolist()``."""
+    option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+    if pretty:
+        option |= orjson.OPT_INDENT_2
+    return orjson.dumps(obj, default=_default, option=option)
+
+
+def shape_centroid(vec: Optional[np.ndarray], mode: str) -> Optional[np.ndarray]:
+    """``full`` keeps float32, ``float16`` rounds to half precision (4 decimals), ``omit`` drops it."""
+    if mode not in CENTROID_MODES:
+        raise ValueError(f"Unknown centroid mode: {mode}")
+    if vec is None or mode == "omit":
+        return None
+    vec = np.asarray(vec, dtype=np.float32)
+    if mode == "float16":
+        # Half precision carries ~3-4 significant digits; rounding keeps the JSON text short too
+        return np.round(vec.astype(np.float16).astype(np.float32), 4)
+    return vec
+
+
+def shape_clusters(clusters: Iterable[Dict[str, Any]], mode: str) -> Iterable[Dict[str, Any]]:
+    for cluster in clusters:
+        cluster["centroid"] = shape_centroid(cluster.get("centroid"), mode)
+        yield cluster
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """Pick ``br`` (when brotli is installed) or ``gzip`` from an Accept-Encoding header."""
+    offered: Dict[str, float] = {}
+    for part in (accept_encoding or "").lower().split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        if params.strip().startswith("q="):
+            try:
+                q = float(params.strip()[2:])
+            except ValueError:
+                q = 0.0
+        if name:
+            offered[name] = q
+    for name in (("br", "gzip") if brotli is not None else ("gzip",)):
+        if offered.get(name, offered.get("*", 0.0)) > 0:
+            return name
+    return None
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=5)
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=5)
+    raise ValueError(f"Unsupported encoding: {encoding}")
+
+
+def write_clusters(stream: BinaryIO, clusters: Iterable[Dict[str, Any]], pretty: bool = True) -> None:
+    """Write ``{"clusters": [...]}`` one cluster at a time so the full document never sits in memory."""
+    stream.write(b'{"clusters": [')
+    for i, cluster in enumerate(clusters):
+        stream.write(b",\n" if i else b"\n")
+        stream.write(dumps(cluster, pretty=pretty))
+    stream.write(b"\n]}\n")
+    stream.flush()
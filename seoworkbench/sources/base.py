@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import List
+from typing import List, Optional
 
 from ..models import KeywordCandidate, SERPResult
 
@@ -9,6 +9,10 @@ from ..models import KeywordCandidate, SERPResult
 class SearchSource(ABC):
     name: str = "base"
 
+    def cache_scope(self, endpoint: str) -> Optional[str]:
+        """Identifies the backend serving ``endpoint`` (part of cache keys); ``None`` = synthetic, do not cache."""
+        return self.name
+
     @abstractmethod
     async def fetch_autocomplete(self, seed: str) -> List[KeywordCandidate]:
         raise NotImplementedError
@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import weakref
+from typing import Awaitable, Callable, Dict, List, Optional, Type, TypeVar
+
+from pydantic import BaseModel
+
+from ..cache import CacheBackend, CacheStats, build_cache_backend, cache_bypassed, content_key
+from ..config import get_settings
+from ..models import KeywordCandidate, SERPResult
+from .base import SearchSource
+
+T = TypeVar("T", bound=BaseModel)
+
+
+class SingleFlight:
+    """Concurrent calls with the same key share one in-flight coroutine."""
+
+    def __init__(self) -> None:
+        self._calls: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Future]]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[object]]) -> object:
+        loop = asyncio.get_running_loop()
+        calls = self._calls.setdefault(loop, {})
+        fut = calls.get(key)
+        if fut is not None:
+            return await asyncio.shield(fut)
+        fut = calls[key] = loop.create_future()
+        try:
+            result = await fn()
+        except BaseException as e:
+            if isinstance(e, asyncio.CancelledError):
+                fut.cancel()
+            else:
+                fut.set_exception(e)
+                fut.exception()  # mark retrieved when nobody else was waiting
+            raise
+        else:
+            fut.set_result(result)
+            return result
+        finally:
+            calls.pop(key, None)
+
+
+def normalize_query(query: str) -> str:
+    return " ".join(query.lower().split())
+
+
+class CachingSource(SearchSource):
+    """Wraps a source with a TTL cache and singleflight for its network-backed lookups.
+
+    ``fetch_serp`` and ``fetch_autocomplete`` are cached on (source, backend,
+    endpoint, normalized query, top_n), where the backend comes from the
+    source's ``cache_scope``, so switching e.g. SearxNG on or to another host
+    never serves the old results. Synthetic fallbacks (scope ``None``) and
+    empty results are not stored, since sources return ``[]`` on upstream errors.
+    """
+
+    def __init__(self, inner: SearchSource, backend: CacheBackend, ttl: float, stats: CacheStats) -> None:
+        self.inner = inner
+        self.name = inner.name
+        self.backend = backend
+        self.ttl = ttl
+        self.stats = stats
+        self._flight = SingleFlight()
+
+    async def _cached(self, endpoint: str, query: str, top_n: Optional[int], model: Type[T], fetch: Callable[[], Awaitable[List[T]]]) -> List[T]:
+        scope = self.inner.cache_scope(endpoint)
+        if scope is None:
+            return await fetch()
+        key = content_key(self.inner.name, scope, endpoint, normalize_query(query), top_n)
+        if cache_bypassed():
+            self.stats.bypassed += 1
+        else:
+            try:
+                raw = await self.backend.get(key)
+            except Exception:
+                raw = None
+            if raw is not None:
+                self.stats.hits += 1
+                return [model.model_validate(item) for item in json.loads(raw)]
+            self.stats.misses += 1
+
+        async def load() -> List[T]:
+            items = await fetch()
+            if items:
+                try:
+                    await self.backend.set(key, json.dumps([i.model_dump() for i in items]), self.ttl)
+                except Exception:
+                    pass
+            return items
+
+        items = await self._flight.do(key, load)
+        # Callers may mutate what they get back, so never hand out shared instances
+        return [i.model_copy(deep=True) for i in items]  # type: ignore[union-attr]
+
+    async def fetch_autocomplete(self, seed: str) -> List[KeywordCandidate]:
+        return await self._cached("autocomplete", seed, None, KeywordCandidate, lambda: self.inner.fetch_autocomplete(seed))
+
+    async def fetch_people_also_ask(self, seed: str) -> List[KeywordCandidate]:
+        return await self.inner.fetch_people_also_ask(seed)
+
+    async def fetch_related(self, seed: str) -> List[KeywordCandidate]:
+        return await self.inner.fetch_related(seed)
+
+    async def fetch_serp(self, query: str, top_n: int = 10) -> List[SERPResult]:
+        return await self._cached("serp", query, top_n, SERPResult, lambda: self.inner.fetch_serp(query, top_n=top_n))
+
+
+_serp_cache: Optional[CacheBackend] = None
+serp_cache_stats = CacheStats()
+
+
+def get_serp_cache() -> Optional[CacheBackend]:
+    global _serp_cache
+    if _serp_cache is None:
+        s = get_settings()
+        _serp_cache = build_cache_backend(
+            s.SERP_CACHE_BACKEND,
+            namespace="serp",
+            max_entries=s.SERP_CACHE_MAX_ENTRIES,
+            sqlite_path=s.CACHE_SQLITE_PATH,
+            redis_url=s.REDIS_URL,
+        )
+    return _serp_cache
+
+
+_sources: Dict[str, SearchSource] = {}
+
+
+def cached_source(name: str, factory: Callable[[], SearchSource]) -> SearchSource:
+    """Process-wide source instance, cache-wrapped when SERP_CACHE_BACKEND is enabled."""
+    source = _sources.get(name)
+    if source is None:
+        source = factory()
+        backend = get_serp_cache()
+        if backend is not None:
+            source = CachingSource(source, backend, get_settings().SERP_CACHE_TTL, serp_cache_stats)
+        _sources[name] = source
+    return source
@@ -1,13 +1,16 @@
 from __future__ import annotations
 
 import asyncio
-from typing import List
+from typing import List, Optional
 
 import httpx
 
 from ..config import get_settings
+from ..httpclient import get_http_client
+from ..ratelimit import get_limiter
 from ..models import KeywordCandidate, SERPResult
 from .base import SearchSource
+from .cache import cached_source
 
 
 class GoogleLikeSource(SearchSource):
@@ -16,18 +19,28 @@ class GoogleLikeSource(SearchSource):
     def __init__(self) -> None:
         self.settings = get_settings()
 
+    def cache_scope(self, endpoint: str) -> Optional[str]:
+        # Only real upstream results are cacheable; the fallbacks below are generated locally
+        s = self.settings
+        if endpoint == "autocomplete" and s.SEARXNG_BASE_URL:
+            return f"searxng:{s.SEARXNG_BASE_URL.rstrip('/')}"
+        if endpoint == "serp" and s.GOOGLE_CSE_API_KEY and s.GOOGLE_CSE_CX:
+            return f"google_cse:{s.GOOGLE_CSE_CX}"
+        return None
+
     async def fetch_autocomplete(self, seed: str) -> List[KeywordCandidate]:
         # Prefer SearxNG if provided, as it can proxy multiple engines via an API-friendly interface
         if self.settings.SEARXNG_BASE_URL:
             url = f"{self.settings.SEARXNG_BASE_URL.rstrip('/')}/autocomplete?q={httpx.QueryParams({'q': seed}).get('q')}"
-            async with httpx.AsyncClient(timeout=20) as client:
-                try:
-                    r = await client.get(url)
-                    r.raise_for_status()
-                    data = r.json()
-                    return [KeywordCandidate(term=s, source=self.name) for s in data[:20] if isinstance(s, str)]
-                except Exception:
-                    return []
+            try:
+                async with get_limiter("searxng").limit() as limiter:
+                    r = await get_http_client().get(url, timeout=20)
+                    limiter.observe(r)
+                r.raise_for_status()
+                data = r.json()
+                return [KeywordCandidate(term=s, source=self.name) for s in data[:20] if isinstance(s, str)]
+            except Exception:
+                return []
         # As a generic fallback, return seeded variations (programmatic modifiers)
         base = seed.strip()
         mods = [
@@ -70,30 +83,35 @@ class GoogleLikeSource(SearchSource):
                 "q": query,
                 "num": min(top_n, 10),
             }
-            async with httpx.AsyncClient(timeout=30) as client:
-                try:
-                    r = await client.get("https://www.googleapis.com/customsearch/v1", params=params)
-                    r.raise_for_status()
-                    data = r.json()
-                    for idx, item in enumerate(data.get("items", []), start=1):
-                        results.append(
-                            SERPResult(
-                                title=item.get("title", ""),
-                                url=item.get("link", ""),
-                                snippet=item.get("snippet"),
-                                rank=idx,
-                                source=self.name,
-                            )
+            try:
+                async with get_limiter("google_cse").limit() as limiter:
+                    r = await get_http_client().get("https://www.googleapis.com/customsearch/v1", params=params, timeout=30)
+                    limiter.observe(r)
+                r.raise_for_status()
+                data = r.json()
+                for idx, item in enumerate(data.get("items", []), start=1):
+                    results.append(
+                        SERPResult(
+                            title=item.get("title", ""),
+                            url=item.get("link", ""),
+                            snippet=item.get("snippet"),
+                            rank=idx,
+                            source=self.name,
                         )
-                    return results
-                except Exception:
-                    return results
+                    )
+                return results
+            except Exception:
+                return results
 
         # Otherwise, return empty list (or synthetic stubs) to avoid scraping.
         return results
 
 
-async def gather_all(source: GoogleLikeSource, seed: str) -> List[KeywordCandidate]:
+def get_google_source() -> SearchSource:
+    return cached_source(GoogleLikeSource.name, GoogleLikeSource)
+
+
+async def gather_all(source: SearchSource, seed: str) -> List[KeywordCandidate]:
     ac_task = source.fetch_autocomplete(seed)
     paa_task = source.fetch_people_also_ask(seed)
     rel_task = source.fetch_related(seed)
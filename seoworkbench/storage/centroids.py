@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Iterator, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import func, select, text
+from sqlalchemy.orm import Session
+
+from ..config import get_settings
+from ..nlp.clustering import IncrementalClusterer
+from .db import db_session
+from .models import ClusterCentroid
+
+_locks: Dict[str, threading.Lock] = {}
+_locks_guard = threading.Lock()
+
+
+@contextmanager
+def project_session(project: str) -> Iterator[Session]:
+    """DB session holding the project's centroid lock until commit.
+
+    A process-local lock serializes threads here; on Postgres a transaction
+    advisory lock also serializes other API/worker processes.
+    """
+    with _locks_guard:
+        lock = _locks.setdefault(project, threading.Lock())
+    with lock, db_session() as db:
+        if db.get_bind().dialect.name == "postgresql":
+            db.execute(text("SELECT pg_advisory_xact_lock(hashtext(:key))"), {"key": f"cluster_centroids:{project}"})
+        yield db
+
+
+def _load(db: Session, project: str, dim: Optional[int]) -> IncrementalClusterer:
+    stmt = select(ClusterCentroid).where(ClusterCentroid.project == project)
+    if dim is not None:
+        stmt = stmt.where(ClusterCentroid.dim == dim)
+    rows = db.execute(stmt.order_by(ClusterCentroid.cluster_index)).scalars().all()
+    # New indices start past every row of the project, whatever its dimension
+    top = db.execute(select(func.max(ClusterCentroid.cluster_index)).where(ClusterCentroid.project == project)).scalar()
+    indices = [r.cluster_index for r in rows]
+    sizes = [r.size for r in rows]
+    means = np.vstack([np.frombuffer(r.centroid, dtype=np.float32) for r in rows]) if rows else None
+    return IncrementalClusterer(
+        indices,
+        means,
+        sizes,
+        threshold=get_settings().CLUSTERING_ASSIGN_THRESHOLD,
+        first_free=0 if top is None else int(top) + 1,
+    )
+
+
+def _save(db: Session, project: str, clusterer: IncrementalClusterer) -> None:
+    now = datetime.utcnow()
+    for row, idx in enumerate(clusterer.indices.tolist()):
+        if idx not in clusterer.dirty:
+            continue
+        db.merge(
+            ClusterCentroid(
+                project=project,
+                cluster_index=idx,
+                size=int(clusterer.sizes[row]),
+                dim=int(clusterer.means.shape[1]),
+                centroid=clusterer.means[row].astype(np.float32).tobytes(),
+                updated_at=now,
+            )
+        )
+    clusterer.dirty.clear()
+
+
+def load_clusterer(project: str, dim: Optional[int] = None) -> IncrementalClusterer:
+    """Load a project's persisted centroids; rows from another embedding dimension are ignored."""
+    with db_session() as db:
+        return _load(db, project, dim)
+
+
+def save_clusterer(project: str, clusterer: IncrementalClusterer) -> None:
+    """Upsert only the clusters touched since load."""
+    if not clusterer.dirty:
+        return
+    with db_session() as db:
+        _save(db, project, clusterer)
+
+
+def assign_project_clusters(project: str, X: np.ndarray, min_cluster_size: int = 5) -> Tuple[np.ndarray, IncrementalClusterer]:
+    """Load, assign and save in one locked transaction.
+
+    Concurrent requests for one project would otherwise load the same
+    centroids, hand out the same new indices and overwrite each other's means.
+    """
+    with project_session(project) as db:
+        clusterer = _load(db, project, X.shape[1])
+        labels = clusterer.assign(X, min_cluster_size=min_cluster_size)
+        _save(db, project, clusterer)
+    return labels, clusterer
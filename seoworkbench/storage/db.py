@@ -23,6 +23,15 @@ def init_engine() -> None:
     _SessionLocal = sessionmaker(bind=_engine, autocommit=False, autoflush=False, future=True)
 
 
+def reset_engine() -> None:
+    """Drop pooled connections inherited across fork without closing the parent's sockets."""
+    global _engine, _SessionLocal
+    if _engine is not None:
+        _engine.dispose(close=False)
+    _engine = None
+    _SessionLocal = None
+
+
 def create_all() -> None:
     if _engine is None:
         init_engine()
@@ -3,7 +3,7 @@ from __future__ import annotations
 from datetime import datetime
 from typing import Any, Optional
 
-from sqlalchemy import Column, DateTime, Enum, JSON, String, Text
+from sqlalchemy import Column, DateTime, Enum, Integer, JSON, LargeBinary, String, Text
 
 from .db import Base
 
@@ -27,3 +27,13 @@ class Job(Base):
     result = Column(JSON, nullable=True)
     error = Column(Text, nullable=True)
 
+
+class ClusterCentroid(Base):
+    __tablename__ = "cluster_centroids"
+
+    project = Column(String(128), primary_key=True)
+    cluster_index = Column(Integer, primary_key=True)  # exposed as cluster id "c<index>"
+    size = Column(Integer, default=0, nullable=False)
+    dim = Column(Integer, nullable=False)
+    centroid = Column(LargeBinary, nullable=False)  # float32 running mean (not normalized)
+    updated_at = Column(DateTime, default=datetime.utcnow, nullable=False)
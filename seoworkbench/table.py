@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+from typing import Any, Dict, Generic, Hashable, Iterable, Iterator, List, Optional, Sequence, TypeVar, Union
+
+import numpy as np
+
+from .models import KeywordCandidate, KeywordMetrics, KeywordRecord, SERPResult
+
+H = TypeVar("H", bound=Hashable)
+
+
+class StringPool(Generic[H]):
+    """Interns repeated values (sources, intents, modifier tuples) as small integer codes."""
+
+    def __init__(self, values: Iterable[H] = ()) -> None:
+        self.values: List[H] = []
+        self._codes: Dict[H, int] = {}
+        for v in values:
+            self.intern(v)
+
+    def intern(self, value: H) -> int:
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def encode(self, values: Iterable[H]) -> np.ndarray:
+        return np.fromiter((self.intern(v) for v in values), dtype=np.int32)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+
+def _float_column(values: Iterable[Optional[float]]) -> np.ndarray:
+    return np.fromiter((np.nan if v is None else v for v in values), dtype=np.float64)
+
+
+def _opt(value: float) -> Optional[float]:
+    return None if np.isnan(value) else float(value)
+
+
+class KeywordTable:
+    """Columnar keyword set: one entry per column instead of three models per keyword.
+
+    Terms are a plain list; source, intent, modifiers and cluster id are
+    interned codes into shared pools; metrics and opportunity are float64
+    columns with NaN for "unknown". SERP tops are kept sparsely for the few
+    rows that have them. ``KeywordRecord`` models are only built on access
+    (``table[i]``, ``records()``), so scoring and clustering never touch
+    Pydantic.
+    """
+
+    METRICS = ("volume", "kd", "cpc", "trend_score")
+
+    def __init__(
+        self,
+        terms: List[str],
+        source: np.ndarray,
+        intent: np.ndarray,
+        modifiers: np.ndarray,
+        metrics: Dict[str, np.ndarray],
+        sources: StringPool[str],
+        intents: StringPool[Optional[str]],
+        modifier_sets: StringPool[tuple],
+        opportunity: Optional[np.ndarray] = None,
+        cluster: Optional[np.ndarray] = None,
+        cluster_ids: Optional[StringPool[Optional[str]]] = None,
+        serp_top: Optional[Dict[int, List[SERPResult]]] = None,
+    ) -> None:
+        n = len(terms)
+        self.terms = terms
+        self.source = source
+        self.intent = intent
+        self.modifiers = modifiers
+        self.metrics = {k: metrics.get(k, np.full(n, np.nan)) for k in self.METRICS}
+        self.sources = sources
+        self.intents = intents
+        self.modifier_sets = modifier_sets
+        self.opportunity = opportunity if opportunity is not None else np.full(n, np.nan)
+        self.cluster_ids: StringPool[Optional[str]] = cluster_ids if cluster_ids is not None else StringPool([None])
+        self.cluster = cluster if cluster is not None else np.zeros(n, dtype=np.int32)
+        self.serp_top: Dict[int, List[SERPResult]] = serp_top or {}
+
+    @classmethod
+    def from_candidates(cls, candidates: Sequence[KeywordCandidate]) -> "KeywordTable":
+        sources: StringPool[str] = StringPool()
+        intents: StringPool[Optional[str]] = StringPool([None])
+        modifier_sets: StringPool[tuple] = StringPool([()])
+        n = len(candidates)
+        return cls(
+            terms=[c.term for c in candidates],
+            source=sources.encode(c.source for c in candidates),
+            intent=intents.encode(c.intent for c in candidates),
+            modifiers=modifier_sets.encode(tuple(c.modifiers) for c in candidates),
+            metrics={k: np.full(n, np.nan) for k in cls.METRICS},
+            sources=sources,
+            intents=intents,
+            modifier_sets=modifier_sets,
+        )
+
+    @classmethod
+    def from_records(cls, records: Sequence[KeywordRecord]) -> "KeywordTable":
+        table = cls.from_candidates([r.candidate for r in records])
+        for k in cls.METRICS:
+            table.metrics[k] = _float_column(getattr(r.metrics, k) for r in records)
+        table.opportunity = _float_column(r.opportunity for r in records)
+        table.cluster = table.cluster_ids.encode(r.cluster_id for r in records)
+        table.serp_top = {i: r.serp_top for i, r in enumerate(records) if r.serp_top}
+        return table
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    def __getitem__(self, i: int) -> KeywordRecord:
+        return self.record(i)
+
+    def __iter__(self) -> Iterator[KeywordRecord]:
+        return (self.record(i) for i in range(len(self)))
+
+    def candidate(self, i: int) -> KeywordCandidate:
+        return KeywordCandidate(
+            term=self.terms[i],
+            source=self.sources.values[self.source[i]],
+            intent=self.intents.values[self.intent[i]],
+            modifiers=list(self.modifier_sets.values[self.modifiers[i]]),
+        )
+
+    def record(self, i: int) -> KeywordRecord:
+        """Materialize one row as a ``KeywordRecord`` (a fresh model each call)."""
+        volume = self.metrics["volume"][i]
+        return KeywordRecord(
+            candidate=self.candidate(i),
+            metrics=KeywordMetrics(
+                volume=None if np.isnan(volume) else int(volume),
+                kd=_opt(self.metrics["kd"][i]),
+                cpc=_opt(self.metrics["cpc"][i]),
+                trend_score=_opt(self.metrics["trend_score"][i]),
+            ),
+            serp_top=list(self.serp_top.get(i, [])),
+            cluster_id=self.cluster_ids.values[self.cluster[i]],
+            opportunity=_opt(self.opportunity[i]),
+        )
+
+    def row_dicts(self, indices: Optional[Iterable[int]] = None) -> List[Dict[str, Any]]:
+        """Rows as plain dicts shaped like ``KeywordRecord.model_dump()``, without building models."""
+        idx = np.arange(len(self)) if indices is None else np.fromiter(indices, dtype=np.int64)
+
+        def col(values: np.ndarray) -> List[Optional[float]]:
+            return [None if v != v else v for v in values[idx].tolist()]  # NaN -> None
+
+        src, intents, mods, clusters = self.sources.values, self.intents.values, self.modifier_sets.values, self.cluster_ids.values
+        rows = zip(
+            idx.tolist(),
+            self.source[idx].tolist(),
+            self.intent[idx].tolist(),
+            self.modifiers[idx].tolist(),
+            self.cluster[idx].tolist(),
+            col(self.metrics["volume"]),
+            col(self.metrics["kd"]),
+            col(self.metrics["cpc"]),
+            col(self.metrics["trend_score"]),
+            col(self.opportunity),
+        )
+        out: List[Dict[str, Any]] = []
+        for i, s, it, m, c, vol, kd, cpc, trend, opp in rows:
+            serp = self.serp_top.get(i)
+            out.append({
+                "candidate": {"term": self.terms[i], "source": src[s], "intent": intents[it], "modifiers": list(mods[m])},
+                "metrics": {"volume": None if vol is None else int(vol), "kd": kd, "cpc": cpc, "trend_score": trend},
+                "serp_top": [r.model_dump() for r in serp] if serp else [],
+                "cluster_id": clusters[c],
+                "opportunity": opp,
+            })
+        return out
+
+    def records(self, indices: Optional[Iterable[int]] = None) -> List[KeywordRecord]:
+        rows = range(len(self)) if indices is None else indices
+        return [self.record(int(i)) for i in rows]
+
+    def take(self, indices: Union[Sequence[int], np.ndarray]) -> "KeywordTable":
+        """Row subset sharing this table's pools."""
+        idx = np.asarray(indices, dtype=np.int64)
+        pos = {int(old): new for new, old in enumerate(idx.tolist())}
+        return KeywordTable(
+            terms=[self.terms[i] for i in idx.tolist()],
+            source=self.source[idx],
+            intent=self.intent[idx],
+            modifiers=self.modifiers[idx],
+            metrics={k: v[idx] for k, v in self.metrics.items()},
+            sources=self.sources,
+            intents=self.intents,
+            modifier_sets=self.modifier_sets,
+            opportunity=self.opportunity[idx],
+            cluster=self.cluster[idx],
+            cluster_ids=self.cluster_ids,
+            serp_top={pos[i]: serp for i, serp in self.serp_top.items() if i in pos},
+        )
+
+    def set_clusters(self, labels: np.ndarray, names: Dict[int, str]) -> None:
+        """Store cluster ids for ``labels`` using ``names[label]`` (e.g. ``{3: "c3"}``)."""
+        codes = {lab: self.cluster_ids.intern(name) for lab, name in names.items()}
+        self.cluster = np.fromiter((codes.get(int(lab), 0) for lab in labels), dtype=np.int32, count=len(labels))
@@ -1,19 +1,26 @@
 from __future__ import annotations
 
 import json
+import logging
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
 from celery import Celery
+from celery.signals import worker_process_init, worker_process_shutdown, worker_shutdown
 
 from .config import get_settings
-from .aggregator import research_keywords
+from .aggregator import research_table
 from .generation.generator import generate_brief, generate_article
+from .httpclient import reset_http_clients
+from .jobstatus import TERMINAL_STATUSES, get_job_status_store, progress_reporter
 from .models import BriefRequest, GenerationRequest
-from .storage.db import db_session
+from .runtime import get_runtime, run_async
+from .storage.db import db_session, reset_engine
 from .storage.models import Job, JobStatusEnum
 
 
+logger = logging.getLogger(__name__)
+
 settings = get_settings()
 
 celery_app = Celery(
@@ -23,7 +30,48 @@ celery_app = Celery(
 )
 
 
+@worker_process_init.connect
+def _init_worker_process(**_: Any) -> None:
+    # Each prefork child gets its own loop thread, HTTP pool, DB pool and
+    # embedding weights once, not per task (other pools start it on first task).
+    # Pooled connections must not be shared with the parent across fork.
+    reset_http_clients()
+    reset_engine()
+    get_runtime().start(warm=True)
+
+
+@worker_process_shutdown.connect
+@worker_shutdown.connect
+def _shutdown_worker_process(**_: Any) -> None:
+    get_runtime().stop()
+
+
 def _update_job(job_id: str, **changes: Any) -> None:
+    """Record a status change: final states go to Postgres, then everything to the status cache.
+
+    With a shared (Redis) status store, ``STARTED`` and progress live only in
+    the cache and pub/sub feed; ``GET /jobs/{id}`` reads them from there.
+    If the cache write fails the row is written instead and the stale
+    snapshot dropped.
+    """
+    store = get_job_status_store()
+    wrote_row = changes.get("status") in TERMINAL_STATUSES or not store.shared
+    if wrote_row:
+        _write_job_row(job_id, **changes)
+    try:
+        run_async(store.update(job_id, **changes))
+    except Exception:
+        # The cache is best-effort: never turn a status write into a task failure
+        logger.warning("Job status cache update failed for %s", job_id, exc_info=True)
+        try:
+            run_async(store.delete(job_id))  # let reads fall back to the row
+        except Exception:
+            pass
+        if not wrote_row:
+            _write_job_row(job_id, **changes)
+
+
+def _write_job_row(job_id: str, **changes: Any) -> None:
     with db_session() as db:
         job = db.get(Job, job_id)
         if not job:
@@ -38,9 +86,9 @@ def _update_job(job_id: str, **changes: Any) -> None:
 def task_research(job_id: str, seeds: List[str], max_keywords: int = 300) -> Dict[str, Any]:
     _update_job(job_id, status=JobStatusEnum.STARTED)
     try:
-        records = _run_async(research_keywords(seeds, max_keywords=max_keywords))
+        table = run_async(research_table(seeds, max_keywords=max_keywords, progress=progress_reporter(job_id)))
         payload = {"seeds": seeds, "max_keywords": max_keywords}
-        result = {"keywords": [r.candidate.term for r in records]}
+        result = {"keywords": list(table.terms)}
         _update_job(job_id, status=JobStatusEnum.SUCCESS, result=result)
         return result
     except Exception as e:
@@ -52,7 +100,7 @@ def task_research(job_id: str, seeds: List[str], max_keywords: int = 300) -> Dic
 def task_brief(job_id: str, topic: str, keywords: List[str]) -> Dict[str, Any]:
     _update_job(job_id, status=JobStatusEnum.STARTED)
     try:
-        brief = _run_async(generate_brief(topic=topic, keywords=keywords, seed=topic))
+        brief = run_async(generate_brief(topic=topic, keywords=keywords, seed=topic))
         result = brief.model_dump()
         _update_job(job_id, status=JobStatusEnum.SUCCESS, result=result)
         return result
@@ -66,7 +114,7 @@ def task_generate(job_id: str, topic: str, brief: Optional[Dict[str, Any]] = Non
     _update_job(job_id, status=JobStatusEnum.STARTED)
     try:
         req = GenerationRequest(topic=topic, brief=brief, target_length_words=length)
-        result_obj = _run_async(generate_article(req, target_entities=[topic]))
+        result_obj = run_async(generate_article(req, target_entities=[topic]))
         result = result_obj.model_dump()
         _update_job(job_id, status=JobStatusEnum.SUCCESS, result=result)
         return result
@@ -74,15 +122,3 @@ def task_generate(job_id: str, topic: str, brief: Optional[Dict[str, Any]] = Non
         _update_job(job_id, status=JobStatusEnum.FAILURE, error=str(e))
         raise
 
-
-def _run_async(coro):
-    import asyncio
-    try:
-        loop = asyncio.get_event_loop()
-    except RuntimeError:
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-    if loop.is_running():
-        return coro  # Should not occur in worker
-    return loop.run_until_complete(coro)
-
@@ -0,0 +1,54 @@
+import asyncio
+import json
+
+from seoworkbench import bulk
+from seoworkbench.models import ContentBrief, GenerationResponse
+
+
+def test_bulk_resumes_from_checkpoint(tmp_path, monkeypatch):
+    calls = []
+
+    async def fake_brief(topic, keywords, seed):
+        return ContentBrief(title=topic)
+
+    async def fake_article(req, target_entities):
+        calls.append(req.topic)
+        if req.topic == "broken":
+            raise RuntimeError("boom")
+        return GenerationResponse(title=req.topic, article_markdown="x" * 40)
+
+    monkeypatch.setattr(bulk, "generate_brief", fake_brief)
+    monkeypatch.setattr(bulk, "generate_article", fake_article)
+    src = tmp_path / "topics.csv"
+    src.write_text(
+        'topic,keywords,brief\nboots,hiking boots;trail boots,\nbad brief,,{not json\nbroken,,\ntents,,\n',
+        encoding="utf-8",
+    )
+    out = tmp_path / "out.jsonl"
+
+    stats = asyncio.run(bulk.run_bulk(str(src), str(out), concurrency=2))
+    assert (stats.pages, stats.failed) == (2, 2)
+
+    calls.clear()
+    asyncio.run(bulk.run_bulk(str(src), str(out), concurrency=2))
+    assert calls == ["broken"]  # completed rows are skipped, failures retried
+    lines = [json.loads(l) for l in out.read_text(encoding="utf-8").splitlines()]
+    assert sorted(l["topic"] for l in lines) == ["boots", "tents"]
+    assert all("article" in l for l in lines)
+    errors = [json.loads(l) for l in (tmp_path / "out.jsonl.errors.jsonl").read_text(encoding="utf-8").splitlines()]
+    assert sorted(e["topic"] for e in errors) == ["bad brief", "bad brief", "broken", "broken"]
+
+
+def test_bulk_records_malformed_jsonl_lines(tmp_path, monkeypatch):
+    async def fake_page(row, length, parallel_sections):
+        return {"brief": {}, "article": {"article_markdown": row["topic"]}}
+
+    monkeypatch.setattr(bulk, "_generate_page", fake_page)
+    src = tmp_path / "topics.jsonl"
+    src.write_text('{"topic": "boots"}\n{"topic": \n["a list"]\n{"topic": "tents"}\n', encoding="utf-8")
+    out = tmp_path / "out.jsonl"
+    errors = tmp_path / "errors.jsonl"
+
+    stats = asyncio.run(bulk.run_bulk(str(src), str(out), errors_path=str(errors)))
+    assert (stats.pages, stats.failed) == (2, 2)
+    assert [json.loads(l)["id"] for l in errors.read_text(encoding="utf-8").splitlines()] == ["line:2", "line:3"]
@@ -0,0 +1,55 @@
+import asyncio
+
+from seoworkbench.cache import CacheStats, MemoryCache, SQLiteCache, bypass_cache
+from seoworkbench.generation.generator import CachedProvider, LLMProvider
+
+
+class _Counting(LLMProvider):
+    model = "m"
+
+    def __init__(self):
+        self.calls = 0
+
+    async def complete(self, prompt, *, max_tokens=2048):
+        self.calls += 1
+        return f"{prompt}:{self.calls}"
+
+
+def test_memory_cache_lru_and_ttl():
+    async def run():
+        cache = MemoryCache(max_entries=2)
+        await cache.set("a", "1", ttl=60)
+        await cache.set("b", "2", ttl=60)
+        await cache.get("a")
+        await cache.set("c", "3", ttl=60)
+        kept = [await cache.get(k) for k in "abc"]
+        await cache.set("d", "4", ttl=-1)
+        return kept, await cache.get("d")
+
+    assert asyncio.run(run()) == (["1", None, "3"], None)
+
+
+def test_sqlite_cache_persists(tmp_path):
+    path = str(tmp_path / "c.sqlite")
+    asyncio.run(SQLiteCache(path, "llm").set("k", "v", ttl=60))
+    assert asyncio.run(SQLiteCache(path, "llm").get("k")) == "v"
+    assert asyncio.run(SQLiteCache(path, "serp").get("k")) is None
+
+
+def test_cached_provider_hits_and_bypass():
+    inner = _Counting()
+    stats = CacheStats()
+    provider = CachedProvider(inner, MemoryCache(), ttl=60, stats=stats)
+
+    async def run():
+        first = await provider.complete("p", max_tokens=10)
+        second = await provider.complete("p", max_tokens=10)
+        other = await provider.complete("p", max_tokens=20)
+        with bypass_cache():
+            fresh = await provider.complete("p", max_tokens=10)
+        return first, second, other, fresh
+
+    first, second, other, fresh = asyncio.run(run())
+    assert first == second == "p:1"
+    assert other == "p:2" and fresh == "p:3"
+    assert stats.as_dict()["hits"] == 1 and stats.misses == 2 and stats.bypassed == 1
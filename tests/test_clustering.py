@@ -0,0 +1,86 @@
+import numpy as np
+
+from seoworkbench.models import KeywordCandidate, KeywordRecord
+from seoworkbench.nlp.clustering import build_clusters, group_indices
+
+
+def test_group_indices_preserves_first_seen_order():
+    groups = group_indices(np.array([3, -1, 3, 0, -1]))
+    assert list(groups) == [3, -1, 0]
+    assert groups[3].tolist() == [0, 2] and groups[-1].tolist() == [1, 4]
+
+
+def test_build_clusters_assigns_ids_and_centroids():
+    records = [KeywordRecord(candidate=KeywordCandidate(term=t)) for t in ("a", "b", "c")]
+    X = np.array([[1, 0], [1, 0], [0, 2]], dtype=np.float32)
+    clusters = build_clusters(records, X, np.array([0, 0, 1]))
+    assert [c.id for c in clusters] == ["c0", "c1"]
+    assert [r.cluster_id for r in records] == ["c0", "c0", "c1"]
+    assert clusters[1].centroid == [0.0, 1.0]
+
+
+def test_minibatch_engine_finds_separated_groups():
+    from seoworkbench.nlp.clustering import cluster_embeddings
+
+    rng = np.random.default_rng(1)
+    centers = np.eye(4, 16, dtype=np.float32) * 10
+    X = np.vstack([c + rng.standard_normal((50, 16)).astype(np.float32) * 0.1 for c in centers])
+    labels = cluster_embeddings(X, min_cluster_size=5, engine="minibatch_kmeans")
+    assert labels.shape == (200,)
+    groups = np.repeat(np.arange(4), 50)
+    # No cluster mixes keywords from different groups
+    for lab in set(labels.tolist()):
+        assert len(set(groups[labels == lab].tolist())) == 1
+
+
+def test_incremental_assignment_keeps_ids_and_updates_means():
+    from seoworkbench.nlp.clustering import IncrementalClusterer
+
+    means = np.array([[1, 0, 0], [0, 1, 0]], dtype=np.float32)
+    inc = IncrementalClusterer(indices=[4, 7], means=means, sizes=[3, 1], threshold=0.8)
+    X = np.array([[0.9, 0.1, 0], [0, 1, 0]], dtype=np.float32)
+    labels = inc.assign(X)
+    assert labels.tolist() == [4, 7]
+    assert inc.sizes.tolist() == [4, 2]
+    assert np.allclose(inc.means[1], [0, 1, 0])
+    assert inc.dirty == {4, 7}
+
+    new = inc.assign(np.array([[0, 0, 1]] * 12, dtype=np.float32), min_cluster_size=5)
+    assert set(new.tolist()) <= {-1} | set(range(8, 100))
+
+
+def test_project_assignment_is_serialized_and_indices_skip_other_dims(tmp_path, monkeypatch):
+    import threading
+
+    from seoworkbench.config import get_settings
+    from seoworkbench.storage import db as storage_db
+    from seoworkbench.storage.centroids import assign_project_clusters, load_clusterer, save_clusterer
+    from seoworkbench.nlp.clustering import IncrementalClusterer
+
+    monkeypatch.setattr(get_settings(), "POSTGRES_DSN", f"sqlite:///{tmp_path / 'c.db'}")
+    storage_db.reset_engine()
+    try:
+        storage_db.create_all()
+        # A cluster persisted under an older 2-d embedding model
+        old = IncrementalClusterer()
+        old.assign(np.array([[1, 0]] * 6, dtype=np.float32))
+        save_clusterer("p", old)
+        old_ids = old.indices.tolist()
+
+        results = []
+        groups = [np.array([[0, 0, 1]] * 8, dtype=np.float32), np.array([[0, 1, 0]] * 8, dtype=np.float32)]
+        threads = [threading.Thread(target=lambda X=X: results.append(assign_project_clusters("p", X)[0])) for X in groups]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        new_ids = sorted(set(np.concatenate(results).tolist()) - {-1})
+        # No id is shared between the two requests or reused from the 2-d rows
+        assert all(len(set(labels.tolist()) & set(new_ids)) for labels in results)
+        assert not set(results[0].tolist()) & set(results[1].tolist())
+        assert min(new_ids) > max(old_ids)
+        assert sorted(load_clusterer("p", 3).indices.tolist()) == new_ids
+        assert load_clusterer("p", 2).indices.tolist() == old_ids
+    finally:
+        storage_db.reset_engine()
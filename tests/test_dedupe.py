@@ -0,0 +1,28 @@
+from seoworkbench.aggregator import NearDuplicateIndex, canonical_term, dedupe_candidates
+from seoworkbench.models import KeywordCandidate
+
+
+def test_canonical_term_folds_plurals_and_order():
+    assert canonical_term("Hiking Backpacks best") == canonical_term("best hiking backpack")
+
+
+def test_near_duplicates_merge_provenance_but_years_stay_apart():
+    cands = [
+        KeywordCandidate(term="best hiking backpacks 2025", source="autocomplete"),
+        KeywordCandidate(term="backpack hiking best 2025", source="llm", modifiers=["best"]),
+        KeywordCandidate(term="best hikng backpacks 2025", source="related"),
+        KeywordCandidate(term="best hiking backpacks 2024", source="llm"),
+    ]
+    kept = dedupe_candidates(cands)
+    assert [c.term for c in kept] == ["best hiking backpacks 2025", "best hiking backpacks 2024"]
+    assert kept[0].source == "autocomplete,llm,related"
+    assert kept[0].modifiers == ["best"]
+
+
+def test_index_is_incremental():
+    index = NearDuplicateIndex()
+    first = index.add_many([KeywordCandidate(term="trail running shoes")])
+    second = index.add_many([KeywordCandidate(term="trail running shoe"), KeywordCandidate(term="road bikes")])
+    assert [c.term for c in first] == ["trail running shoes"]
+    assert [c.term for c in second] == ["road bikes"]
+    assert len(index.kept) == 2
@@ -0,0 +1,109 @@
+import asyncio
+
+import numpy as np
+
+from seoworkbench.nlp.embeddings import EmbeddingService, get_embedding_model
+
+
+class _CountingModel:
+    dim = 1
+
+    def __init__(self):
+        self.calls = []
+
+    def embed(self, texts):
+        self.calls.append(list(texts))
+        return np.array([[float(len(t))] for t in texts], dtype=np.float32)
+
+
+def test_registry_reuses_model():
+    assert get_embedding_model("dummy-model") is get_embedding_model("dummy-model")
+
+
+def test_service_coalesces_concurrent_calls():
+    model = _CountingModel()
+    svc = EmbeddingService(model, max_batch_size=64, max_wait_ms=20)
+
+    async def run():
+        try:
+            return await asyncio.gather(svc.embed(["a", "bb"]), svc.embed(["ccc"]), svc.embed([]))
+        finally:
+            await svc.aclose()
+
+    first, second, empty = asyncio.run(run())
+    assert first.tolist() == [[1.0], [2.0]]
+    assert second.tolist() == [[3.0]]
+    assert empty.shape == (0, 1)
+    assert len(model.calls) == 1
+
+
+def test_store_roundtrip_and_lru_eviction(tmp_path):
+    from seoworkbench.nlp.embeddings import EmbeddingStore
+
+    store = EmbeddingStore(tmp_path, "test/model", max_entries=2)
+    store.put_many(["a", "b"], np.eye(2, dtype=np.float32))
+    a, b, c = store.get_many(["a", "b", "c"])
+    assert np.allclose(a, [1, 0]) and np.allclose(b, [0, 1]) and c is None
+
+    store.get_many(["b"])  # "a" is now least recently used
+    store.put_many(["c"], np.array([[0.5, 0.5]], dtype=np.float32))
+    a, b, c = EmbeddingStore(tmp_path, "test/model").get_many(["a", "b", "c"])
+    assert a is None and b is not None and np.allclose(c, [0.5, 0.5])
+
+
+def test_hashing_fallback_is_stable_across_processes():
+    import os
+    import subprocess
+    import sys
+
+    from seoworkbench.nlp.embeddings import HashingEmbedder
+
+    code = (
+        "from seoworkbench.nlp.embeddings import HashingEmbedder;"
+        "print(HashingEmbedder(dim=64, char_ngrams=(3, 4)).embed(['best hiking backpacks']).tobytes().hex())"
+    )
+    outs = {
+        subprocess.run([sys.executable, "-c", code], env={**os.environ, "PYTHONHASHSEED": seed},
+                       capture_output=True, text=True, check=True).stdout.strip()
+        for seed in ("1", "2")
+    }
+    assert len(outs) == 1
+    vec = HashingEmbedder(dim=64, char_ngrams=(3, 4)).embed(["best hiking backpacks", ""])
+    assert vec.shape == (2, 64) and not vec[1].any()
+    assert abs(float((vec[0] ** 2).sum()) - 1.0) < 1e-5
+
+
+def test_store_keys_on_normalized_text_but_encodes_the_original(tmp_path):
+    from seoworkbench.nlp.embeddings import EmbeddingModel, EmbeddingStore
+
+    encoded = []
+
+    class _Model:
+        def get_sentence_embedding_dimension(self):
+            return 1
+
+        def encode(self, texts, **_):
+            encoded.extend(texts)
+            return np.array([[float(len(t))] for t in texts], dtype=np.float32)
+
+    model = EmbeddingModel("test/model", store=EmbeddingStore(tmp_path, "test/model"))
+    model._model = _Model()
+    out = model.embed(["Hiking  Boots", "hiking boots"])
+    assert encoded == ["Hiking  Boots"]
+    assert out.tolist() == [[13.0], [13.0]]
+
+
+def test_store_reopens_with_the_dtype_it_was_created_with(tmp_path):
+    from seoworkbench.nlp.embeddings import EmbeddingStore
+
+    vecs = np.array([[0.1234567, -0.5], [1.0, 0.25]], dtype=np.float32)
+    EmbeddingStore(tmp_path, "m32", dtype="float32").put_many(["a", "b"], vecs)
+    EmbeddingStore(tmp_path, "m16", dtype="float16").put_many(["a", "b"], vecs)
+
+    a, b = EmbeddingStore(tmp_path, "m32", dtype="float16").get_many(["a", "b"])
+    assert np.array_equal(np.vstack([a, b]), vecs)  # still full float32 precision
+    reopened = EmbeddingStore(tmp_path, "m16", dtype="float32")
+    a, _ = reopened.get_many(["a", "b"])
+    assert reopened.dtype == np.float16 and np.allclose(a, vecs[0], atol=1e-3)
+    reopened.put_many(["c"], np.array([[0.5, 0.5]], dtype=np.float32))
+    assert np.allclose(EmbeddingStore(tmp_path, "m16").get_many(["c"])[0], [0.5, 0.5])
@@ -0,0 +1,22 @@
+import asyncio
+
+import httpx
+
+from seoworkbench.api.main import app
+
+
+def test_generate_stream_emits_chunks_then_final_events():
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://api") as client:
+            body = {
+                "topic": "hiking boots",
+                "brief": {"title": "Boots", "faqs": ["Are boots worth it?"], "outline": []},
+            }
+            async with client.stream("POST", "/content/generate/stream", json=body) as r:
+                assert r.headers["content-type"].startswith("text/event-stream")
+                return [line[7:] for line in [l async for l in r.aiter_lines()] if line.startswith("event: ")]
+
+    events = asyncio.run(run())
+    assert events[0] == "chunk"
+    assert events[-4:] == ["score", "schema", "microcontent", "done"]
@@ -0,0 +1,62 @@
+import asyncio
+import time
+
+from seoworkbench.generation import generator
+from seoworkbench.models import BriefSection, ContentBrief, GenerationRequest
+
+
+class _SlowProvider(generator.LLMProvider):
+    async def complete(self, prompt, *, max_tokens=2048):
+        await asyncio.sleep(0.1)
+        return "body text"
+
+
+def test_parallel_sections_are_drafted_concurrently_and_stitched_in_order(monkeypatch):
+    async def fake_resolve(role="writing"):
+        return _SlowProvider()
+
+    monkeypatch.setattr(generator, "resolve_provider", fake_resolve)
+    brief = ContentBrief(title="Boots", outline=[BriefSection(heading=f"Part {i}") for i in range(12)])
+    req = GenerationRequest(topic="boots", brief=brief, target_length_words=3000, parallel_sections=True)
+
+    t0 = time.perf_counter()
+    res = asyncio.run(generator.generate_article(req, target_entities=["boots"]))
+    elapsed = time.perf_counter() - t0
+
+    md = res.article_markdown
+    assert md.startswith("# Boots\n\nbody text")
+    positions = [md.index(f"## Part {i}\n") for i in range(12)]
+    assert positions == sorted(positions) and md.index("## Conclusion") > positions[-1]
+    # 14 parts + microcontent at 0.1s each would take 1.5s serially
+    assert elapsed < 0.8
+
+
+def test_a_failed_section_cancels_the_other_drafts(monkeypatch):
+    finished = []
+
+    class _FailingProvider(generator.LLMProvider):
+        async def complete(self, prompt, *, max_tokens=2048):
+            failing = 'section "FAIL-HERE"' in prompt
+            await asyncio.sleep(0.01 if failing else 0.2)
+            if failing:
+                raise RuntimeError("upstream error")
+            finished.append(prompt)
+            return "body text"
+
+    async def fake_resolve(role="writing"):
+        return _FailingProvider()
+
+    monkeypatch.setattr(generator, "resolve_provider", fake_resolve)
+    outline = [BriefSection(heading="FAIL-HERE")] + [BriefSection(heading=f"Part {i}") for i in range(4)]
+    brief = ContentBrief(title="Boots", outline=outline)
+    req = GenerationRequest(topic="boots", brief=brief, target_length_words=1500, parallel_sections=True)
+
+    async def run():
+        try:
+            await generator.generate_article(req, target_entities=["boots"])
+        except RuntimeError as e:
+            await asyncio.sleep(0.3)  # long enough for any surviving draft to finish
+            return str(e)
+
+    assert asyncio.run(run()) == "upstream error"
+    assert finished == []
@@ -0,0 +1,32 @@
+import asyncio
+
+import httpx
+
+from seoworkbench.httpclient import _HostLimitedTransport, get_http_client
+
+
+def test_host_limit_releases_slot_after_body_is_read():
+    in_flight = {"now": 0, "peak": 0}
+
+    async def handler(request):
+        in_flight["now"] += 1
+        in_flight["peak"] = max(in_flight["peak"], in_flight["now"])
+        await asyncio.sleep(0.01)
+        in_flight["now"] -= 1
+        return httpx.Response(200, json={"ok": True})
+
+    async def run():
+        transport = _HostLimitedTransport(httpx.MockTransport(handler), per_host=1)
+        async with httpx.AsyncClient(transport=transport) as client:
+            rs = await asyncio.gather(*[client.get("http://example.test/") for _ in range(5)])
+        return [r.json() for r in rs]
+
+    assert asyncio.run(run()) == [{"ok": True}] * 5
+    assert in_flight["peak"] == 1
+
+
+def test_client_is_reused_within_a_loop():
+    async def run():
+        return get_http_client() is get_http_client()
+
+    assert asyncio.run(run())
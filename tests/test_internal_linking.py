@@ -0,0 +1,51 @@
+from seoworkbench.internal_linking import LinkIndex, suggest_internal_links
+
+
+PAGES = {
+    "boots": ["hiking boots", "waterproof", "trail"],
+    "socks": ["hiking socks", "trail", "waterproof"],
+    "tents": ["tents", "trail"],
+    "recipes": ["pasta"],
+}
+
+
+def test_suggestions_rank_by_shared_keywords():
+    links = suggest_internal_links(PAGES, top_k=2)
+    assert links["boots"] == [("socks", 2), ("tents", 1)]
+    assert links["recipes"] == []
+
+
+def test_index_updates_incrementally():
+    index = LinkIndex()
+    index.add_pages(PAGES)
+    index.remove_page("socks")
+    index.add_page("gaiters", ["Waterproof ", "trail", "hiking boots"])
+    assert index.suggest("boots", top_k=1) == [("gaiters", 3)]
+    assert index.suggest_all(top_k=1)["boots"] == [("gaiters", 3)]
+    assert "socks" not in index.suggest_all()
+
+
+def test_non_positive_top_k_suggests_nothing():
+    index = LinkIndex()
+    index.add_pages(PAGES)
+    for k in (0, -1):
+        assert index.suggest_all(top_k=k) == {pid: [] for pid in PAGES}
+        assert index.suggest("boots", top_k=k) == []
+
+
+def test_semantic_index_persists_and_reindexes_only_changes(tmp_path):
+    from seoworkbench.internal_linking import SemanticLinkIndex, suggest_semantic_links
+
+    pages = {
+        "boots": ["hiking boots", "waterproof hiking boots"],
+        "boot-care": ["waterproof boots care", "hiking boots cleaning"],
+        "recipes": ["pasta recipes"],
+    }
+    links = suggest_semantic_links(pages, top_k=2, index_dir=str(tmp_path))
+    assert links["boots"][0].target == "boot-care"
+    assert links["boots"][0].anchor in pages["boot-care"]
+
+    index = SemanticLinkIndex.load(tmp_path)
+    assert len(index) == 3
+    assert index.add_pages(pages) == 0
+    assert index.add_pages({"recipes": ["pasta recipes", "pasta sauce"]}) == 1
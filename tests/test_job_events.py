@@ -0,0 +1,160 @@
+import asyncio
+import json
+import threading
+import time
+
+import httpx
+
+from seoworkbench.api.main import app
+from seoworkbench.jobstatus import MemoryJobStatusStore, set_job_status_store
+from seoworkbench.tasks import _update_job
+
+
+async def _get(path):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://api") as client:
+        return await client.get(path)
+
+
+def test_status_and_progress_come_from_the_cache_without_touching_postgres():
+    # No POSTGRES_DSN here: any jobs-table access would raise
+    store = MemoryJobStatusStore(ttl=60, shared=True)
+    set_job_status_store(store)
+    try:
+        asyncio.run(store.put("j1", {"job_id": "j1", "type": "research", "status": "PENDING"}))
+        _update_job("j1", status="STARTED")
+        _update_job("j1", progress={"stage": "serp", "done": 3, "total": 20})
+
+        found = asyncio.run(_get("/jobs/j1"))
+        assert found.status_code == 200
+        assert found.json()["status"] == "STARTED"
+        assert found.json()["type"] == "research"
+        assert found.json()["progress"]["stage"] == "serp"
+    finally:
+        set_job_status_store(None)
+
+
+def test_events_stream_pushes_updates_until_the_job_finishes():
+    store = MemoryJobStatusStore(ttl=60, shared=True)
+    set_job_status_store(store)
+
+    def worker():
+        time.sleep(0.2)
+        for changes in (
+            {"status": "STARTED"},
+            {"progress": {"stage": "collect", "done": 1, "total": 2}},
+            {"status": "SUCCESS", "result": {"keywords": ["a"]}},
+        ):
+            asyncio.run(store.update("j2", **changes))
+
+    async def run():
+        await store.put("j2", {"job_id": "j2", "type": "research", "status": "PENDING"})
+        threading.Thread(target=worker).start()
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://api") as client:
+            r = await client.get("/jobs/j2/events")
+            return r.headers["content-type"], r.text
+
+    try:
+        content_type, text = asyncio.run(run())
+    finally:
+        set_job_status_store(None)
+    assert content_type.startswith("text/event-stream")
+    events = [
+        (block.split("\n")[0][len("event: "):], json.loads(block.split("\n")[1][len("data: "):]))
+        for block in text.strip().split("\n\n")
+        if block.startswith("event: ")
+    ]
+    assert [e for e, _ in events] == ["status"] * 4 + ["done"]
+    states = [data for _, data in events[:-1]]
+    assert [s["status"] for s in states] == ["PENDING", "STARTED", "STARTED", "SUCCESS"]
+    assert states[2]["progress"] == {"stage": "collect", "done": 1, "total": 2}
+    assert states[-1]["result"] == {"keywords": ["a"]}
+
+
+class _BrokenStore(MemoryJobStatusStore):
+    async def update(self, job_id, **changes):
+        raise ConnectionError("redis down")
+
+
+def test_cache_failures_do_not_fail_the_job_or_strand_it(monkeypatch):
+    from seoworkbench import tasks
+
+    rows = []
+    monkeypatch.setattr(tasks, "_write_job_row", lambda job_id, **changes: rows.append(changes["status"]))
+
+    async def fake_research(seeds, max_keywords=300, progress=None):
+        await progress("collect", 1, 1)
+        return type("T", (), {"terms": ["a", "b"]})()
+
+    monkeypatch.setattr(tasks, "research_table", fake_research)
+    set_job_status_store(_BrokenStore(ttl=60, shared=True))
+    try:
+        assert tasks.task_research("j3", ["a"]) == {"keywords": ["a", "b"]}
+    finally:
+        set_job_status_store(None)
+    # STARTED falls back to the row; SUCCESS is written once and never flipped to FAILURE
+    assert rows == ["STARTED", "SUCCESS"]
+
+
+class _SlowStore(MemoryJobStatusStore):
+    """Awaits between read and write like the Redis store, with the first reads slowest."""
+
+    def __init__(self):
+        super().__init__(ttl=60, shared=True)
+        self.delays = [0.05, 0.03, 0.01, 0.0]
+        self.published = []
+
+    async def get(self, job_id):
+        state = await super().get(job_id)
+        await asyncio.sleep(self.delays.pop(0) if self.delays else 0.0)
+        return state
+
+    async def put(self, job_id, state, publish=True):
+        self.published.append(state["progress"]["done"])
+        await super().put(job_id, state, publish)
+
+
+def test_concurrent_progress_reports_never_go_backwards():
+    from seoworkbench.jobstatus import progress_reporter
+
+    store = _SlowStore()
+    set_job_status_store(store)
+    try:
+        report = progress_reporter("j4")
+
+        async def run():
+            await asyncio.gather(*[report("serp", i, 4) for i in range(1, 5)])
+            return await store.get("j4")
+
+        final = asyncio.run(run())
+    finally:
+        set_job_status_store(None)
+    assert store.published == [1, 2, 3, 4]
+    assert final["progress"]["done"] == 4
+
+
+def test_events_stream_ends_when_the_job_disappears(monkeypatch):
+    from seoworkbench.api import main
+    from seoworkbench.config import get_settings
+
+    monkeypatch.setattr(get_settings(), "JOB_EVENTS_HEARTBEAT", 0.05)
+    monkeypatch.setattr(main, "_db_job_state", lambda job_id: None)
+    store = MemoryJobStatusStore(ttl=60, shared=True)
+    set_job_status_store(store)
+
+    async def run():
+        await store.put("j5", {"job_id": "j5", "type": "research", "status": "STARTED"})
+        # Snapshot expires mid-stream without a final state ever being published
+        threading.Timer(0.2, lambda: asyncio.run(store.delete("j5"))).start()
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://api") as client:
+            return (await asyncio.wait_for(client.get("/jobs/j5/events"), 5)).text
+
+    try:
+        text = asyncio.run(run())
+    finally:
+        set_job_status_store(None)
+    assert text.startswith("event: status")
+    assert ": keep-alive" in text
+    assert text.rstrip().endswith('data: {"detail": "Job not found"}')
@@ -0,0 +1,47 @@
+import numpy as np
+
+from seoworkbench.nlp.lsi import LSIModel
+
+
+CORPUS = [
+    "Waterproof hiking boots keep feet dry on wet trails.",
+    "Choosing hiking boots: fit, ankle support and waterproof membranes.",
+    "Trail running shoes are lighter than hiking boots.",
+]
+
+
+def test_partial_fit_matches_full_fit_and_roundtrips(tmp_path):
+    full = LSIModel().partial_fit(CORPUS)
+    inc = LSIModel().partial_fit(CORPUS[:1]).partial_fit(CORPUS[1:])
+    assert full.n_docs == inc.n_docs == 3
+    assert set(full.vocab) == set(inc.vocab)
+    term = "hiking boots"
+    assert full.idf[full.vocab[term]] == inc.idf[inc.vocab[term]]
+
+    path = tmp_path / "lsi.npz"
+    inc.save(path)
+    loaded = LSIModel.load(path)
+    docs = ["Ankle support matters for hiking boots", "unrelated cooking text"]
+    assert np.allclose(loaded.transform(docs).toarray(), inc.transform(docs).toarray())
+
+
+def test_top_terms_prefers_rare_corpus_terms():
+    model = LSIModel().partial_fit(CORPUS)
+    [terms] = model.top_terms(["hiking boots with ankle support"], top_k=3)
+    assert terms[0] in ("ankle", "ankle support", "support")
+    assert "hiking boots" in model.top_terms(["hiking boots"], top_k=5)[0]
+
+
+def test_prune_keeps_most_frequent_terms():
+    model = LSIModel(max_terms=5).partial_fit(CORPUS)
+    assert len(model) == 5
+    assert "hiking boots" in model.vocab
+
+
+def test_prune_after_terms_were_read():
+    model = LSIModel(max_terms=5).partial_fit(CORPUS[:1])
+    model.terms()
+    model.partial_fit(CORPUS[1:])
+    assert len(model) == 5
+    assert sorted(model.terms().tolist()) == sorted(model.vocab)
+    assert all(model.vocab[t] == i for i, t in enumerate(model.terms().tolist()))
@@ -0,0 +1,63 @@
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+
+from seoworkbench.config import get_settings
+from seoworkbench.generation import generator
+
+COMPLETION_DELAY = 1.0
+
+
+class _SlowCompletions(BaseHTTPRequestHandler):
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        time.sleep(COMPLETION_DELAY)
+        body = json.dumps({"choices": [{"message": {"content": "Title: Stubbed\n- Section one"}}]}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_openai(monkeypatch):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _SlowCompletions)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setenv("LLM_PROVIDER_RESEARCH", "openai")
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    monkeypatch.setenv("OPENAI_BASE_URL", f"http://127.0.0.1:{server.server_port}/v1")
+    get_settings.cache_clear()
+    generator._providers.clear()
+    yield
+    server.shutdown()
+    get_settings.cache_clear()
+    generator._providers.clear()
+
+
+def test_event_loop_serves_requests_during_completion(stub_openai):
+    from seoworkbench.api.main import app
+
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://api") as client:
+            brief = asyncio.create_task(client.post("/content/brief", json={"keywords": ["kw"], "seed": "kw"}))
+            await asyncio.sleep(0.2)
+            t0 = time.perf_counter()
+            other = await client.get("/openapi.json")
+            elapsed = time.perf_counter() - t0
+            in_flight = not brief.done()
+            return await brief, other, elapsed, in_flight
+
+    brief, other, elapsed, in_flight = asyncio.run(run())
+    assert other.status_code == 200
+    assert in_flight and elapsed < COMPLETION_DELAY / 2
+    assert brief.status_code == 200 and brief.json()["title"] == "Stubbed"
@@ -0,0 +1,28 @@
+import numpy as np
+
+from seoworkbench.models import KeywordCandidate, KeywordMetrics, KeywordRecord
+from seoworkbench.opportunity import score_arrays, score_record, score_records, top_k
+
+
+def _rec(term, **metrics):
+    return KeywordRecord(candidate=KeywordCandidate(term=term), metrics=KeywordMetrics(**metrics))
+
+
+def test_batch_scores_match_single_record_scores():
+    records = [
+        _rec("hiking boots"),
+        _rec("best waterproof hiking boots for women", volume=120000, kd=10, trend_score=0.9),
+        _rec("boots", volume=500, kd=80, trend_score=-1),
+    ]
+    batch = score_records(records)
+    assert np.allclose(batch, [score_record(r) for r in records])
+    # missing metrics: kd defaults to 50, trend to 0.5, no volume, no long-tail bonus
+    assert batch[0] == 0.3 * 0.5 + 0.2 * 0.5
+
+
+def test_weights_and_top_k():
+    scores = score_arrays(np.array([100.0, 50000.0, np.nan]), np.full(3, np.nan), np.full(3, np.nan), np.full(3, 2),
+                          weights={"volume": 1.0, "kd": 0.0, "trend": 0.0, "longtail": 0.0})
+    assert np.allclose(scores, [0.002, 1.0, 0.0])
+    assert top_k(scores, 2).tolist() == [1, 0]
+    assert top_k(scores, 10).tolist() == [1, 0, 2]
@@ -0,0 +1,59 @@
+import asyncio
+import time
+
+import httpx
+
+from seoworkbench.ratelimit import RateLimiter, retry_after_seconds
+
+
+def test_concurrency_and_rps_are_enforced():
+    limiter = RateLimiter("test", max_concurrency=2, rps=20)
+    state = {"now": 0, "peak": 0}
+
+    async def call():
+        async with limiter.limit():
+            state["now"] += 1
+            state["peak"] = max(state["peak"], state["now"])
+            await asyncio.sleep(0.01)
+            state["now"] -= 1
+
+    async def run():
+        t0 = time.perf_counter()
+        await asyncio.gather(*[call() for _ in range(30)])
+        return time.perf_counter() - t0
+
+    elapsed = asyncio.run(run())
+    assert state["peak"] <= 2
+    # 20-request burst, then 10 more at 20/s
+    assert elapsed >= 0.4
+
+
+def test_429_backs_off_and_halves_rate():
+    limiter = RateLimiter("test", max_concurrency=1, rps=10)
+    limiter.observe(httpx.Response(429, headers={"Retry-After": "2"}))
+    assert limiter._rps.rate == 5
+    assert limiter._blocked_until - time.monotonic() > 1.5
+    limiter.observe(httpx.Response(200))
+    assert limiter._rps.rate == 6
+    assert retry_after_seconds(httpx.Response(429)) == 1.0
+
+
+def test_threads_racing_for_a_new_limiter_share_one(monkeypatch):
+    import threading
+
+    from seoworkbench import ratelimit
+
+    class SlowLimiter(ratelimit.RateLimiter):
+        def __init__(self, *args, **kwargs):
+            time.sleep(0.05)  # widen the check-then-create window
+            super().__init__(*args, **kwargs)
+
+    monkeypatch.setattr(ratelimit, "RateLimiter", SlowLimiter)
+    got = []
+    threads = [threading.Thread(target=lambda: got.append(ratelimit.get_limiter("race-test"))) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len({id(l) for l in got}) == 1
+    ratelimit._limiters.pop("race-test", None)
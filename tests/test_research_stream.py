@@ -0,0 +1,22 @@
+import asyncio
+import json
+
+import httpx
+
+from seoworkbench.api.main import app
+
+
+def test_research_stream_emits_unique_ndjson_records():
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://api") as client:
+            body = {"seeds": ["trail shoes", "rain jackets"], "max_keywords": 30}
+            async with client.stream("POST", "/keywords/research/stream", json=body) as r:
+                assert r.headers["content-type"].startswith("application/x-ndjson")
+                return [json.loads(line) async for line in r.aiter_lines() if line.strip()]
+
+    rows = asyncio.run(run())
+    assert 0 < len(rows) <= 30
+    terms = [row["candidate"]["term"] for row in rows]
+    assert len(terms) == len(set(terms))
+    assert all(row["opportunity"] is not None for row in rows)
@@ -0,0 +1,46 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from seoworkbench.runtime import WorkerRuntime
+
+
+def test_concurrent_callers_share_one_loop():
+    runtime = WorkerRuntime()
+    loops = []
+
+    async def job():
+        loops.append(asyncio.get_running_loop())
+        await asyncio.sleep(0.2)
+        return threading.current_thread().name
+
+    try:
+        started = time.monotonic()
+        threads = [threading.Thread(target=lambda: runtime.run(job())) for _ in range(5)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        # Five 0.2s sleeps overlapped on the same loop
+        assert time.monotonic() - started < 0.6
+        assert len(set(map(id, loops))) == 1
+        assert runtime.run(job()) == "seoworkbench-loop"
+    finally:
+        runtime.stop()
+    assert not runtime.running
+
+
+def test_run_from_inside_a_loop_raises_instead_of_returning_a_coroutine():
+    runtime = WorkerRuntime()
+
+    async def outer():
+        async def inner():
+            return 1
+
+        with pytest.raises(RuntimeError):
+            runtime.run(inner())
+
+    asyncio.run(outer())
+    assert not runtime.running
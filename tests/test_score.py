@@ -0,0 +1,16 @@
+from seoworkbench.nlp.score import EntityMatcher, nlp_optimization_score
+
+
+def test_matcher_respects_word_boundaries_and_plurals():
+    text = "We maintain AI tools. Best hiking backpacks and a backpack."
+    found = EntityMatcher(["AI", "hiking backpack", "backpack", "tent"]).find(text)
+    assert found["ai"] == [(12, 14)]
+    assert found["hiking backpack"] == [(27, 43)]
+    assert len(found["backpack"]) == 2
+    assert found["tent"] == []
+
+
+def test_score_reports_found_and_missing_entities():
+    _, found, missing = nlp_optimization_score("Maintain your gear.", ["AI", "gear"])
+    assert found == ["gear"]
+    assert missing == ["ai"]
@@ -0,0 +1,41 @@
+import asyncio
+import gzip
+import io
+import json
+
+import httpx
+import numpy as np
+
+from seoworkbench.api.main import app
+from seoworkbench.serialization import dumps, negotiate_encoding, shape_centroid, write_clusters
+
+
+def test_centroid_modes_and_encoding():
+    vec = np.array([0.123456, -0.5], dtype=np.float32)
+    assert json.loads(dumps({"c": shape_centroid(vec, "float16")})) == {"c": [0.1235, -0.5]}
+    assert shape_centroid(vec, "omit") is None
+    assert negotiate_encoding("gzip;q=0, deflate") is None
+    assert negotiate_encoding("deflate, gzip") in ("gzip", "br")
+
+
+def test_write_clusters_produces_one_json_document():
+    buf = io.BytesIO()
+    write_clusters(buf, iter([{"id": "c0", "centroid": np.zeros(2, np.float32)}, {"id": "c1", "centroid": None}]))
+    assert json.loads(buf.getvalue()) == {"clusters": [{"id": "c0", "centroid": [0.0, 0.0]}, {"id": "c1", "centroid": None}]}
+
+
+def test_research_response_is_compressed_and_can_omit_centroids():
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://api") as client:
+            body = {"seeds": ["trail shoes"], "max_keywords": 20, "centroids": "omit"}
+            r = await client.post("/keywords/research", json=body, headers={"Accept-Encoding": "gzip"})
+            bad = await client.post("/keywords/research", json={**body, "centroids": "half"})
+            return r, bad
+
+    r, bad = asyncio.run(run())
+    assert r.status_code == 200 and bad.status_code == 422
+    assert r.headers["content-encoding"] == "gzip"
+    clusters = r.json()["clusters"]
+    assert clusters and all(c["centroid"] is None for c in clusters)
+    assert sum(len(c["keywords"]) for c in clusters) <= 20
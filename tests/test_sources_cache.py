@@ -0,0 +1,66 @@
+import asyncio
+
+from seoworkbench.cache import CacheStats, MemoryCache
+from seoworkbench.models import SERPResult
+from seoworkbench.sources.base import SearchSource
+from seoworkbench.sources.cache import CachingSource
+
+
+class _SlowSerp(SearchSource):
+    name = "fake"
+
+    def __init__(self):
+        self.calls = 0
+
+    async def fetch_autocomplete(self, seed):
+        return []
+
+    async def fetch_people_also_ask(self, seed):
+        return []
+
+    async def fetch_related(self, seed):
+        return []
+
+    async def fetch_serp(self, query, top_n=10):
+        self.calls += 1
+        await asyncio.sleep(0.05)
+        return [SERPResult(title=query, url="https://example.com", rank=1)]
+
+
+def test_concurrent_lookups_share_one_request_and_then_hit_cache():
+    inner = _SlowSerp()
+    stats = CacheStats()
+    source = CachingSource(inner, MemoryCache(), ttl=60, stats=stats)
+
+    async def run():
+        burst = await asyncio.gather(*[source.fetch_serp("Hiking  Boots") for _ in range(5)])
+        later = await source.fetch_serp("hiking boots")
+        return burst, later
+
+    burst, later = asyncio.run(run())
+    assert inner.calls == 1
+    assert all(r[0].title == "Hiking  Boots" for r in burst)
+    assert burst[0][0] is not burst[1][0]
+    assert later[0].url == "https://example.com" and stats.hits == 1
+
+
+def test_cache_is_scoped_to_the_serving_backend_and_skips_synthetic_results():
+    inner = _SlowSerp()
+    inner.scope = None
+    inner.cache_scope = lambda endpoint: inner.scope
+    source = CachingSource(inner, MemoryCache(), ttl=60, stats=CacheStats())
+
+    async def lookup():
+        return await source.fetch_serp("boots")
+
+    asyncio.run(lookup())
+    asyncio.run(lookup())
+    assert inner.calls == 2  # synthetic fallback: never cached
+
+    inner.scope = "searxng:http://a"
+    asyncio.run(lookup())
+    asyncio.run(lookup())
+    assert inner.calls == 3
+    inner.scope = "searxng:http://b"
+    asyncio.run(lookup())
+    assert inner.calls == 4
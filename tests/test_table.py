@@ -0,0 +1,46 @@
+import numpy as np
+
+from seoworkbench.models import KeywordCandidate, KeywordMetrics, KeywordRecord
+from seoworkbench.nlp.clustering import build_clusters
+from seoworkbench.opportunity import score_record, score_table
+from seoworkbench.table import KeywordTable
+
+
+def _records():
+    return [
+        KeywordRecord(
+            candidate=KeywordCandidate(term=f"hiking boots {i}", source="autocomplete", modifiers=["best"] if i % 2 else []),
+            metrics=KeywordMetrics(volume=100 * i if i else None, kd=20.0),
+        )
+        for i in range(6)
+    ]
+
+
+def test_roundtrip_interns_and_materializes_records():
+    records = _records()
+    table = KeywordTable.from_records(records)
+    assert len(table.sources) == 1
+    assert len(table.modifier_sets) == 2
+    assert table.records() == records
+
+
+def test_scoring_and_clustering_work_on_columns():
+    records = _records()
+    table = KeywordTable.from_records(records)
+    scores = score_table(table)
+    assert np.allclose(scores, [score_record(r) for r in records])
+
+    X = np.eye(6, dtype=np.float32)
+    labels = np.array([0, 0, 0, 1, 1, 1])
+    clusters = build_clusters(table, X, labels)
+    assert [c.id for c in clusters] == ["c0", "c1"]
+    assert [k.candidate.term for k in clusters[1].keywords] == ["hiking boots 3", "hiking boots 4", "hiking boots 5"]
+    assert table.take([4]).record(0).cluster_id == "c1"
+
+
+def test_row_dicts_match_model_dump():
+    records = _records()
+    records[2].opportunity = 0.5
+    table = KeywordTable.from_records(records)
+    assert table.row_dicts() == [r.model_dump() for r in records]
+    assert table.row_dicts([3]) == [records[3].model_dump()]